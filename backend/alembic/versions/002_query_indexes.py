@@ -0,0 +1,189 @@
+"""Query indexes and unique document content per company
+
+Revision ID: 002_query_indexes
+Revises: 001_initial
+Create Date: 2026-10-16 00:00:00.000000
+
+Duplicate (company_id, content_hash) documents are merged into the
+oldest one before the unique index is created: evidence and first-
+mention references are repointed to it and the newer rows deleted.
+Their stored files and indexed chunks are left in place.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+# revision identifiers, used by Alembic.
+revision: str = '002_query_indexes'
+down_revision: Union[str, None] = '001_initial'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+# Each document with a content hash -> oldest document with the same hash
+_KEEP_DOCUMENT = """
+    SELECT id, FIRST_VALUE(id) OVER (
+        PARTITION BY company_id, content_hash ORDER BY created_at, id
+    ) AS keep_id
+    FROM documents
+    WHERE content_hash IS NOT NULL
+"""
+
+# (table, column) referencing documents.id
+_DOCUMENT_REFERENCES = [
+    ('evidence', 'document_id'),
+    ('initiatives', 'first_document_id'),
+    ('insights', 'first_mentioned_document_id'),
+]
+
+
+def _merge_duplicate_documents() -> None:
+    for table, column in _DOCUMENT_REFERENCES:
+        op.execute(
+            f"""
+            UPDATE {table}
+            SET {column} = (
+                SELECT keep.keep_id FROM ({_KEEP_DOCUMENT}) keep
+                WHERE keep.id = {table}.{column}
+            )
+            WHERE {column} IN (
+                SELECT keep.id FROM ({_KEEP_DOCUMENT}) keep
+                WHERE keep.id <> keep.keep_id
+            )
+            """
+        )
+    op.execute(
+        f"""
+        DELETE FROM documents
+        WHERE id IN (
+            SELECT keep.id FROM ({_KEEP_DOCUMENT}) keep
+            WHERE keep.id <> keep.keep_id
+        )
+        """
+    )
+
+
+def upgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+
+    # Documents: one row per content hash and company
+    _merge_duplicate_documents()
+    op.create_index(
+        'uq_documents_company_hash', 'documents', ['company_id', 'content_hash'],
+        unique=True, if_not_exists=True,
+    )
+
+    # Documents: keyset pagination and pending queue
+    op.drop_index('ix_documents_company_date', 'documents', if_exists=True)
+    if is_postgresql:
+        op.create_index(
+            'ix_documents_company_date_desc', 'documents',
+            [
+                'company_id',
+                sa.text('document_date DESC NULLS LAST'),
+                sa.text('created_at DESC'),
+                sa.text('id DESC'),
+            ],
+            if_not_exists=True,
+        )
+    else:
+        op.create_index(
+            'ix_documents_company_date', 'documents',
+            ['company_id', 'document_date', 'created_at', 'id'],
+            if_not_exists=True,
+        )
+    op.create_index(
+        'ix_documents_company_created', 'documents', ['company_id', 'created_at', 'id'],
+        if_not_exists=True,
+    )
+    op.create_index('ix_documents_created', 'documents', ['created_at', 'id'], if_not_exists=True)
+    op.create_index(
+        'ix_documents_pending_created', 'documents', ['created_at'],
+        postgresql_where=sa.text("status = 'pending'"),
+        sqlite_where=sa.text("status = 'pending'"),
+        if_not_exists=True,
+    )
+
+    # Analyses
+    op.drop_index('ix_analyses_company_status', 'analyses', if_exists=True)
+    op.create_index(
+        'ix_analyses_company_status_completed', 'analyses',
+        ['company_id', 'status', 'completed_at'], if_not_exists=True,
+    )
+    op.create_index(
+        'ix_analyses_company_status_created', 'analyses',
+        ['company_id', 'status', 'created_at'], if_not_exists=True,
+    )
+    op.create_index(
+        'ix_analyses_company_created', 'analyses', ['company_id', 'created_at'],
+        if_not_exists=True,
+    )
+
+    # Initiatives
+    op.drop_index('ix_initiatives_company_category', 'initiatives', if_exists=True)
+    op.create_index(
+        'ix_initiatives_company_category_mentioned', 'initiatives',
+        ['company_id', 'category', 'last_mentioned_at'], if_not_exists=True,
+    )
+    op.create_index(
+        'ix_initiatives_company_mentioned', 'initiatives',
+        ['company_id', 'last_mentioned_at'], if_not_exists=True,
+    )
+
+    # Insights
+    op.drop_index('ix_insights_company_category', 'insights', if_exists=True)
+    op.create_index(
+        'ix_insights_company_category_confidence', 'insights',
+        ['company_id', 'category', 'confidence_score', 'id'], if_not_exists=True,
+    )
+    op.create_index(
+        'ix_insights_company_confidence', 'insights',
+        ['company_id', 'confidence_score', 'id'], if_not_exists=True,
+    )
+
+    # Companies: trigram search (PostgreSQL only)
+    if is_postgresql:
+        op.execute('CREATE EXTENSION IF NOT EXISTS pg_trgm')
+        op.create_index(
+            'ix_companies_name_trgm', 'companies', ['name'],
+            postgresql_using='gin', postgresql_ops={'name': 'gin_trgm_ops'},
+            if_not_exists=True,
+        )
+        op.create_index(
+            'ix_companies_ticker_trgm', 'companies', ['ticker'],
+            postgresql_using='gin', postgresql_ops={'ticker': 'gin_trgm_ops'},
+            if_not_exists=True,
+        )
+
+
+def downgrade() -> None:
+    is_postgresql = op.get_bind().dialect.name == 'postgresql'
+
+    if is_postgresql:
+        op.drop_index('ix_companies_ticker_trgm', 'companies', if_exists=True)
+        op.drop_index('ix_companies_name_trgm', 'companies', if_exists=True)
+
+    op.drop_index('ix_insights_company_confidence', 'insights', if_exists=True)
+    op.drop_index('ix_insights_company_category_confidence', 'insights', if_exists=True)
+    op.create_index('ix_insights_company_category', 'insights', ['company_id', 'category'])
+
+    op.drop_index('ix_initiatives_company_mentioned', 'initiatives', if_exists=True)
+    op.drop_index('ix_initiatives_company_category_mentioned', 'initiatives', if_exists=True)
+    op.create_index('ix_initiatives_company_category', 'initiatives', ['company_id', 'category'])
+
+    op.drop_index('ix_analyses_company_created', 'analyses', if_exists=True)
+    op.drop_index('ix_analyses_company_status_created', 'analyses', if_exists=True)
+    op.drop_index('ix_analyses_company_status_completed', 'analyses', if_exists=True)
+    op.create_index('ix_analyses_company_status', 'analyses', ['company_id', 'status'])
+
+    op.drop_index('ix_documents_pending_created', 'documents', if_exists=True)
+    op.drop_index('ix_documents_created', 'documents', if_exists=True)
+    op.drop_index('ix_documents_company_created', 'documents', if_exists=True)
+    op.drop_index('ix_documents_company_date_desc', 'documents', if_exists=True)
+    op.drop_index('ix_documents_company_date', 'documents', if_exists=True)
+    op.create_index('ix_documents_company_date', 'documents', ['company_id', 'document_date'])
+
+    # Merged duplicate documents are not restored
+    op.drop_index('uq_documents_company_hash', 'documents', if_exists=True)
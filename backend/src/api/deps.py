@@ -68,6 +68,7 @@ class PaginationParams:
         self,
         page: int = 1,
         page_size: int = 20,
+        cursor: str | None = None,
     ):
         if page < 1:
             raise HTTPException(
@@ -82,6 +83,8 @@ class PaginationParams:
         self.page = page
         self.page_size = page_size
         self.offset = (page - 1) * page_size
+        # Keyset cursor from a previous page's next_cursor; overrides page
+        self.cursor = cursor
 
 
 PaginationDep = Annotated[PaginationParams, Depends()]
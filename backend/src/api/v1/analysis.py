@@ -110,6 +110,7 @@ async def get_company_insights(
     - **confidence_min**: Minimum confidence score (0-1)
     - **page**: Page number
     - **page_size**: Items per page
+    - **cursor**: next_cursor of the previous page (overrides page)
     """
     try:
         insights, total = await service.get_insights(
@@ -118,12 +119,14 @@ async def get_company_insights(
             confidence_min=confidence_min,
             offset=pagination.offset,
             limit=pagination.page_size,
+            cursor=pagination.cursor,
         )
         return InsightListResponse(
             items=[InsightResponse.model_validate(i) for i in insights],
             total=total,
             page=pagination.page,
             page_size=pagination.page_size,
+            next_cursor=service.next_insights_cursor(insights, pagination.page_size),
         )
     except NotFoundError:
         raise HTTPException(
@@ -1,5 +1,7 @@
 """Document management endpoints."""
 
+from typing import AsyncIterator
+
 from fastapi import APIRouter, Depends, File, Form, HTTPException, UploadFile, status
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -17,6 +19,15 @@ from src.utils.validators import is_allowed_document_type, MAX_FILE_SIZE
 
 router = APIRouter()
 
+# Bytes read from an upload at a time
+_UPLOAD_CHUNK_SIZE = 1024 * 1024
+
+
+async def _read_chunks(file: UploadFile) -> AsyncIterator[bytes]:
+    """Read an uploaded file in chunks."""
+    while chunk := await file.read(_UPLOAD_CHUNK_SIZE):
+        yield chunk
+
 
 def get_document_service(db: AsyncSession = Depends(get_db)) -> DocumentService:
     """Get document service with database session."""
@@ -40,18 +51,21 @@ async def list_documents(
     - **document_type**: Filter by type (pdf, docx, pptx, txt)
     - **page**: Page number (default: 1)
     - **page_size**: Items per page (default: 20, max: 100)
+    - **cursor**: next_cursor of the previous page (overrides page)
     """
     documents, total = await service.list_documents(
         company_id=company_id,
         document_type=document_type,
         offset=pagination.offset,
         limit=pagination.page_size,
+        cursor=pagination.cursor,
     )
     return DocumentListResponse(
         items=[DocumentResponse.model_validate(d) for d in documents],
         total=total,
         page=pagination.page,
         page_size=pagination.page_size,
+        next_cursor=service.next_cursor(documents, pagination.page_size),
     )
 
 
@@ -80,22 +94,13 @@ async def upload_document(
             detail="Invalid file type. Allowed: PDF, DOCX, PPTX, TXT",
         )
 
-    # Read file content
-    content = await file.read()
-    
-    # Validate file size
-    if len(content) > MAX_FILE_SIZE:
-        raise HTTPException(
-            status_code=status.HTTP_400_BAD_REQUEST,
-            detail=f"File too large. Maximum size: {MAX_FILE_SIZE // (1024*1024)}MB",
-        )
-
     try:
-        document = await service.upload_document(
+        # Stream the file to storage; the size limit is checked as it's read
+        document = await service.upload_document_stream(
             company_id=company_id,
             filename=file.filename,
-            content=content,
-            content_type=file.content_type,
+            chunks=_read_chunks(file),
+            max_size=MAX_FILE_SIZE,
             document_type=document_type,
             title=title,
             date=date,
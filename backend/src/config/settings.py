@@ -36,11 +36,20 @@ class Settings(BaseSettings):
     postgres_host: str = "localhost"
     postgres_port: int = 5432
     database_url: str | None = None
+    # Per-process; writes drop cached totals before they commit, so a
+    # total may be up to this stale
+    pagination_count_ttl_seconds: int = 30
+    company_cache_size: int = 10_000
+    company_cache_ttl_seconds: int = 300
 
     # Vector Store (ChromaDB)
     chroma_host: str = "localhost"
     chroma_port: int = 8000
     chroma_auth_token: str = "dev_token"
+    index_cache_size: int = 256
+    chroma_hnsw_m: int = 16
+    chroma_hnsw_construction_ef: int = 128
+    chroma_hnsw_search_ef: int = 64
 
     # LLM Providers
     openai_api_key: str | None = None
@@ -49,6 +58,35 @@ class Settings(BaseSettings):
     openai_model: str = "gpt-4-turbo-preview"
     anthropic_model: str = "claude-3-opus-20240229"
     embedding_model: str = "text-embedding-3-small"
+    embedding_batch_size: int = 64
+    llm_max_concurrency: int = 16
+    llm_prompt_caching: bool = True
+    min_classify_chars: int = 8
+    http_pool_size: int = 32
+    qa_context_token_budget: int = 6000
+
+    # Document parsing
+    pdf_parse_workers: int = 4
+    pdf_parallel_min_pages: int = 50
+    document_parse_workers: int = 4
+
+    # Retrieval
+    reranker_model: str | None = None
+    reranker_precision: Literal["auto", "fp32", "fp16", "int8"] = "auto"
+    reranker_batch_size: int = 64
+    reranker_batch_wait_ms: float = 5.0
+    rerank_skip_score: float = 0.9
+    semantic_cache_enabled: bool = True
+    semantic_cache_size: int = 1024
+    semantic_cache_threshold: float = 0.95
+    semantic_cache_ttl_seconds: int = 300
+    query_embedding_cache_size: int = 4096
+    retrieval_warmup_companies: int = 20
+
+    # DSPy result cache
+    dspy_cache_enabled: bool = True
+    dspy_cache_dir: str = "./.cache/dspy"
+    dspy_cache_size_limit_mb: int = 1024
 
     # File Storage
     storage_backend: Literal["local", "s3"] = "local"
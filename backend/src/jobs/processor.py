@@ -7,6 +7,8 @@ from enum import Enum
 from typing import Any, Callable, Awaitable
 from datetime import datetime
 
+from src.utils.helpers import utc_now
+
 logger = logging.getLogger(__name__)
 
 
@@ -33,7 +35,7 @@ class Job:
     
     def __post_init__(self):
         if self.created_at is None:
-            self.created_at = datetime.utcnow()
+            self.created_at = utc_now()
 
 
 class JobQueue:
@@ -128,7 +130,7 @@ class JobQueue:
                 # Process job
                 logger.info(f"Worker {worker_id} processing job {job_id}")
                 job.status = JobStatus.PROCESSING
-                job.started_at = datetime.utcnow()
+                job.started_at = utc_now()
                 
                 try:
                     await handler(job)
@@ -140,7 +142,7 @@ class JobQueue:
                     job.status = JobStatus.FAILED
                     job.error_message = str(e)
                 finally:
-                    job.completed_at = datetime.utcnow()
+                    job.completed_at = utc_now()
                 
             except asyncio.CancelledError:
                 break
@@ -1,5 +1,6 @@
 """FastAPI application entry point."""
 
+import asyncio
 from contextlib import asynccontextmanager
 from pathlib import Path
 
@@ -13,7 +14,7 @@ from src.api.v1.router import api_router
 from src.config.logging import get_logger, setup_logging
 from src.config.settings import get_settings
 from src.db.base import Base
-from src.db.session import engine
+from src.db.session import AsyncSessionLocal, engine
 
 # Import models to register them with Base
 from src.models.db import analysis, company, document  # noqa: F401
@@ -23,6 +24,27 @@ from src.utils.exceptions import MgmtSaysError
 FRONTEND_DIR = Path(__file__).parent.parent.parent / "frontend" / "dist"
 
 
+async def warm_up_retrieval(company_count: int) -> None:
+    """Prefetch recent companies' indices and load the reranker model."""
+    from src.nlp.indexing import get_index_manager
+    from src.nlp.retrieval.reranker import Reranker
+    from src.repositories.company_repository import CompanyRepository
+
+    logger = get_logger(__name__)
+    try:
+        async with AsyncSessionLocal() as session:
+            companies = await CompanyRepository(session).get_all(limit=company_count)
+
+        index_manager = get_index_manager()
+        await index_manager.initialize()
+        await asyncio.gather(
+            index_manager.warmup([company.id for company in companies]),
+            Reranker().warmup(),
+        )
+    except Exception as e:
+        logger.warning(f"Retrieval warmup failed: {e}")
+
+
 @asynccontextmanager
 async def lifespan(app: FastAPI):
     """Application lifespan handler for startup and shutdown."""
@@ -41,11 +63,21 @@ async def lifespan(app: FastAPI):
             await conn.run_sync(Base.metadata.create_all)
         logger.info("Database tables created/verified")
 
+    # Warm retrieval in the background so startup isn't delayed
+    if settings.retrieval_warmup_companies > 0:
+        app.state.warmup_task = asyncio.create_task(
+            warm_up_retrieval(settings.retrieval_warmup_companies)
+        )
+
     yield
 
     # Shutdown
     logger.info("Shutting down MgmtSays API")
 
+    from src.nlp.ingestion.pdf_parser import shutdown_pdf_pool
+
+    await asyncio.to_thread(shutdown_pdf_pool)
+
 
 def create_app() -> FastAPI:
     """Create and configure the FastAPI application."""
@@ -51,7 +51,10 @@ class AnalysisModel(Base, UUIDMixin, TimestampMixin):
     )
 
     __table_args__ = (
-        Index("ix_analyses_company_status", "company_id", "status"),
+        # Also covers the latest completed analysis lookups
+        Index("ix_analyses_company_status_completed", "company_id", "status", "completed_at"),
+        Index("ix_analyses_company_status_created", "company_id", "status", "created_at"),
+        Index("ix_analyses_company_created", "company_id", "created_at"),
     )
 
     def __init__(self, **kwargs):
@@ -103,7 +106,8 @@ class InitiativeModel(Base, UUIDMixin, TimestampMixin):
     )
 
     __table_args__ = (
-        Index("ix_initiatives_company_category", "company_id", "category"),
+        Index("ix_initiatives_company_category_mentioned", "company_id", "category", "last_mentioned_at"),
+        Index("ix_initiatives_company_mentioned", "company_id", "last_mentioned_at"),
     )
 
     def __init__(self, **kwargs):
@@ -166,7 +170,8 @@ class InsightModel(Base, UUIDMixin, TimestampMixin):
     )
 
     __table_args__ = (
-        Index("ix_insights_company_category", "company_id", "category"),
+        Index("ix_insights_company_category_confidence", "company_id", "category", "confidence_score", "id"),
+        Index("ix_insights_company_confidence", "company_id", "confidence_score", "id"),
         Index("ix_insights_confidence", "confidence_score"),
     )
 
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Text, Index
+from sqlalchemy import DDL, String, Text, Index, event
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.base import Base, TimestampMixin, UUIDMixin, generate_uuid
@@ -47,6 +47,19 @@ class CompanyModel(Base, UUIDMixin, TimestampMixin):
     # Indexes
     __table_args__ = (
         Index("ix_companies_name_search", "name"),
+        # Trigram indexes make substring (ILIKE '%q%') search index-backed
+        Index(
+            "ix_companies_name_trgm",
+            "name",
+            postgresql_using="gin",
+            postgresql_ops={"name": "gin_trgm_ops"},
+        ),
+        Index(
+            "ix_companies_ticker_trgm",
+            "ticker",
+            postgresql_using="gin",
+            postgresql_ops={"ticker": "gin_trgm_ops"},
+        ),
     )
 
     def __init__(self, **kwargs):
@@ -56,3 +69,11 @@ class CompanyModel(Base, UUIDMixin, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Company(id={self.id}, ticker={self.ticker}, name={self.name})>"
+
+
+# The trigram indexes need the pg_trgm extension
+event.listen(
+    CompanyModel.__table__,
+    "before_create",
+    DDL("CREATE EXTENSION IF NOT EXISTS pg_trgm").execute_if(dialect="postgresql"),
+)
@@ -3,7 +3,7 @@
 from datetime import datetime
 from typing import TYPE_CHECKING, Optional
 
-from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Index
+from sqlalchemy import String, Text, Integer, DateTime, ForeignKey, Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 
 from src.db.base import Base, TimestampMixin, UUIDMixin, generate_uuid
@@ -59,8 +59,20 @@ class DocumentModel(Base, UUIDMixin, TimestampMixin):
 
     # Indexes
     __table_args__ = (
-        Index("ix_documents_company_date", "company_id", "document_date"),
+        # Cover the keyset ordering of the full document list (the company
+        # list's ordering is indexed below the class)
+        Index("ix_documents_company_created", "company_id", "created_at", "id"),
+        Index("ix_documents_created", "created_at", "id"),
         Index("ix_documents_status", "status"),
+        # Oldest pending documents, for get_unprocessed / claim_unprocessed
+        Index(
+            "ix_documents_pending_created",
+            "created_at",
+            postgresql_where=text("status = 'pending'"),
+            sqlite_where=text("status = 'pending'"),
+        ),
+        # A company can't upload the same content twice
+        Index("uq_documents_company_hash", "company_id", "content_hash", unique=True),
     )
 
     def __init__(self, **kwargs):
@@ -70,3 +82,23 @@ class DocumentModel(Base, UUIDMixin, TimestampMixin):
 
     def __repr__(self) -> str:
         return f"<Document(id={self.id}, filename={self.filename}, status={self.status})>"
+
+
+# Company document list order: document_date DESC NULLS LAST, created_at
+# DESC, id DESC. A backward scan of an ascending index would put NULL dates
+# first, so PostgreSQL gets the exact ordering; SQLite can't declare NULLS
+# LAST in an index and keeps the plain one.
+Index(
+    "ix_documents_company_date_desc",
+    DocumentModel.company_id,
+    DocumentModel.document_date.desc().nullslast(),
+    DocumentModel.created_at.desc(),
+    DocumentModel.id.desc(),
+).ddl_if(dialect="postgresql")
+Index(
+    "ix_documents_company_date",
+    DocumentModel.company_id,
+    DocumentModel.document_date,
+    DocumentModel.created_at,
+    DocumentModel.id,
+).ddl_if(callable_=lambda ddl, target, bind, **kw: kw["dialect"].name != "postgresql")
@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+from src.utils.helpers import utc_now
+
 
 @dataclass
 class Company:
@@ -15,8 +17,8 @@ class Company:
     description: Optional[str] = None
     sector: Optional[str] = None
     industry: Optional[str] = None
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
+    updated_at: datetime = field(default_factory=utc_now)
 
     # Computed/loaded fields
     document_count: int = 0
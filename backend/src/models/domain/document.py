@@ -5,6 +5,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from src.utils.helpers import utc_now
+
 
 class DocumentType(str, Enum):
     """Types of documents supported."""
@@ -50,8 +52,8 @@ class Document:
     chunk_count: int = 0
     
     # Timestamps
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
+    updated_at: datetime = field(default_factory=utc_now)
     processed_at: Optional[datetime] = None
     
     # Error info
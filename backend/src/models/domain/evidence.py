@@ -4,6 +4,8 @@ from dataclasses import dataclass, field
 from datetime import datetime
 from typing import Optional
 
+from src.utils.helpers import utc_now
+
 
 @dataclass
 class Evidence:
@@ -34,7 +36,7 @@ class Evidence:
     relevance_score: float = 0.0
     
     # Timestamps
-    created_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
 
     @property
     def location_string(self) -> str:
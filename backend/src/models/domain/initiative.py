@@ -5,6 +5,7 @@ from datetime import datetime
 from typing import Optional
 
 from src.models.domain.insight import InsightCategory
+from src.utils.helpers import utc_now
 
 
 @dataclass
@@ -42,8 +43,8 @@ class Initiative:
     keywords: list[str] = field(default_factory=list)
     
     # Timestamps
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
+    updated_at: datetime = field(default_factory=utc_now)
 
     @property
     def duration_days(self) -> int:
@@ -5,6 +5,8 @@ from datetime import datetime
 from enum import Enum
 from typing import Optional
 
+from src.utils.helpers import utc_now
+
 
 class InsightCategory(str, Enum):
     """Categories of strategic insights."""
@@ -60,8 +62,8 @@ class Insight:
     
     # Metadata
     analysis_id: str = ""
-    created_at: datetime = field(default_factory=datetime.utcnow)
-    updated_at: datetime = field(default_factory=datetime.utcnow)
+    created_at: datetime = field(default_factory=utc_now)
+    updated_at: datetime = field(default_factory=utc_now)
 
     @property
     def is_high_confidence(self) -> bool:
@@ -41,6 +41,7 @@ class DocumentListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: str | None = None  # Pass as cursor to get the next page
 
     @property
     def has_more(self) -> bool:
@@ -53,6 +53,7 @@ class InsightListResponse(BaseModel):
     total: int
     page: int
     page_size: int
+    next_cursor: str | None = None  # Pass as cursor to get the next page
 
     @property
     def has_more(self) -> bool:
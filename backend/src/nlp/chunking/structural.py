@@ -1,11 +1,25 @@
 """Structural chunking based on document structure."""
 
+import re
+from collections.abc import AsyncIterator
 from dataclasses import dataclass
 
 from src.nlp.ingestion.parser import ParsedDocument
 from src.nlp.chunking.semantic import Chunk
 
 
+# Chunk type values shared by every chunk's metadata
+_CT_PAGE = "page"
+_CT_PAGE_PART = "page_part"
+_CT_SECTION = "section"
+_CT_SECTION_PART = "section_part"
+_CT_TEXT = "text"
+_CT_TABLE = "table"
+
+# Paragraph boundaries: any run of two or more newlines
+_PARA_RE = re.compile(r"\n{2,}")
+
+
 class StructuralChunker:
     """
     Structural chunker that preserves document hierarchy.
@@ -29,19 +43,23 @@ class StructuralChunker:
         self,
         parsed_doc: ParsedDocument,
         document_id: str,
-    ) -> list[Chunk]:
+    ) -> AsyncIterator[Chunk]:
         """
         Chunk document based on its structure.
         
+        Chunks are yielded as they are produced so consumers (e.g. the
+        embedder) can start before the whole document has been chunked.
+        
         Args:
             parsed_doc: The parsed document
             document_id: Document ID
             
-        Returns:
-            List of structure-aware chunks
+        Yields:
+            Structure-aware chunks
         """
-        chunks = []
         chunk_idx = 0
+        # Template copied into every chunk's metadata
+        base_meta = {"document_id": document_id}
 
         # Chunk by pages if available (PDFs)
         if parsed_doc.pages:
@@ -49,9 +67,11 @@ class StructuralChunker:
                 page_chunks = self._chunk_page(
                     page,
                     document_id,
+                    base_meta,
                     chunk_idx,
                 )
-                chunks.extend(page_chunks)
+                for chunk in page_chunks:
+                    yield chunk
                 chunk_idx += len(page_chunks)
 
         # Chunk by sections if available
@@ -60,56 +80,78 @@ class StructuralChunker:
                 section_chunks = self._chunk_section(
                     section,
                     document_id,
+                    base_meta,
                     section_idx,
                     chunk_idx,
                 )
-                chunks.extend(section_chunks)
+                for chunk in section_chunks:
+                    yield chunk
                 chunk_idx += len(section_chunks)
 
         # Fallback to simple text chunking
         else:
-            chunks = self._chunk_text(
+            text_chunks = self._chunk_text(
                 parsed_doc.text,
                 parsed_doc.metadata,
                 document_id,
+                base_meta,
             )
+            for chunk in text_chunks:
+                yield chunk
+            chunk_idx += len(text_chunks)
 
         # Add table chunks
         if self.include_tables and parsed_doc.tables:
             table_chunks = self._chunk_tables(
                 parsed_doc.tables,
                 document_id,
+                base_meta,
                 chunk_idx,
             )
-            chunks.extend(table_chunks)
+            for chunk in table_chunks:
+                yield chunk
 
-        return chunks
+    async def chunk_document_list(
+        self,
+        parsed_doc: ParsedDocument,
+        document_id: str,
+    ) -> list[Chunk]:
+        """
+        Chunk document and collect all chunks into a list.
+        
+        Convenience wrapper around chunk_document for callers that
+        need the full chunk list up front.
+        """
+        return [chunk async for chunk in self.chunk_document(parsed_doc, document_id)]
 
     def _chunk_page(
         self,
         page: dict,
         document_id: str,
+        base_meta: dict,
         start_idx: int,
     ) -> list[Chunk]:
         """Chunk a single page."""
         text = page.get("text", "")
         page_num = page.get("page_number", 1)
+        page_meta = base_meta.copy()
+        page_meta["page_number"] = page_num
 
         if len(text) <= self.max_chunk_size:
+            page_meta["chunk_type"] = _CT_PAGE
             return [
                 Chunk(
                     id=f"{document_id}_page_{page_num}",
                     text=text,
-                    metadata={
-                        "page_number": page_num,
-                        "document_id": document_id,
-                        "chunk_type": "page",
-                    },
+                    metadata=page_meta,
                 )
             ]
 
+        page_meta["chunk_type"] = _CT_PAGE_PART
+
         # Split large pages
         chunks = []
+        id_prefix = f"{document_id}_page_{page_num}_part_"
         words = text.split()
         current_chunk = []
         current_length = 0
@@ -117,16 +159,13 @@ class StructuralChunker:
         for word in words:
             word_length = len(word) + 1  # +1 for space
             if current_length + word_length > self.max_chunk_size and current_chunk:
+                meta = page_meta.copy()
+                meta["part_index"] = len(chunks)
                 chunks.append(
                     Chunk(
-                        id=f"{document_id}_page_{page_num}_part_{len(chunks)}",
+                        id=id_prefix + str(len(chunks)),
                         text=" ".join(current_chunk),
-                        metadata={
-                            "page_number": page_num,
-                            "document_id": document_id,
-                            "chunk_type": "page_part",
-                            "part_index": len(chunks),
-                        },
+                        metadata=meta,
                     )
                 )
                 current_chunk = []
@@ -136,16 +175,13 @@ class StructuralChunker:
             current_length += word_length
 
         if current_chunk:
+            meta = page_meta.copy()
+            meta["part_index"] = len(chunks)
             chunks.append(
                 Chunk(
-                    id=f"{document_id}_page_{page_num}_part_{len(chunks)}",
+                    id=id_prefix + str(len(chunks)),
                     text=" ".join(current_chunk),
-                    metadata={
-                        "page_number": page_num,
-                        "document_id": document_id,
-                        "chunk_type": "page_part",
-                        "part_index": len(chunks),
-                    },
+                    metadata=meta,
                 )
             )
 
@@ -155,6 +191,7 @@ class StructuralChunker:
         self,
         section: dict,
         document_id: str,
+        base_meta: dict,
         section_idx: int,
         start_idx: int,
     ) -> list[Chunk]:
@@ -170,41 +207,39 @@ class StructuralChunker:
 
         full_text = f"{heading}\n\n{text}" if heading else text
 
+        section_meta = base_meta.copy()
+        section_meta["section_heading"] = heading
+        section_meta["section_index"] = section_idx
+        section_meta["speaker_role"] = speaker_role
+
         if len(full_text) <= self.max_chunk_size:
+            section_meta["chunk_type"] = _CT_SECTION
             return [
                 Chunk(
                     id=f"{document_id}_section_{section_idx}",
                     text=full_text,
-                    metadata={
-                        "section_heading": heading,
-                        "section_index": section_idx,
-                        "document_id": document_id,
-                        "chunk_type": "section",
-                        "speaker_role": speaker_role,
-                    },
+                    metadata=section_meta,
                 )
             ]
 
+        section_meta["chunk_type"] = _CT_SECTION_PART
+
         # Split large sections while preserving heading context
         chunks = []
-        paragraphs = text.split("\n\n")
+        id_prefix = f"{document_id}_section_{section_idx}_part_"
+        paragraphs = [p for p in _PARA_RE.split(text) if p]
         current_chunk = [heading] if heading else []
         current_length = len(heading) if heading else 0
 
         for para in paragraphs:
             if current_length + len(para) > self.max_chunk_size and len(current_chunk) > 1:
+                meta = section_meta.copy()
+                meta["part_index"] = len(chunks)
                 chunks.append(
                     Chunk(
-                        id=f"{document_id}_section_{section_idx}_part_{len(chunks)}",
+                        id=id_prefix + str(len(chunks)),
                         text="\n\n".join(current_chunk),
-                        metadata={
-                            "section_heading": heading,
-                            "section_index": section_idx,
-                            "document_id": document_id,
-                            "chunk_type": "section_part",
-                            "part_index": len(chunks),
-                            "speaker_role": speaker_role,
-                        },
+                        metadata=meta,
                     )
                 )
                 # Start new chunk with heading context
@@ -215,18 +250,13 @@ class StructuralChunker:
             current_length += len(para)
 
         if current_chunk:
+            meta = section_meta.copy()
+            meta["part_index"] = len(chunks)
             chunks.append(
                 Chunk(
-                    id=f"{document_id}_section_{section_idx}_part_{len(chunks)}",
+                    id=id_prefix + str(len(chunks)),
                     text="\n\n".join(current_chunk),
-                    metadata={
-                        "section_heading": heading,
-                        "section_index": section_idx,
-                        "document_id": document_id,
-                        "chunk_type": "section_part",
-                        "part_index": len(chunks),
-                        "speaker_role": speaker_role,
-                    },
+                    metadata=meta,
                 )
             )
 
@@ -237,25 +267,27 @@ class StructuralChunker:
         text: str,
         metadata: dict,
         document_id: str,
+        base_meta: dict,
     ) -> list[Chunk]:
         """Simple text chunking fallback."""
+        text_meta = metadata.copy()
+        text_meta.update(base_meta)
+        text_meta["chunk_type"] = _CT_TEXT
         chunks = []
-        paragraphs = text.split("\n\n")
+        id_prefix = f"{document_id}_chunk_"
+        paragraphs = [p for p in _PARA_RE.split(text) if p]
         current_chunk = []
         current_length = 0
 
         for para in paragraphs:
             if current_length + len(para) > self.max_chunk_size and current_chunk:
+                meta = text_meta.copy()
+                meta["chunk_index"] = len(chunks)
                 chunks.append(
                     Chunk(
-                        id=f"{document_id}_chunk_{len(chunks)}",
+                        id=id_prefix + str(len(chunks)),
                         text="\n\n".join(current_chunk),
-                        metadata={
-                            **metadata,
-                            "document_id": document_id,
-                            "chunk_index": len(chunks),
-                            "chunk_type": "text",
-                        },
+                        metadata=meta,
                     )
                 )
                 current_chunk = []
@@ -265,16 +297,13 @@ class StructuralChunker:
             current_length += len(para)
 
         if current_chunk:
+            meta = text_meta.copy()
+            meta["chunk_index"] = len(chunks)
             chunks.append(
                 Chunk(
-                    id=f"{document_id}_chunk_{len(chunks)}",
+                    id=id_prefix + str(len(chunks)),
                     text="\n\n".join(current_chunk),
-                    metadata={
-                        **metadata,
-                        "document_id": document_id,
-                        "chunk_index": len(chunks),
-                        "chunk_type": "text",
-                    },
+                    metadata=meta,
                 )
             )
 
@@ -284,6 +313,7 @@ class StructuralChunker:
         self,
         tables: list[dict],
         document_id: str,
+        base_meta: dict,
         start_idx: int,
     ) -> list[Chunk]:
         """Create chunks from tables."""
@@ -296,18 +326,18 @@ class StructuralChunker:
             # Convert table to text representation
             table_text = self._table_to_text(table_data)
 
+            table_meta = base_meta.copy()
+            table_meta["chunk_type"] = _CT_TABLE
+            table_meta["table_index"] = i
+            table_meta["page_number"] = page
+            table_meta["row_count"] = len(table_data)
+            table_meta["col_count"] = len(table_data[0]) if table_data else 0
+
             chunks.append(
                 Chunk(
                     id=f"{document_id}_table_{i}",
                     text=table_text,
-                    metadata={
-                        "document_id": document_id,
-                        "chunk_type": "table",
-                        "table_index": i,
-                        "page_number": page,
-                        "row_count": len(table_data),
-                        "col_count": len(table_data[0]) if table_data else 0,
-                    },
+                    metadata=table_meta,
                 )
             )
 
@@ -1,20 +1,42 @@
 """DSPy base module with common configuration."""
 
 import logging
+import threading
 from functools import lru_cache
 
 import dspy
+import httpx
+import litellm
 
 from src.config.settings import get_settings
 
 
 logger = logging.getLogger(__name__)
 
+# Mark the system message (signature instructions and demos) as a cacheable
+# prompt prefix for providers that need explicit cache_control blocks
+_PROMPT_CACHE_POINTS = [{"location": "message", "role": "system"}]
+
+# Guards one-time DSPy setup across threads
+_setup_lock = threading.Lock()
+
+
+def _configure_http_pool():
+    """Share pooled keep-alive HTTP clients across all LiteLLM calls."""
+    pool_size = get_settings().http_pool_size
+    limits = httpx.Limits(
+        max_connections=pool_size,
+        max_keepalive_connections=pool_size,
+    )
+    litellm.client_session = httpx.Client(limits=limits)
+    litellm.aclient_session = httpx.AsyncClient(limits=limits)
+
 
 @lru_cache()
 def get_dspy_lm():
     """Get configured DSPy language model."""
     settings = get_settings()
+    _configure_http_pool()
 
     if settings.llm_provider == "openai":
         lm = dspy.LM(
@@ -23,10 +45,14 @@ def get_dspy_lm():
             temperature=settings.llm_temperature,
         )
     elif settings.llm_provider == "anthropic":
+        extra = {}
+        if settings.llm_prompt_caching:
+            extra["cache_control_injection_points"] = _PROMPT_CACHE_POINTS
         lm = dspy.LM(
             model=f"anthropic/{settings.anthropic_model}",
             api_key=settings.anthropic_api_key,
             temperature=settings.llm_temperature,
+            **extra,
         )
     elif settings.llm_provider == "azure":
         lm = dspy.LM(
@@ -43,7 +69,18 @@ def get_dspy_lm():
 
 
 def configure_dspy():
-    """Configure DSPy with the language model."""
+    """Configure DSPy with the language model (once per process)."""
+    with _setup_lock:
+        _configure_dspy_once()
+
+
+@lru_cache(maxsize=1)
+def _configure_dspy_once():
+    """Run the actual DSPy configuration."""
     lm = get_dspy_lm()
-    dspy.configure(lm=lm)
+    dspy.configure(
+        lm=lm,
+        async_max_workers=get_settings().llm_max_concurrency,
+    )
     logger.info("DSPy configured successfully")
+
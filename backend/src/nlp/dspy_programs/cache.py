@@ -0,0 +1,121 @@
+"""Persistent cache for DSPy program results."""
+
+import json
+import logging
+import threading
+from functools import lru_cache
+from typing import Any
+
+import diskcache
+import dspy
+import xxhash
+
+from src.config.settings import get_settings
+
+
+logger = logging.getLogger(__name__)
+
+
+class DiskCacheBackend:
+    """
+    Disk-backed cache for normalized DSPy outputs.
+
+    Entries are keyed by an xxh128 hash of the signature version,
+    the configured LM model and the call inputs, so identical calls
+    across re-runs skip the LLM round-trip.
+    """
+
+    def __init__(self, directory: str, size_limit: int):
+        self._cache = diskcache.Cache(directory, size_limit=size_limit)
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+
+    def make_key(self, signature: str, inputs: dict[str, Any]) -> str:
+        """
+        Build a cache key for a program call.
+
+        Args:
+            signature: Versioned signature name, e.g. "InsightClassificationSignature/v1"
+            inputs: Input fields passed to the program
+
+        Returns:
+            Hex digest identifying the call
+        """
+        lm = dspy.settings.lm
+        payload = json.dumps(
+            {
+                "sig": signature,
+                "model": getattr(lm, "model", None),
+                "inputs": inputs,
+            },
+            sort_keys=True,
+            default=str,
+        )
+        return xxhash.xxh128(payload.encode("utf-8")).hexdigest()
+
+    def get(self, key: str) -> Any | None:
+        """Get a cached result, or None on a miss."""
+        try:
+            value = self._cache.get(key)
+        except Exception as e:
+            logger.warning(f"DSPy cache read failed: {e}")
+            value = None
+
+        with self._lock:
+            if value is None:
+                self._misses += 1
+            else:
+                self._hits += 1
+
+        return value
+
+    def set(self, key: str, value: Any) -> None:
+        """Store a result."""
+        try:
+            self._cache.set(key, value)
+        except Exception as e:
+            logger.warning(f"DSPy cache write failed: {e}")
+
+    def clear(self) -> None:
+        """Remove all entries and reset counters."""
+        self._cache.clear()
+        with self._lock:
+            self._hits = 0
+            self._misses = 0
+
+    def stats(self) -> dict[str, Any]:
+        """Get hit/miss counters and on-disk size."""
+        with self._lock:
+            hits, misses = self._hits, self._misses
+
+        total = hits + misses
+        return {
+            "hits": hits,
+            "misses": misses,
+            "hit_rate": hits / total if total else 0.0,
+            "entries": len(self._cache),
+            "size_bytes": self._cache.volume(),
+        }
+
+
+@lru_cache
+def get_dspy_cache() -> DiskCacheBackend | None:
+    """Get the shared DSPy result cache, or None when disabled."""
+    settings = get_settings()
+
+    if not settings.dspy_cache_enabled:
+        return None
+
+    return DiskCacheBackend(
+        settings.dspy_cache_dir,
+        size_limit=settings.dspy_cache_size_limit_mb * 1024 * 1024,
+    )
+
+
+def stats() -> dict[str, Any]:
+    """Get statistics for the shared DSPy result cache."""
+    cache = get_dspy_cache()
+    if cache is None:
+        return {"enabled": False}
+    return {"enabled": True, **cache.stats()}
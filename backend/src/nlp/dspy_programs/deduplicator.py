@@ -1,5 +1,6 @@
 """DSPy-based initiative deduplicator."""
 
+import itertools
 import logging
 from typing import Any
 
@@ -54,6 +55,22 @@ class MergeSignature(dspy.Signature):
     )
 
 
+class BatchedMergeSignature(dspy.Signature):
+    """Merge several independent groups of similar initiatives, one canonical form per group."""
+    
+    groups: list[list[str]] = dspy.InputField(
+        desc="Groups of similar initiative descriptions; each group is merged separately"
+    )
+    
+    merged: list[dict] = dspy.OutputField(
+        desc=(
+            "One entry per input group, in the same order, with keys "
+            "canonical_name, canonical_description, combined_metrics (list) "
+            "and combined_timeline"
+        )
+    )
+
+
 class InitiativeDeduplicator(dspy.Module):
     """
     Identifies and merges duplicate initiatives.
@@ -69,6 +86,9 @@ class InitiativeDeduplicator(dspy.Module):
         self.similarity_threshold = similarity_threshold
         self.comparator = dspy.ChainOfThought(DeduplicationSignature)
         self.merger = dspy.ChainOfThought(MergeSignature)
+        self.batch_merger = dspy.ChainOfThought(BatchedMergeSignature)
+        # Lowercased token sets, reused across the pairwise fallback comparisons
+        self._token_cache: dict[str, frozenset[str]] = {}
 
     def forward(
         self,
@@ -97,14 +117,20 @@ class InitiativeDeduplicator(dspy.Module):
         # Find duplicate groups
         groups = self._find_duplicate_groups(init_dicts)
 
-        # Merge each group
+        # Merge all multi-member groups in one LLM call where possible
+        multi_groups = [group for group in groups if len(group) > 1]
+        batch_results = self._merge_groups_batched(multi_groups)
+
         merged = []
+        batch_idx = 0
         for group in groups:
             if len(group) == 1:
                 merged.append(group[0])
+            elif batch_results is not None:
+                merged.append(batch_results[batch_idx])
+                batch_idx += 1
             else:
-                merged_init = self._merge_group(group)
-                merged.append(merged_init)
+                merged.append(self._merge_group(group))
 
         return merged
 
@@ -119,6 +145,7 @@ class InitiativeDeduplicator(dspy.Module):
         # Track which initiatives have been grouped
         grouped = set()
         groups = []
+        self._token_cache.clear()
 
         for i, init_a in enumerate(initiatives):
             if i in grouped:
@@ -140,6 +167,7 @@ class InitiativeDeduplicator(dspy.Module):
 
             groups.append(group)
 
+        self._token_cache.clear()
         return groups
 
     def _compare_initiatives(
@@ -148,8 +176,10 @@ class InitiativeDeduplicator(dspy.Module):
         init_b: dict,
     ) -> tuple[bool, float]:
         """Compare two initiatives for similarity."""
-        text_a = f"{init_a.get('name', '')}: {init_a.get('description', '')}"
-        text_b = f"{init_b.get('name', '')}: {init_b.get('description', '')}"
+        name_a, desc_a = init_a.get("name", ""), init_a.get("description", "")
+        name_b, desc_b = init_b.get("name", ""), init_b.get("description", "")
+        text_a = f"{name_a}: {desc_a}"
+        text_b = f"{name_b}: {desc_b}"
 
         try:
             result = self.comparator(
@@ -164,12 +194,39 @@ class InitiativeDeduplicator(dspy.Module):
         except Exception as e:
             logger.warning(f"Comparison failed, using fallback: {e}")
             # Fallback to simple text comparison
-            return self._simple_compare(text_a, text_b)
+            return self._simple_compare(name_a, desc_a, name_b, desc_b)
+
+    def _tokens(self, text: str) -> frozenset[str]:
+        """Lowercased word set for text, cached for the current grouping pass."""
+        tokens = self._token_cache.get(text)
+        if tokens is None:
+            tokens = frozenset(text.lower().split())
+            self._token_cache[text] = tokens
+        return tokens
 
-    def _simple_compare(self, text_a: str, text_b: str) -> tuple[bool, float]:
-        """Simple text-based similarity fallback."""
-        words_a = set(text_a.lower().split())
-        words_b = set(text_b.lower().split())
+    def _simple_compare(
+        self,
+        name_a: str,
+        desc_a: str,
+        name_b: str,
+        desc_b: str,
+    ) -> tuple[bool, float]:
+        """
+        Simple text-based similarity fallback.
+        
+        Compares names first and only pulls in description tokens
+        when the name overlap alone is inconclusive.
+        """
+        names_a = self._tokens(name_a)
+        names_b = self._tokens(name_b)
+
+        if names_a and names_b:
+            name_score = len(names_a & names_b) / len(names_a | names_b)
+            if name_score >= self.similarity_threshold or name_score < 0.05:
+                return name_score >= self.similarity_threshold, name_score
+
+        words_a = names_a | self._tokens(desc_a)
+        words_b = names_b | self._tokens(desc_b)
 
         if not words_a or not words_b:
             return False, 0.0
@@ -194,38 +251,13 @@ class InitiativeDeduplicator(dspy.Module):
         try:
             result = self.merger(initiatives=descriptions)
 
-            # Collect all evidence
-            all_evidence = []
-            all_metrics = []
-            all_sources = []
-            highest_confidence = 0.0
-            best_category = group[0].get("category", "strategy")
-
-            for init in group:
-                if init.get("evidence_quote"):
-                    all_evidence.append(init["evidence_quote"])
-                if init.get("metrics"):
-                    all_metrics.extend(init["metrics"])
-                if init.get("source_chunk_id"):
-                    all_sources.append(init["source_chunk_id"])
-                if init.get("confidence", 0) > highest_confidence:
-                    highest_confidence = init["confidence"]
-                    best_category = init.get("category", "strategy")
-
-            # Deduplicate metrics
-            unique_metrics = list(set(result.combined_metrics + all_metrics))
-
-            return {
-                "name": result.canonical_name,
-                "description": result.canonical_description,
-                "category": best_category,
-                "timeline": result.combined_timeline or group[0].get("timeline"),
-                "metrics": unique_metrics,
-                "confidence": highest_confidence,
-                "evidence_quotes": all_evidence,
-                "source_chunk_ids": all_sources,
-                "merged_count": len(group),
-            }
+            return self._build_merged(
+                group,
+                name=result.canonical_name,
+                description=result.canonical_description,
+                metrics=result.combined_metrics,
+                timeline=result.combined_timeline,
+            )
         except Exception as e:
             logger.warning(f"Merge failed, using first initiative: {e}")
             # Fallback to first initiative with combined sources
@@ -238,6 +270,93 @@ class InitiativeDeduplicator(dspy.Module):
             ]
             return result
 
+    def _merge_groups_batched(
+        self,
+        groups: list[list[dict]],
+    ) -> list[dict] | None:
+        """
+        Merge several duplicate groups with a single LLM call.
+        
+        Returns None when batching is not worthwhile or the response
+        cannot be matched to the input groups, so the caller falls back
+        to merging each group separately.
+        """
+        if len(groups) < 2:
+            return None
+
+        group_descriptions = [
+            [
+                f"{init.get('name', '')}: {init.get('description', '')}"
+                for init in group
+            ]
+            for group in groups
+        ]
+
+        try:
+            result = self.batch_merger(groups=group_descriptions)
+            merged = list(result.merged or [])
+
+            if len(merged) != len(groups):
+                raise ValueError(
+                    f"expected {len(groups)} merged groups, got {len(merged)}"
+                )
+
+            return [
+                self._build_merged(
+                    group,
+                    name=str(item["canonical_name"]),
+                    description=str(item.get("canonical_description", "")),
+                    metrics=list(item.get("combined_metrics") or []),
+                    timeline=item.get("combined_timeline"),
+                )
+                for group, item in zip(groups, merged)
+            ]
+        except Exception as e:
+            logger.warning(f"Batched merge failed, merging groups individually: {e}")
+            return None
+
+    def _build_merged(
+        self,
+        group: list[dict],
+        name: str,
+        description: str,
+        metrics: list[str],
+        timeline: str | None,
+    ) -> dict:
+        """Combine a group's evidence with its canonical merged fields."""
+        # Collect all evidence
+        all_evidence = []
+        all_metrics = []
+        all_sources = []
+        highest_confidence = 0.0
+        best_category = group[0].get("category", "strategy")
+
+        for init in group:
+            if init.get("evidence_quote"):
+                all_evidence.append(init["evidence_quote"])
+            if init.get("metrics"):
+                all_metrics.extend(init["metrics"])
+            if init.get("source_chunk_id"):
+                all_sources.append(init["source_chunk_id"])
+            if init.get("confidence", 0) > highest_confidence:
+                highest_confidence = init["confidence"]
+                best_category = init.get("category", "strategy")
+
+        # Deduplicate metrics, keeping first-seen order
+        unique_metrics = list(dict.fromkeys(itertools.chain(metrics, all_metrics)))
+
+        return {
+            "name": name,
+            "description": description,
+            "category": best_category,
+            "timeline": timeline or group[0].get("timeline"),
+            "metrics": unique_metrics,
+            "confidence": highest_confidence,
+            "evidence_quotes": all_evidence,
+            "source_chunk_ids": all_sources,
+            "merged_count": len(group),
+        }
+
     async def deduplicate_batch(
         self,
         initiatives: list[dict],
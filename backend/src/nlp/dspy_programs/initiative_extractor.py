@@ -1,5 +1,6 @@
 """DSPy-based initiative extractor."""
 
+from types import MappingProxyType
 from typing import Any
 import logging
 
@@ -11,6 +12,21 @@ from src.nlp.dspy_programs.base import configure_dspy
 
 logger = logging.getLogger(__name__)
 
+_VALID_CATEGORIES = frozenset({"strategy", "product", "market", "operational", "financial"})
+
+# Common variations mapped to valid categories
+_CATEGORY_MAP = MappingProxyType({
+    "strategic": "strategy",
+    "products": "product",
+    "marketing": "market",
+    "operations": "operational",
+    "finance": "financial",
+    "growth": "strategy",
+    "expansion": "market",
+    "cost": "operational",
+    "revenue": "financial",
+})
+
 
 class ExtractedInitiative(BaseModel):
     """An extracted strategic initiative."""
@@ -22,6 +38,8 @@ class ExtractedInitiative(BaseModel):
     metrics: list[str] = Field(default_factory=list, description="Any mentioned metrics or KPIs")
     confidence: float = Field(default=0.0, description="Confidence score 0-1")
     evidence_quote: str = Field(description="Direct quote from source text")
+    source_chunk_id: str | None = Field(default=None, description="ID of the source chunk")
+    source_metadata: dict = Field(default_factory=dict, description="Metadata of the source chunk")
 
 
 class InitiativeExtractionSignature(dspy.Signature):
@@ -89,14 +107,17 @@ class InitiativeExtractor(dspy.Module):
         initiatives = []
         for init_dict in result.initiatives:
             try:
-                initiative = ExtractedInitiative(
-                    name=init_dict.get("name", ""),
-                    description=init_dict.get("description", ""),
+                # Fields are coerced explicitly, so skip Pydantic re-validation
+                initiative = ExtractedInitiative.model_construct(
+                    name=str(init_dict.get("name") or ""),
+                    description=str(init_dict.get("description") or ""),
                     category=self._normalize_category(init_dict.get("category", "strategy")),
                     timeline=init_dict.get("timeline"),
-                    metrics=init_dict.get("metrics", []),
+                    metrics=list(init_dict.get("metrics") or []),
                     confidence=float(init_dict.get("confidence", 0.5)),
-                    evidence_quote=init_dict.get("evidence_quote", ""),
+                    evidence_quote=str(init_dict.get("evidence_quote") or ""),
+                    source_chunk_id=None,
+                    source_metadata={},
                 )
                 initiatives.append(initiative)
             except Exception as e:
@@ -107,26 +128,10 @@ class InitiativeExtractor(dspy.Module):
 
     def _normalize_category(self, category: str) -> str:
         """Normalize category to valid values."""
-        valid_categories = {"strategy", "product", "market", "operational", "financial"}
         normalized = category.lower().strip()
-        
-        if normalized in valid_categories:
+        if normalized in _VALID_CATEGORIES:
             return normalized
-        
-        # Map common variations
-        mapping = {
-            "strategic": "strategy",
-            "products": "product",
-            "marketing": "market",
-            "operations": "operational",
-            "finance": "financial",
-            "growth": "strategy",
-            "expansion": "market",
-            "cost": "operational",
-            "revenue": "financial",
-        }
-        
-        return mapping.get(normalized, "strategy")
+        return _CATEGORY_MAP.get(normalized, "strategy")
 
     async def extract_from_chunks(
         self,
@@ -161,9 +166,8 @@ class InitiativeExtractor(dspy.Module):
                 
                 # Add source metadata
                 for init in initiatives:
-                    init_dict = init.model_dump()
-                    init_dict["source_chunk_id"] = chunk.get("id")
-                    init_dict["source_metadata"] = chunk.get("metadata", {})
+                    init.source_chunk_id = chunk.get("id")
+                    init.source_metadata = chunk.get("metadata", {})
                 
                 all_initiatives.extend(initiatives)
             except Exception as e:
@@ -1,14 +1,62 @@
 """DSPy-based insight classifier."""
 
+import asyncio
 import logging
+from types import MappingProxyType
 
 import dspy
 
+from src.config.settings import get_settings
 from src.nlp.dspy_programs.base import configure_dspy
+from src.nlp.dspy_programs.cache import get_dspy_cache
 
 
 logger = logging.getLogger(__name__)
 
+# Bump when the signature or normalization changes to invalidate cached results
+_CACHE_SIGNATURE = "InsightClassificationSignature/v1"
+
+# Raw category label (lowercased) -> valid category, covering both the
+# valid names themselves and common variations
+_CATEGORY_LOOKUP = MappingProxyType({
+    "strategy": "strategy",
+    "product": "product",
+    "market": "market",
+    "operational": "operational",
+    "financial": "financial",
+    "technology": "technology",
+    "regulatory": "regulatory",
+    "competitive": "competitive",
+    "strategic": "strategy",
+    "products": "product",
+    "marketing": "market",
+    "operations": "operational",
+    "finance": "financial",
+    "tech": "technology",
+    "regulation": "regulatory",
+    "competition": "competitive",
+})
+
+# Returned for insights that are too short to classify or whose
+# classification failed
+DEFAULT_CLASSIFICATION = MappingProxyType({
+    "primary_category": "strategy",
+    "secondary_categories": [],
+    "importance_score": 5.0,
+    "sentiment": "neutral",
+    "actionability": "informational",
+    "reasoning": "Classification failed",
+})
+
+# Keyword found in a free-form actionability label -> valid actionability,
+# in priority order
+_ACTIONABILITY_KEYWORDS = MappingProxyType({
+    "immediate": "immediate",
+    "now": "immediate",
+    "short": "short_term",
+    "long": "long_term",
+})
+
 
 class InsightClassificationSignature(dspy.Signature):
     """Classify an insight or initiative into categories and assess importance."""
@@ -92,12 +140,29 @@ class InsightClassifier(dspy.Module):
         Returns:
             Classification dictionary
         """
-        result = self.classifier(
-            insight_text=insight_text,
-            context=context,
-            company_industry=company_industry,
-        )
+        inputs = {
+            "insight_text": insight_text,
+            "context": context,
+            "company_industry": company_industry,
+        }
+
+        cache = get_dspy_cache()
+        if cache is not None:
+            cache_key = cache.make_key(_CACHE_SIGNATURE, inputs)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self.classifier(**inputs)
+        classification = self._to_classification(result)
+
+        if cache is not None:
+            cache.set(cache_key, classification)
+
+        return classification
 
+    def _to_classification(self, result: dspy.Prediction) -> dict:
+        """Normalize a classifier prediction into a classification dict."""
         return {
             "primary_category": self._normalize_category(result.primary_category),
             "secondary_categories": [
@@ -112,22 +177,7 @@ class InsightClassifier(dspy.Module):
 
     def _normalize_category(self, category: str) -> str:
         """Normalize to valid category."""
-        normalized = category.lower().strip()
-        if normalized in self.VALID_CATEGORIES:
-            return normalized
-        
-        # Map common variations
-        mapping = {
-            "strategic": "strategy",
-            "products": "product",
-            "marketing": "market",
-            "operations": "operational",
-            "finance": "financial",
-            "tech": "technology",
-            "regulation": "regulatory",
-            "competition": "competitive",
-        }
-        return mapping.get(normalized, "strategy")
+        return _CATEGORY_LOOKUP.get(category.lower().strip(), "strategy")
 
     def _normalize_sentiment(self, sentiment: str) -> str:
         """Normalize to valid sentiment."""
@@ -142,13 +192,11 @@ class InsightClassifier(dspy.Module):
         if normalized in self.VALID_ACTIONABILITY:
             return normalized
         
-        # Map variations
-        if "immediate" in normalized or "now" in normalized:
-            return "immediate"
-        elif "short" in normalized:
-            return "short_term"
-        elif "long" in normalized:
-            return "long_term"
+        # Map variations; keywords are checked in priority order, not by
+        # position, so "long-term, but act now" is immediate
+        for keyword, actionability_value in _ACTIONABILITY_KEYWORDS.items():
+            if keyword in normalized:
+                return actionability_value
         return "informational"
 
     def _normalize_score(self, score: float) -> float:
@@ -174,33 +222,113 @@ class InsightClassifier(dspy.Module):
         Returns:
             List of classification results
         """
-        results = []
-        
-        for insight in insights:
-            text = insight.get("text") or insight.get("description", "")
-            context = insight.get("context", "")
-            
+        if not insights:
+            return []
+
+        all_inputs = [
+            {
+                "insight_text": insight.get("text") or insight.get("description", ""),
+                "context": insight.get("context", ""),
+                "company_industry": company_industry,
+            }
+            for insight in insights
+        ]
+
+        # Degenerate inputs get the default classification without an LLM call
+        min_chars = get_settings().min_classify_chars
+        skipped = {
+            i for i, inputs in enumerate(all_inputs)
+            if len(inputs["insight_text"].strip()) < min_chars
+        }
+
+        # Serve repeated inputs from the cache and only send misses to the LLM
+        cache = get_dspy_cache()
+        classifications: list[dict | None] = [None] * len(insights)
+        cache_keys: list[str | None] = [None] * len(insights)
+        if cache is not None:
+            for i, inputs in enumerate(all_inputs):
+                if i in skipped:
+                    continue
+                cache_keys[i] = cache.make_key(_CACHE_SIGNATURE, inputs)
+                classifications[i] = cache.get(cache_keys[i])
+
+        # Send each distinct (text, context) once; duplicates reuse the
+        # result of their first occurrence
+        pending: list[int] = []
+        duplicate_of: dict[int, int] = {}
+        first_seen: dict[tuple[str, str], int] = {}
+        for i, c in enumerate(classifications):
+            if c is not None or i in skipped:
+                continue
+            key = (all_inputs[i]["insight_text"], all_inputs[i]["context"])
+            if key in first_seen:
+                duplicate_of[i] = first_seen[key]
+            else:
+                first_seen[key] = i
+                pending.append(i)
+        errors: dict[int, Exception] = {}
+
+        if pending:
+            examples = [
+                dspy.Example(**all_inputs[i]).with_inputs(
+                    "insight_text", "context", "company_industry"
+                )
+                for i in pending
+            ]
+
+            # DSPy's batch API fans the calls out over a thread pool; failed
+            # examples come back as None
             try:
-                classification = self.forward(
-                    insight_text=text,
-                    context=context,
-                    company_industry=company_industry,
+                predictions = await asyncio.to_thread(
+                    self.classifier.batch,
+                    examples,
+                    num_threads=get_settings().llm_max_concurrency,
+                    max_errors=len(examples),
                 )
-                
-                # Merge with original insight
-                result = {**insight, **classification}
-                results.append(result)
             except Exception as e:
-                logger.error(f"Failed to classify insight: {e}")
+                logger.error(f"Batch classification failed: {e}")
+                predictions = [None] * len(pending)
+
+            for i, prediction in zip(pending, predictions):
+                try:
+                    if prediction is None:
+                        raise ValueError("no prediction returned")
+                    classifications[i] = self._to_classification(prediction)
+                except Exception as e:
+                    errors[i] = e
+                    continue
+
+                if cache is not None:
+                    cache.set(cache_keys[i], classifications[i])
+
+        for i, first in duplicate_of.items():
+            if classifications[first] is None:
+                errors[i] = errors.get(first)
+                continue
+            classifications[i] = {
+                **classifications[first],
+                "secondary_categories": list(classifications[first]["secondary_categories"]),
+            }
+
+        results = []
+        for i, insight in enumerate(insights):
+            if classifications[i] is not None:
+                # Merge with original insight
+                results.append({**insight, **classifications[i]})
+            elif i in skipped:
+                results.append({
+                    **insight,
+                    **DEFAULT_CLASSIFICATION,
+                    "secondary_categories": [],
+                    "reasoning": "Insight text too short to classify",
+                })
+            else:
+                logger.error(f"Failed to classify insight: {errors.get(i)}")
                 # Return insight with default classification
                 results.append({
                     **insight,
-                    "primary_category": "strategy",
+                    **DEFAULT_CLASSIFICATION,
                     "secondary_categories": [],
-                    "importance_score": 5.0,
-                    "sentiment": "neutral",
-                    "actionability": "informational",
-                    "reasoning": "Classification failed",
                 })
 
         return results
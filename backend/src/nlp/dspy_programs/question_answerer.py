@@ -1,27 +1,98 @@
 """DSPy-based question answerer with citations."""
 
 import logging
-from typing import Any
+from functools import lru_cache
+from typing import Any, cast
 
 import dspy
+import tiktoken
 
+try:
+    import ahocorasick
+except ImportError:  # Optional accelerator for citation matching
+    ahocorasick = None
+
+from src.config.settings import get_settings
 from src.nlp.dspy_programs.base import configure_dspy
+from src.nlp.dspy_programs.cache import get_dspy_cache
 
 
 logger = logging.getLogger(__name__)
 
+# Bump when the signature or normalization changes to invalidate cached results
+_CACHE_SIGNATURE = "QuestionAnswerSignature/v2"
+
+
+@lru_cache
+def _get_encoding() -> tiktoken.Encoding:
+    """Tokenizer used to budget Q&A context."""
+    try:
+        return tiktoken.encoding_for_model(get_settings().openai_model)
+    except KeyError:
+        # Non-OpenAI models: cl100k is a close enough estimate for budgeting
+        return tiktoken.get_encoding("cl100k_base")
+
+
+def _match_citations(citations: list[str], texts: list[str]) -> list[list[int]]:
+    """
+    Find which texts contain each citation.
+    
+    Scans every text once with an Aho-Corasick automaton over all
+    citations when pyahocorasick is installed, otherwise falls back
+    to substring checks.
+    
+    Args:
+        citations: Quoted citation strings
+        texts: Source texts to search
+        
+    Returns:
+        For each citation, the indices of texts containing it, in order
+    """
+    matches: list[list[int]] = [[] for _ in citations]
+
+    # Same quote may be cited more than once
+    positions: dict[str, list[int]] = {}
+    for idx, citation in enumerate(citations):
+        if citation:
+            positions.setdefault(citation, []).append(idx)
+
+    if not positions:
+        return matches
+
+    if ahocorasick is not None:
+        automaton = ahocorasick.Automaton()
+        for citation in positions:
+            automaton.add_word(citation, citation)
+        automaton.make_automaton()
+
+        for text_idx, text in enumerate(texts):
+            found = {citation for _, citation in automaton.iter(text)}
+            for citation in found:
+                for idx in positions[citation]:
+                    matches[idx].append(text_idx)
+    else:
+        for text_idx, text in enumerate(texts):
+            for citation, idxs in positions.items():
+                if citation in text:
+                    for idx in idxs:
+                        matches[idx].append(text_idx)
+
+    return matches
+
 
 class QuestionAnswerSignature(dspy.Signature):
     """Answer questions about company disclosures with citations."""
     
-    question: str = dspy.InputField(
-        desc="Question about the company's strategy, initiatives, or disclosures"
+    # Inputs are ordered from most to least stable so repeated calls share
+    # the longest possible prompt prefix for provider-side prompt caching
+    company_name: str = dspy.InputField(
+        desc="Name of the company"
     )
     context: str = dspy.InputField(
         desc="Relevant text chunks from company disclosures"
     )
-    company_name: str = dspy.InputField(
-        desc="Name of the company"
+    question: str = dspy.InputField(
+        desc="Question about the company's strategy, initiatives, or disclosures"
     )
     
     answer: str = dspy.OutputField(
@@ -72,18 +143,103 @@ class QuestionAnswerer(dspy.Module):
         Returns:
             Answer dict with citations
         """
-        # Combine context if list
-        if isinstance(context, list):
-            context_str = "\n\n---\n\n".join(context)
-        else:
-            context_str = context
+        inputs = {
+            "question": question,
+            "context": self._join_context(context),
+            "company_name": company_name,
+        }
 
-        result = self.answerer(
-            question=question,
-            context=context_str,
-            company_name=company_name,
-        )
+        cache = get_dspy_cache()
+        if cache is not None:
+            cache_key = cache.make_key(_CACHE_SIGNATURE, inputs)
+            cached = cache.get(cache_key)
+            if cached is not None:
+                return cached
+
+        result = self.answerer(**inputs)
+        answer = self._to_answer(result)
+
+        if cache is not None:
+            cache.set(cache_key, answer)
+
+        return answer
+
+    def answer_batch(
+        self,
+        questions: list[str],
+        contexts: list[str | list[str]],
+        company_name: str,
+    ) -> list[dict[str, Any]]:
+        """
+        Answer several independent questions in one DSPy batch.
+        
+        Args:
+            questions: Questions to answer
+            contexts: Retrieved context for each question, in the same order
+            company_name: Company name for context
+            
+        Returns:
+            Answer dicts in the same order as questions
+        """
+        if not questions:
+            return []
+
+        all_inputs = [
+            {
+                "question": question,
+                "context": self._join_context(context),
+                "company_name": company_name,
+            }
+            for question, context in zip(questions, contexts)
+        ]
+
+        # Serve repeated questions from the cache and only send misses to the LLM
+        cache = get_dspy_cache()
+        answers: list[dict[str, Any] | None] = [None] * len(questions)
+        cache_keys: list[str | None] = [None] * len(questions)
+        if cache is not None:
+            for i, inputs in enumerate(all_inputs):
+                cache_keys[i] = cache.make_key(_CACHE_SIGNATURE, inputs)
+                answers[i] = cache.get(cache_keys[i])
+
+        pending = [i for i, answer in enumerate(answers) if answer is None]
+        if pending:
+            examples = [
+                dspy.Example(**all_inputs[i]).with_inputs("question", "context", "company_name")
+                for i in pending
+            ]
+            try:
+                # Allow every example to fail without cancelling the batch;
+                # failed examples come back as None
+                predictions = self.answerer.batch(
+                    examples,
+                    num_threads=get_settings().llm_max_concurrency,
+                    max_errors=len(examples) + 1,
+                )
+            except Exception as e:
+                logger.warning(f"Batch answering failed, answering individually: {e}")
+                predictions = [None] * len(pending)
+
+            for i, prediction in zip(pending, predictions):
+                if prediction is None:
+                    # Retry failed examples individually so errors surface as before
+                    answers[i] = self.forward(questions[i], contexts[i], company_name)
+                    continue
+                answers[i] = self._to_answer(prediction)
+                if cache is not None:
+                    cache.set(cache_keys[i], answers[i])
+
+        # Every answer is filled in by the cache, the batch or forward
+        return cast(list[dict[str, Any]], answers)
+
+    def _join_context(self, context: str | list[str]) -> str:
+        """Combine context if list."""
+        if isinstance(context, list):
+            return "\n\n---\n\n".join(context)
+        return context
 
+    def _to_answer(self, result: dspy.Prediction) -> dict[str, Any]:
+        """Normalize an answerer prediction into an answer dict."""
         return {
             "answer": result.answer,
             "citations": result.citations,
@@ -116,22 +272,40 @@ class QuestionAnswerer(dspy.Module):
         Returns:
             Answer with citations mapped to source documents
         """
-        # Build context from retrieval results
+        # Build context from retrieval results, packing sources in rank
+        # order until the token budget is spent
         context_parts = []
+        source_texts = []
         source_map = {}  # Map quotes to source documents
+        dropped_sources = []
+        token_budget = get_settings().qa_context_token_budget
+        used_tokens = 0
+        encoding = _get_encoding()
 
         for i, result in enumerate(retrieval_results):
             text = result.get("text", "")
-            doc_id = result.get("document_id")
-            chunk_id = result.get("chunk_id")
-            metadata = result.get("metadata", {})
-
-            context_parts.append(f"[Source {i+1}]\n{text}")
-            source_map[f"Source {i+1}"] = {
-                "document_id": doc_id,
-                "chunk_id": chunk_id,
-                "metadata": metadata,
+            source_info = {
+                "document_id": result.get("document_id"),
+                "chunk_id": result.get("chunk_id"),
+                "metadata": result.get("metadata", {}),
             }
+            part = f"[Source {i+1}]\n{text}"
+
+            part_tokens = len(encoding.encode(part))
+            if dropped_sources or (context_parts and used_tokens + part_tokens > token_budget):
+                dropped_sources.append(source_info)
+                continue
+            used_tokens += part_tokens
+
+            context_parts.append(part)
+            source_texts.append(text)
+            source_map[f"Source {i+1}"] = source_info
+
+        if dropped_sources:
+            logger.info(
+                f"Context budget of {token_budget} tokens reached, "
+                f"dropped {len(dropped_sources)} lower-ranked sources"
+            )
 
         context_str = "\n\n".join(context_parts)
 
@@ -142,33 +316,27 @@ class QuestionAnswerer(dspy.Module):
             company_name=company_name,
         )
 
-        # Enrich citations with source information
-        enriched_citations = []
-        for citation in answer_result["citations"]:
-            citation_info = {
+        # Enrich citations with every source whose text contains the quote
+        sources = list(source_map.values())
+        citations = answer_result["citations"]
+        enriched_citations = [
+            {
                 "quote": citation,
-                "sources": [],
+                "sources": [sources[i] for i in source_idxs],
             }
-            
-            # Find which sources this quote might come from
-            for source_key, source_info in source_map.items():
-                if citation in context_str:
-                    # Try to map to specific source
-                    for part in context_parts:
-                        if citation in part:
-                            source_num = part.split("]")[0].replace("[", "")
-                            if source_num in source_map:
-                                citation_info["sources"].append(source_map[source_num])
-                                break
-
-            enriched_citations.append(citation_info)
+            for citation, source_idxs in zip(
+                citations,
+                _match_citations(citations, source_texts),
+            )
+        ]
 
         return {
             "answer": answer_result["answer"],
             "citations": enriched_citations,
             "confidence": answer_result["confidence"],
             "related_topics": answer_result["related_topics"],
-            "sources_used": list(source_map.values()),
+            "sources_used": sources,
+            "dropped_sources": dropped_sources,
         }
 
 
@@ -185,6 +353,7 @@ class MultiHopQuestionAnswerer(dspy.Module):
         configure_dspy()
         
         self.base_answerer = base_answerer or QuestionAnswerer()
+        self.router = dspy.Predict("question -> is_multi_hop: bool")
         self.decomposer = dspy.ChainOfThought(
             "question -> sub_questions: list[str]"
         )
@@ -206,29 +375,46 @@ class MultiHopQuestionAnswerer(dspy.Module):
         Returns:
             Comprehensive answer
         """
+        # Answer single-hop questions directly, skipping decomposition
+        # and synthesis
+        if not self._is_multi_hop(question):
+            answer = self.base_answerer.forward(
+                question=question,
+                context=retriever_fn(question),
+                company_name=company_name,
+            )
+            return {
+                **answer,
+                "sub_questions": [],
+                "decomposed": False,
+            }
+
         # Decompose question
         decomposition = self.decomposer(question=question)
         sub_questions = decomposition.sub_questions
 
-        # Collect all context
-        all_context = []
-        sub_answers = []
-
-        for sub_q in sub_questions:
-            # Retrieve context for sub-question
-            context = retriever_fn(sub_q)
-            all_context.extend(context)
+        # Retrieve context for each sub-question
+        sub_contexts = [retriever_fn(sub_q) for sub_q in sub_questions]
+        # Sub-questions often retrieve the same chunks; keep each once
+        all_context = list(dict.fromkeys(
+            text for context in sub_contexts for text in context
+        ))
 
-            # Get sub-answer
-            sub_answer = self.base_answerer.forward(
-                question=sub_q,
-                context=context,
-                company_name=company_name,
-            )
-            sub_answers.append({
+        # Answer all sub-questions in a single batch
+        sub_answers = [
+            {
                 "sub_question": sub_q,
                 **sub_answer,
-            })
+            }
+            for sub_q, sub_answer in zip(
+                sub_questions,
+                self.base_answerer.answer_batch(
+                    sub_questions,
+                    sub_contexts,
+                    company_name,
+                ),
+            )
+        ]
 
         # Synthesize final answer
         final_answer = self.base_answerer.forward(
@@ -242,3 +428,11 @@ class MultiHopQuestionAnswerer(dspy.Module):
             "sub_questions": sub_answers,
             "decomposed": True,
         }
+
+    def _is_multi_hop(self, question: str) -> bool:
+        """Decide whether a question needs decomposition."""
+        try:
+            return bool(self.router(question=question).is_multi_hop)
+        except Exception as e:
+            logger.warning(f"Routing failed, decomposing question: {e}")
+            return True
@@ -1,5 +1,5 @@
 # Indexing module
-from src.nlp.indexing.manager import IndexManager
+from src.nlp.indexing.manager import IndexManager, get_index_manager
 from src.nlp.indexing.vector_store import VectorStoreManager
 
-__all__ = ["IndexManager", "VectorStoreManager"]
+__all__ = ["IndexManager", "VectorStoreManager", "get_index_manager"]
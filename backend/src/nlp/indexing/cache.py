@@ -0,0 +1,50 @@
+"""Bounded caches for per-company index and collection handles."""
+
+from typing import Any
+import logging
+
+from cachetools import LRUCache
+
+
+logger = logging.getLogger(__name__)
+
+
+class HandleCache(LRUCache):
+    """
+    LRU cache for index/collection handles.
+
+    Evicts the least recently used handle once maxsize is reached so
+    long-running multi-tenant processes don't keep a handle for every
+    company ever touched. Tracks hits and misses of get().
+    """
+
+    def __init__(self, maxsize: int, name: str):
+        super().__init__(maxsize=maxsize)
+        self.name = name
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Any, default: Any = None) -> Any:
+        """Get a handle, refreshing its recency and recording hit/miss."""
+        if key in self:
+            self.hits += 1
+            return self[key]
+        self.misses += 1
+        return default
+
+    def popitem(self) -> tuple[Any, Any]:
+        """Evict the least recently used handle."""
+        key, value = super().popitem()
+        logger.debug(f"Evicting {self.name} handle {key}")
+        return key, value
+
+    def stats(self) -> dict[str, Any]:
+        """Get size and hit-rate statistics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -1,6 +1,9 @@
 """Index manager for LlamaIndex integration."""
 
+from collections.abc import AsyncIterable
+from functools import lru_cache
 from typing import Any
+import asyncio
 import logging
 
 from llama_index.core import (
@@ -11,10 +14,12 @@ from llama_index.core import (
     Settings,
 )
 from llama_index.core.node_parser import SentenceSplitter
-from llama_index.core.schema import TextNode
+from llama_index.core.schema import MetadataMode, TextNode
+from llama_index.core.vector_stores.utils import node_to_metadata_dict
 
 from src.config.settings import get_settings
 from src.nlp.chunking.semantic import Chunk
+from src.nlp.indexing.cache import HandleCache
 from src.nlp.indexing.vector_store import VectorStoreManager
 
 
@@ -35,7 +40,13 @@ class IndexManager:
     def __init__(self):
         self.settings = get_settings()
         self.vector_store_manager = VectorStoreManager()
-        self._indices: dict[str, VectorStoreIndex] = {}
+        self._indices = HandleCache(
+            maxsize=self.settings.index_cache_size,
+            name="index",
+        )
+        # Bumped whenever a company's indexed content changes so callers
+        # can invalidate results cached against an older version
+        self._versions: dict[str, int] = {}
 
     async def initialize(self):
         """Initialize the index manager."""
@@ -55,8 +66,9 @@ class IndexManager:
         Returns:
             VectorStoreIndex for the company
         """
-        if company_id in self._indices:
-            return self._indices[company_id]
+        index = self._indices.get(company_id)
+        if index is not None:
+            return index
 
         # Get vector store for company
         vector_store = await self.vector_store_manager.get_or_create_collection(
@@ -86,6 +98,28 @@ class IndexManager:
         self._indices[company_id] = index
         return index
 
+    async def warmup(self, company_ids: list[str], concurrency: int = 8):
+        """
+        Load company indices ahead of their first query.
+        
+        Args:
+            company_ids: Companies to load, most important first; at most
+                index_cache_size are loaded so they all stay cached
+            concurrency: Maximum indices loaded at the same time
+        """
+        semaphore = asyncio.Semaphore(concurrency)
+        company_ids = company_ids[:self.settings.index_cache_size]
+
+        async def load(company_id: str):
+            async with semaphore:
+                try:
+                    await self.get_or_create_index(company_id)
+                except Exception as e:
+                    logger.warning(f"Failed to warm index for company {company_id}: {e}")
+
+        await asyncio.gather(*(load(company_id) for company_id in company_ids))
+        logger.info(f"Warmed indices for {len(company_ids)} companies")
+
     async def index_chunks(
         self,
         chunks: list[Chunk],
@@ -106,13 +140,88 @@ class IndexManager:
         if not chunks:
             return 0
 
-        # Get index for company
-        index = await self.get_or_create_index(company_id)
+        # Make sure the company index and its collection exist
+        await self.get_or_create_index(company_id)
+
+        nodes = self._to_nodes(chunks, company_id, document_id)
 
-        # Convert chunks to LlamaIndex nodes
-        nodes = []
-        for chunk in chunks:
-            node = TextNode(
+        # Embed all nodes in batched calls
+        embeddings = await asyncio.to_thread(self._embed_nodes, nodes)
+
+        await self._write_nodes(company_id, document_id, nodes, embeddings)
+        return len(nodes)
+
+    async def index_chunk_stream(
+        self,
+        chunks: AsyncIterable[Chunk],
+        company_id: str,
+        document_id: str,
+        metadata: dict | None = None,
+    ) -> int:
+        """
+        Index chunks from a stream as they arrive.
+        
+        Each embedding_batch_size batch is embedded in the background
+        while the next one is produced; once the stream ends, all chunks
+        are written to the vector store in a single call.
+        
+        Args:
+            chunks: Chunks to index, e.g. from StructuralChunker.chunk_document
+            company_id: Company identifier
+            document_id: Source document ID
+            metadata: Extra metadata added to every chunk
+            
+        Returns:
+            Number of chunks indexed
+        """
+        await self.get_or_create_index(company_id)
+
+        batch_size = self.settings.embedding_batch_size
+        batch: list[Chunk] = []
+        nodes: list[TextNode] = []
+        embedding_tasks: list[asyncio.Task] = []
+
+        def embed_batch():
+            batch_nodes = self._to_nodes(batch, company_id, document_id)
+            nodes.extend(batch_nodes)
+            embedding_tasks.append(
+                asyncio.create_task(asyncio.to_thread(self._embed_nodes, batch_nodes))
+            )
+
+        try:
+            async for chunk in chunks:
+                if metadata:
+                    chunk.metadata.update(metadata)
+                batch.append(chunk)
+                if len(batch) >= batch_size:
+                    embed_batch()
+                    batch = []
+            if batch:
+                embed_batch()
+
+            embeddings = [
+                embedding
+                for batch_embeddings in await asyncio.gather(*embedding_tasks)
+                for embedding in batch_embeddings
+            ]
+        except BaseException:
+            for task in embedding_tasks:
+                task.cancel()
+            raise
+
+        if nodes:
+            await self._write_nodes(company_id, document_id, nodes, embeddings)
+        return len(nodes)
+
+    def _to_nodes(
+        self,
+        chunks: list[Chunk],
+        company_id: str,
+        document_id: str,
+    ) -> list[TextNode]:
+        """Convert chunks to LlamaIndex nodes."""
+        return [
+            TextNode(
                 text=chunk.text,
                 id_=chunk.id,
                 metadata={
@@ -121,17 +230,61 @@ class IndexManager:
                     "document_id": document_id,
                 },
             )
-            nodes.append(node)
+            for chunk in chunks
+        ]
+
+    def _embed_nodes(self, nodes: list[TextNode]) -> list[list[float]]:
+        """Embed nodes' text along with their embeddable metadata."""
+        return self._embed_texts(
+            [node.get_content(metadata_mode=MetadataMode.EMBED) for node in nodes]
+        )
+
+    async def _write_nodes(
+        self,
+        company_id: str,
+        document_id: str,
+        nodes: list[TextNode],
+        embeddings: list[list[float]],
+    ):
+        """Write embedded nodes to the company's collection in max-size batches."""
+        batch_size = await self.vector_store_manager.get_max_batch_size()
+
+        # Write straight to the collection, using the same metadata layout
+        # ChromaVectorStore writes so retrieval still reconstructs the nodes
+        for start in range(0, len(nodes), batch_size):
+            batch = nodes[start:start + batch_size]
+            await self.vector_store_manager.add_chunks(
+                collection_name=f"company_{company_id}",
+                ids=[node.node_id for node in batch],
+                texts=[node.text for node in batch],
+                embeddings=embeddings[start:start + batch_size],
+                metadatas=[
+                    node_to_metadata_dict(node, remove_text=True, flat_metadata=True)
+                    for node in batch
+                ],
+            )
 
-        # Insert nodes into index
-        index.insert_nodes(nodes)
+        self._bump_version(company_id)
 
         logger.info(
             f"Indexed {len(nodes)} chunks for document {document_id} "
             f"(company: {company_id})"
         )
 
-        return len(nodes)
+    def _embed_texts(self, texts: list[str]) -> list[list[float]]:
+        """Embed texts with the configured model in embedding_batch_size batches."""
+        embed_model = Settings.embed_model
+        batch_size = self.settings.embedding_batch_size
+
+        embeddings = []
+        for start in range(0, len(texts), batch_size):
+            embeddings.extend(
+                embed_model.get_text_embedding_batch(
+                    texts[start:start + batch_size],
+                    show_progress=False,
+                )
+            )
+        return embeddings
 
     async def delete_document(
         self,
@@ -157,6 +310,7 @@ class IndexManager:
                 collection_name=f"company_{company_id}",
                 metadata_filter={"document_id": document_id},
             )
+            self._bump_version(company_id)
 
             logger.info(f"Deleted document {document_id} from index")
             return True
@@ -179,9 +333,32 @@ class IndexManager:
         Returns:
             List of chunk dictionaries
         """
-        return await self.vector_store_manager.get_by_metadata(
+        return [
+            chunk
+            async for chunk in self.vector_store_manager.iter_by_metadata(
+                collection_name=f"company_{company_id}",
+                metadata_filter={"document_id": document_id},
+            )
+        ]
+
+    async def get_chunk_embeddings(
+        self,
+        company_id: str,
+        chunk_ids: list[str],
+    ) -> dict[str, list[float]]:
+        """
+        Fetch stored embeddings for chunks.
+        
+        Args:
+            company_id: Company identifier
+            chunk_ids: Chunk identifiers
+            
+        Returns:
+            Embedding per chunk ID; unknown chunks are left out
+        """
+        return await self.vector_store_manager.get_embeddings(
             collection_name=f"company_{company_id}",
-            metadata_filter={"document_id": document_id},
+            ids=chunk_ids,
         )
 
     async def update_chunk_metadata(
@@ -201,12 +378,43 @@ class IndexManager:
         Returns:
             True if updated successfully
         """
+        self._bump_version(company_id)
         return await self.vector_store_manager.update_metadata(
             collection_name=f"company_{company_id}",
             id_=chunk_id,
             metadata=metadata_updates,
         )
 
+    async def update_chunks_metadata_batch(
+        self,
+        company_id: str,
+        updates: list[tuple[str, dict]],
+    ) -> bool:
+        """
+        Update metadata for many chunks with one vector store call.
+        
+        Args:
+            company_id: Company identifier
+            updates: (chunk_id, metadata_updates) pairs
+            
+        Returns:
+            True if updated successfully
+        """
+        self._bump_version(company_id)
+        return await self.vector_store_manager.update_metadata_many(
+            collection_name=f"company_{company_id}",
+            ids=[chunk_id for chunk_id, _ in updates],
+            metadatas=[metadata for _, metadata in updates],
+        )
+
+    def get_index_version(self, company_id: str) -> int:
+        """Get the version of a company's indexed content."""
+        return self._versions.get(company_id, 0)
+
+    def _bump_version(self, company_id: str):
+        """Mark a company's indexed content as changed."""
+        self._versions[company_id] = self._versions.get(company_id, 0) + 1
+
     def get_index_stats(self, company_id: str) -> dict[str, Any]:
         """Get statistics for a company's index."""
         if company_id not in self._indices:
@@ -216,5 +424,12 @@ class IndexManager:
         return {
             "exists": True,
             "company_id": company_id,
+            "cache": self._indices.stats(),
             # Add more stats as available from the index
         }
+
+
+@lru_cache
+def get_index_manager() -> IndexManager:
+    """Get the index manager shared across the process."""
+    return IndexManager()
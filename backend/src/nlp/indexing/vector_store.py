@@ -1,9 +1,17 @@
 """Vector store manager for ChromaDB integration."""
 
+from collections.abc import AsyncIterator
 from typing import Any
+import asyncio
 import logging
 
+try:
+    from llama_index.vector_stores.chroma import ChromaVectorStore
+except ImportError:  # Checked when a collection is first requested
+    ChromaVectorStore = None
+
 from src.config.settings import get_settings
+from src.nlp.indexing.cache import HandleCache
 
 
 logger = logging.getLogger(__name__)
@@ -22,7 +30,11 @@ class VectorStoreManager:
     def __init__(self):
         self.settings = get_settings()
         self._client = None
-        self._collections: dict = {}
+        self._collections = HandleCache(
+            maxsize=self.settings.index_cache_size,
+            name="collection",
+        )
+        self._max_batch_size: int | None = None
 
     async def initialize(self):
         """Initialize connection to ChromaDB."""
@@ -34,6 +46,10 @@ class VectorStoreManager:
             allow_reset=True,
         )
 
+        # Cached wrappers hold collections from any previous client
+        self.clear_cache()
+        self._max_batch_size = None
+
         if self.settings.chroma_host:
             # Connect to remote ChromaDB
             self._client = chromadb.HttpClient(
@@ -41,6 +57,7 @@ class VectorStoreManager:
                 port=self.settings.chroma_port,
                 settings=chroma_settings,
             )
+            self._configure_http_pool()
             logger.info(
                 f"Connected to ChromaDB at "
                 f"{self.settings.chroma_host}:{self.settings.chroma_port}"
@@ -53,6 +70,29 @@ class VectorStoreManager:
             )
             logger.info(f"Using local ChromaDB at {self.settings.chroma_persist_dir}")
 
+    def _configure_http_pool(self):
+        """
+        Mount a larger keep-alive connection pool on the Chroma client.
+        
+        Older chromadb clients talk to the server through a requests
+        session whose default pool keeps only 10 connections, so
+        concurrent index operations beyond that open a new connection
+        per call. httpx-based clients already pool connections.
+        """
+        from requests import Session
+        from requests.adapters import HTTPAdapter
+
+        session = getattr(getattr(self._client, "_server", None), "_session", None)
+        if not isinstance(session, Session):
+            return
+
+        adapter = HTTPAdapter(
+            pool_connections=self.settings.http_pool_size,
+            pool_maxsize=self.settings.http_pool_size,
+        )
+        session.mount("http://", adapter)
+        session.mount("https://", adapter)
+
     async def get_or_create_collection(self, collection_name: str):
         """
         Get or create a ChromaDB collection.
@@ -63,15 +103,24 @@ class VectorStoreManager:
         Returns:
             ChromaDB collection wrapped for LlamaIndex
         """
-        from llama_index.vector_stores.chroma import ChromaVectorStore
+        vector_store = self._collections.get(collection_name)
+        if vector_store is not None:
+            return vector_store
 
-        if collection_name in self._collections:
-            return self._collections[collection_name]
+        if ChromaVectorStore is None:
+            raise ImportError(
+                "llama-index-vector-stores-chroma is required for vector storage"
+            )
 
         # Get or create ChromaDB collection
         chroma_collection = self._client.get_or_create_collection(
             name=collection_name,
-            metadata={"hnsw:space": "cosine"},  # Use cosine similarity
+            metadata={
+                "hnsw:space": "cosine",  # Use cosine similarity
+                "hnsw:M": self.settings.chroma_hnsw_m,
+                "hnsw:construction_ef": self.settings.chroma_hnsw_construction_ef,
+                "hnsw:search_ef": self.settings.chroma_hnsw_search_ef,
+            },
         )
 
         # Wrap in LlamaIndex vector store
@@ -82,6 +131,54 @@ class VectorStoreManager:
         self._collections[collection_name] = vector_store
         return vector_store
 
+    async def get_max_batch_size(self) -> int:
+        """Get the most records the Chroma server accepts in one write."""
+        if self._max_batch_size is None:
+            # A server round trip for HTTP clients, so it's fetched once
+            self._max_batch_size = await asyncio.to_thread(
+                self._client.get_max_batch_size
+            )
+        return self._max_batch_size
+
+    def clear_cache(self):
+        """Drop all cached collection wrappers."""
+        self._collections.clear()
+
+    async def add_chunks(
+        self,
+        collection_name: str,
+        ids: list[str],
+        texts: list[str],
+        embeddings: list[list[float]],
+        metadatas: list[dict[str, Any]],
+    ) -> int:
+        """
+        Add pre-embedded chunks to a collection in a single call.
+        
+        Args:
+            collection_name: Collection to add to
+            ids: Chunk IDs
+            texts: Chunk texts
+            embeddings: Chunk embeddings
+            metadatas: Chunk metadata
+            
+        Returns:
+            Number of chunks added
+        """
+        def add():
+            # Looking up the collection is a server round trip for HTTP
+            # clients too, so it runs in the worker thread with the write
+            collection = self._client.get_collection(collection_name)
+            collection.add(
+                ids=ids,
+                documents=texts,
+                embeddings=embeddings,
+                metadatas=metadatas,
+            )
+
+        await asyncio.to_thread(add)
+        return len(ids)
+
     async def delete_collection(self, collection_name: str) -> bool:
         """Delete a collection."""
         try:
@@ -98,27 +195,33 @@ class VectorStoreManager:
         self,
         collection_name: str,
         metadata_filter: dict[str, Any],
-    ) -> int:
+        return_ids: bool = False,
+    ) -> list[str] | None:
         """
         Delete documents by metadata filter.
         
+        By default this is a single filtered delete on the server. Set
+        return_ids to fetch the matching IDs first and delete by ID.
+        
         Args:
             collection_name: Collection to delete from
             metadata_filter: Metadata key-value pairs to match
+            return_ids: Return the IDs of the deleted documents
             
         Returns:
-            Number of documents deleted
+            Deleted document IDs if return_ids is set, otherwise None
         """
         try:
             collection = self._client.get_collection(collection_name)
-            
-            # Build where clause
-            where = {}
-            for key, value in metadata_filter.items():
-                where[key] = {"$eq": value}
+            where = self._build_where(metadata_filter)
+
+            if not return_ids:
+                collection.delete(where=where)
+                logger.info(f"Deleted documents matching {metadata_filter} from {collection_name}")
+                return None
 
             # Get matching IDs
-            results = collection.get(where=where)
+            results = collection.get(where=where, include=[])
             ids_to_delete = results.get("ids", [])
 
             if ids_to_delete:
@@ -127,16 +230,17 @@ class VectorStoreManager:
                     f"Deleted {len(ids_to_delete)} documents from {collection_name}"
                 )
 
-            return len(ids_to_delete)
+            return ids_to_delete
         except Exception as e:
             logger.error(f"Failed to delete by metadata: {e}")
-            return 0
+            return [] if return_ids else None
 
     async def get_by_metadata(
         self,
         collection_name: str,
         metadata_filter: dict[str, Any],
         limit: int = 1000,
+        include_embeddings: bool = False,
     ) -> list[dict]:
         """
         Retrieve documents by metadata filter.
@@ -145,6 +249,7 @@ class VectorStoreManager:
             collection_name: Collection to query
             metadata_filter: Metadata key-value pairs to match
             limit: Maximum number of results
+            include_embeddings: Also fetch each document's embedding
             
         Returns:
             List of document dictionaries
@@ -152,30 +257,146 @@ class VectorStoreManager:
         try:
             collection = self._client.get_collection(collection_name)
 
-            # Build where clause
-            where = {}
-            for key, value in metadata_filter.items():
-                where[key] = {"$eq": value}
-
             results = collection.get(
-                where=where,
+                where=self._build_where(metadata_filter),
                 limit=limit,
-                include=["documents", "metadatas", "embeddings"],
+                include=self._build_include(include_embeddings),
             )
 
-            documents = []
-            for i, id_ in enumerate(results.get("ids", [])):
-                documents.append({
-                    "id": id_,
-                    "text": results["documents"][i] if results.get("documents") else None,
-                    "metadata": results["metadatas"][i] if results.get("metadatas") else {},
-                })
-
-            return documents
+            return self._to_documents(results, include_embeddings)
         except Exception as e:
             logger.error(f"Failed to get by metadata: {e}")
             return []
 
+    async def get_embeddings(
+        self,
+        collection_name: str,
+        ids: list[str],
+    ) -> dict[str, list[float]]:
+        """
+        Fetch the embeddings of documents by ID.
+        
+        Args:
+            collection_name: Collection containing the documents
+            ids: Document IDs
+            
+        Returns:
+            Embedding per document ID; missing documents are left out
+        """
+        if not ids:
+            return {}
+
+        def get():
+            collection = self._client.get_collection(collection_name)
+            return collection.get(ids=ids, include=["embeddings"])
+
+        try:
+            results = await asyncio.to_thread(get)
+        except Exception as e:
+            logger.error(f"Failed to get embeddings for {len(ids)} documents: {e}")
+            return {}
+
+        return {
+            document["id"]: document["embedding"]
+            for document in self._to_documents(results, include_embeddings=True)
+            if document["embedding"] is not None
+        }
+
+    async def iter_by_metadata(
+        self,
+        collection_name: str,
+        metadata_filter: dict[str, Any],
+        page_size: int = 500,
+        include_embeddings: bool = False,
+    ) -> AsyncIterator[dict]:
+        """
+        Iterate over all documents matching a metadata filter.
+        
+        Fetches page_size rows at a time, so large result sets are
+        neither truncated nor held in memory all at once.
+        
+        Args:
+            collection_name: Collection to query
+            metadata_filter: Metadata key-value pairs to match
+            page_size: Number of rows fetched per request
+            include_embeddings: Also fetch each document's embedding
+            
+        Yields:
+            Document dictionaries
+            
+        Raises:
+            Exception: If a page fails to load, so callers never mistake
+                a partial result for a complete one
+        """
+        try:
+            collection = await asyncio.to_thread(
+                self._client.get_collection, collection_name
+            )
+        except Exception as e:
+            # A collection that was never created has no documents
+            logger.warning(f"Collection {collection_name} not available: {e}")
+            return
+
+        where = self._build_where(metadata_filter)
+        include = self._build_include(include_embeddings)
+
+        offset = 0
+        while True:
+            try:
+                results = await asyncio.to_thread(
+                    collection.get,
+                    where=where,
+                    limit=page_size,
+                    offset=offset,
+                    include=include,
+                )
+            except Exception as e:
+                logger.error(f"Failed to iterate by metadata at offset {offset}: {e}")
+                raise
+
+            documents = self._to_documents(results, include_embeddings)
+            for document in documents:
+                yield document
+
+            if len(documents) < page_size:
+                break
+            offset += page_size
+
+    def _build_where(self, metadata_filter: dict[str, Any]) -> dict[str, Any]:
+        """Build a Chroma where clause from key-value equality filters."""
+        where = {}
+        for key, value in metadata_filter.items():
+            where[key] = {"$eq": value}
+        return where
+
+    def _build_include(self, include_embeddings: bool) -> list[str]:
+        """Fields to fetch from Chroma."""
+        include = ["documents", "metadatas"]
+        if include_embeddings:
+            include.append("embeddings")
+        return include
+
+    def _to_documents(
+        self,
+        results: dict[str, Any],
+        include_embeddings: bool,
+    ) -> list[dict]:
+        """Convert a Chroma get() result into document dictionaries."""
+        documents = []
+        for i, id_ in enumerate(results.get("ids", [])):
+            document = {
+                "id": id_,
+                "text": results["documents"][i] if results.get("documents") else None,
+                "metadata": results["metadatas"][i] if results.get("metadatas") else {},
+            }
+            if include_embeddings:
+                embeddings = results.get("embeddings")
+                document["embedding"] = (
+                    list(embeddings[i]) if embeddings is not None else None
+                )
+            documents.append(document)
+        return documents
+
     async def update_metadata(
         self,
         collection_name: str,
@@ -204,6 +425,37 @@ class VectorStoreManager:
             logger.error(f"Failed to update metadata for {id_}: {e}")
             return False
 
+    async def update_metadata_many(
+        self,
+        collection_name: str,
+        ids: list[str],
+        metadatas: list[dict[str, Any]],
+    ) -> bool:
+        """
+        Update metadata for several documents in a single call.
+        
+        Args:
+            collection_name: Collection containing the documents
+            ids: Document IDs
+            metadatas: New metadata values, one per ID
+            
+        Returns:
+            True if updated successfully
+        """
+        if not ids:
+            return True
+
+        def update():
+            collection = self._client.get_collection(collection_name)
+            collection.update(ids=ids, metadatas=metadatas)
+
+        try:
+            await asyncio.to_thread(update)
+            return True
+        except Exception as e:
+            logger.error(f"Failed to update metadata for {len(ids)} documents: {e}")
+            return False
+
     def get_collection_stats(self, collection_name: str) -> dict[str, Any]:
         """Get statistics for a collection."""
         try:
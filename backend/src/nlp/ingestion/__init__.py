@@ -1,9 +1,24 @@
 # Ingestion module
-from src.nlp.ingestion.docx_parser import DocxParser
+import importlib
+
 from src.nlp.ingestion.parser import DocumentParser
-from src.nlp.ingestion.pdf_parser import PDFParser
-from src.nlp.ingestion.pptx_parser import PptxParser
-from src.nlp.ingestion.text_parser import TextParser
+
+# Format parsers pull in their parsing libraries, so they're imported on
+# first access; DocumentParser loads only the ones it dispatches to
+_LAZY_PARSERS = {
+    "PDFParser": "src.nlp.ingestion.pdf_parser",
+    "DocxParser": "src.nlp.ingestion.docx_parser",
+    "PptxParser": "src.nlp.ingestion.pptx_parser",
+    "TextParser": "src.nlp.ingestion.text_parser",
+}
+
+
+def __getattr__(name: str):
+    module_name = _LAZY_PARSERS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    return getattr(importlib.import_module(module_name), name)
+
 
 __all__ = [
     "DocumentParser",
@@ -9,25 +9,36 @@ from src.nlp.ingestion.parser import ParsedDocument
 class DocxParser:
     """Parser for DOCX documents."""
 
-    def supports(self, filename: str) -> bool:
-        """Check if this parser supports the file."""
-        suffix = Path(filename).suffix.lower()
-        return suffix in [".docx", ".doc"]
+    extensions = (".docx", ".doc")
 
-    async def parse(self, content: bytes, filename: str) -> ParsedDocument:
+    def supports(self, filename: str, suffix: str | None = None) -> bool:
+        """Check if this parser supports the file."""
+        if suffix is None:
+            suffix = Path(filename).suffix.lower()
+        return suffix in self.extensions
+
+    def parse(
+        self,
+        content: bytes,
+        filename: str,
+        extract_tables: bool = True,
+        path: str | None = None,
+    ) -> ParsedDocument:
         """
         Parse DOCX document.
         
         Args:
             content: DOCX file content
             filename: Original filename
+            extract_tables: Extract table data
+            path: Local file path; opened directly instead of content
             
         Returns:
             ParsedDocument with extracted text and metadata
         """
         from docx import Document
 
-        doc = Document(io.BytesIO(content))
+        doc = Document(path or io.BytesIO(content))
 
         # Extract metadata
         core_props = doc.core_properties
@@ -45,6 +56,10 @@ class DocxParser:
         sections = []
         current_section = {"heading": None, "content": []}
 
+        # Heading level per paragraph style ID (None if not a heading).
+        # Resolving para.style searches the styles part on every access.
+        heading_levels: dict[str | None, int | None] = {}
+
         for para in doc.paragraphs:
             text = para.text.strip()
             if not text:
@@ -52,13 +67,18 @@ class DocxParser:
 
             paragraphs.append(text)
 
+            style_id = para._p.style
+            if style_id not in heading_levels:
+                heading_levels[style_id] = self._get_heading_level(para.style.name)
+            heading_level = heading_levels[style_id]
+
             # Track sections based on heading styles
-            if para.style.name.startswith("Heading"):
+            if heading_level is not None:
                 if current_section["content"]:
                     sections.append(current_section)
                 current_section = {
                     "heading": text,
-                    "heading_level": self._get_heading_level(para.style.name),
+                    "heading_level": heading_level,
                     "content": [],
                 }
             else:
@@ -69,7 +89,7 @@ class DocxParser:
             sections.append(current_section)
 
         # Extract tables
-        tables = self._extract_tables(doc)
+        tables = self._extract_tables(doc) if extract_tables else None
 
         return ParsedDocument(
             text="\n\n".join(paragraphs),
@@ -78,8 +98,10 @@ class DocxParser:
             tables=tables if tables else None,
         )
 
-    def _get_heading_level(self, style_name: str) -> int:
-        """Extract heading level from style name."""
+    def _get_heading_level(self, style_name: str) -> int | None:
+        """Extract heading level from style name, or None if not a heading."""
+        if not style_name.startswith("Heading"):
+            return None
         try:
             return int(style_name.replace("Heading", "").strip())
         except ValueError:
@@ -87,19 +109,10 @@ class DocxParser:
 
     def _extract_tables(self, doc) -> list[dict]:
         """Extract tables from DOCX."""
-        tables = []
-
-        for i, table in enumerate(doc.tables):
-            table_data = []
-            for row in table.rows:
-                row_data = []
-                for cell in row.cells:
-                    row_data.append(cell.text.strip())
-                table_data.append(row_data)
-
-            tables.append({
+        return [
+            {
                 "table_index": i,
-                "data": table_data,
-            })
-
-        return tables
+                "data": [[cell.text.strip() for cell in row.cells] for row in table.rows],
+            }
+            for i, table in enumerate(doc.tables)
+        ]
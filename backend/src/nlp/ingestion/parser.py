@@ -1,9 +1,13 @@
 """Document parser - routes to appropriate parser based on file type."""
 
+import asyncio
+import importlib
 from dataclasses import dataclass
 from pathlib import Path
 from typing import Protocol
 
+from src.config.settings import get_settings
+
 
 @dataclass
 class ParsedDocument:
@@ -19,45 +23,85 @@ class ParsedDocument:
 class ParserProtocol(Protocol):
     """Protocol for document parsers."""
 
-    async def parse(self, content: bytes, filename: str) -> ParsedDocument:
+    # Lowercased file suffixes the parser handles, e.g. (".pdf",)
+    extensions: tuple[str, ...]
+
+    def parse(
+        self,
+        content: bytes,
+        filename: str,
+        extract_tables: bool = True,
+        path: str | None = None,
+    ) -> ParsedDocument:
         """Parse document content."""
         ...
 
-    def supports(self, filename: str) -> bool:
-        """Check if parser supports the file type."""
+    def supports(self, filename: str, suffix: str | None = None) -> bool:
+        """Check if parser supports the file type; suffix may be precomputed."""
         ...
 
 
+_PDF_PARSER = "src.nlp.ingestion.pdf_parser:PDFParser"
+_DOCX_PARSER = "src.nlp.ingestion.docx_parser:DocxParser"
+_PPTX_PARSER = "src.nlp.ingestion.pptx_parser:PptxParser"
+_TRANSCRIPT_PARSER = "src.nlp.ingestion.transcript_parser:TranscriptParser"
+_TEXT_PARSER = "src.nlp.ingestion.text_parser:TextParser"
+
+# Candidate parsers per file suffix, in priority order. Parsers are
+# imported and instantiated on first use.
+_PARSER_REGISTRY: dict[str, tuple[str, ...]] = {
+    ".pdf": (_PDF_PARSER,),
+    ".docx": (_DOCX_PARSER,),
+    ".doc": (_DOCX_PARSER,),
+    ".pptx": (_PPTX_PARSER,),
+    ".ppt": (_PPTX_PARSER,),
+    ".html": (_TRANSCRIPT_PARSER,),
+    ".htm": (_TRANSCRIPT_PARSER,),
+    ".txt": (_TEXT_PARSER,),
+    ".md": (_TEXT_PARSER,),
+    ".markdown": (_TEXT_PARSER,),
+    ".rst": (_TEXT_PARSER,),
+    ".text": (_TEXT_PARSER,),
+}
+
+
 class DocumentParser:
     """Main document parser that routes to appropriate specialized parser."""
 
     def __init__(self):
-        self._parsers: list[ParserProtocol] = []
-        self._register_parsers()
-
-    def _register_parsers(self):
-        """Register available parsers."""
-        from src.nlp.ingestion.docx_parser import DocxParser
-        from src.nlp.ingestion.pdf_parser import PDFParser
-        from src.nlp.ingestion.pptx_parser import PptxParser
-        from src.nlp.ingestion.text_parser import TextParser
-        from src.nlp.ingestion.transcript_parser import TranscriptParser
-
-        self._parsers = [
-            PDFParser(),
-            DocxParser(),
-            PptxParser(),
-            TranscriptParser(),
-            TextParser(),  # Fallback for plain text
-        ]
-
-    async def parse(self, content: bytes, filename: str) -> ParsedDocument:
+        self._parsers = _PARSER_REGISTRY
+        self._instances: dict[str, ParserProtocol] = {}
+
+    def _get_parser(self, parser_path: str) -> ParserProtocol:
+        """Import and instantiate a parser on first use."""
+        parser = self._instances.get(parser_path)
+        if parser is None:
+            module_name, class_name = parser_path.split(":")
+            parser_class = getattr(importlib.import_module(module_name), class_name)
+            parser = parser_class()
+            self._instances[parser_path] = parser
+        return parser
+
+    async def parse(
+        self,
+        content: bytes,
+        filename: str,
+        extract_tables: bool = True,
+        path: str | None = None,
+    ) -> ParsedDocument:
         """
         Parse document using appropriate parser.
         
+        Parsers are synchronous and CPU-bound, so parsing runs in a worker
+        thread to keep the event loop responsive.
+        
         Args:
             content: File content as bytes
             filename: Original filename (used to determine parser)
+            extract_tables: Extract tables where the format supports it;
+                disable to skip the cost when tables aren't needed
+            path: Path of the file on local disk, if available; binary
+                formats are then read from disk instead of from content
             
         Returns:
             ParsedDocument with extracted content
@@ -65,12 +109,62 @@ class DocumentParser:
         Raises:
             ValueError: If no parser supports the file type
         """
-        for parser in self._parsers:
-            if parser.supports(filename):
-                return await parser.parse(content, filename)
+        suffix = Path(filename).suffix.lower()
+
+        # Parsers may also check the filename itself (e.g. transcripts)
+        for parser_path in self._parsers.get(suffix, ()):
+            parser = self._get_parser(parser_path)
+            if parser.supports(filename, suffix):
+                return await asyncio.to_thread(
+                    parser.parse, content, filename, extract_tables, path
+                )
 
         raise ValueError(f"Unsupported file type: {Path(filename).suffix}")
 
+    async def parse_many(
+        self,
+        items: list[tuple[bytes, str]],
+        extract_tables: bool = True,
+    ) -> list[ParsedDocument]:
+        """
+        Parse many documents concurrently.
+        
+        PDFs are parsed in the shared pool of PDF worker processes, since
+        PyMuPDF holds the GIL; other formats run in worker threads, at most
+        document_parse_workers at a time.
+        
+        Args:
+            items: (content, filename) pairs
+            extract_tables: Extract tables where the format supports it
+            
+        Returns:
+            ParsedDocuments in the same order as items
+            
+        Raises:
+            ValueError: If no parser supports one of the file types
+        """
+        from src.nlp.ingestion.pdf_parser import get_pdf_pool, parse_pdf_in_process
+
+        settings = get_settings()
+        semaphore = asyncio.Semaphore(settings.document_parse_workers)
+        loop = asyncio.get_running_loop()
+
+        is_pdf = [Path(filename).suffix.lower() == ".pdf" for _, filename in items]
+        pdf_pool = get_pdf_pool() if any(is_pdf) else None
+
+        async def parse_one(content: bytes, filename: str, pdf: bool) -> ParsedDocument:
+            if pdf:
+                return await loop.run_in_executor(
+                    pdf_pool, parse_pdf_in_process, content, filename, extract_tables
+                )
+            async with semaphore:
+                return await self.parse(content, filename, extract_tables)
+
+        return await asyncio.gather(*(
+            parse_one(content, filename, pdf)
+            for (content, filename), pdf in zip(items, is_pdf)
+        ))
+
     def get_supported_types(self) -> list[str]:
         """Get list of supported file extensions."""
-        return [".pdf", ".docx", ".doc", ".pptx", ".ppt", ".txt", ".md", ".html", ".htm"]
+        return list(self._parsers)
@@ -1,6 +1,7 @@
 """PPTX document parser using python-pptx."""
 
 from pathlib import Path
+import io
 
 from src.nlp.ingestion.parser import ParsedDocument
 
@@ -8,22 +9,36 @@ from src.nlp.ingestion.parser import ParsedDocument
 class PptxParser:
     """Parser for PowerPoint PPTX documents."""
 
-    def supports(self, filename: str) -> bool:
-        """Check if this parser supports the file."""
-        suffix = Path(filename).suffix.lower()
-        return suffix in [".pptx", ".ppt"]
+    extensions = (".pptx", ".ppt")
 
-    async def parse(self, content: bytes, filename: str) -> ParsedDocument:
+    def supports(self, filename: str, suffix: str | None = None) -> bool:
+        """Check if this parser supports the file."""
+        if suffix is None:
+            suffix = Path(filename).suffix.lower()
+        return suffix in self.extensions
+
+    def parse(
+        self,
+        content: bytes,
+        filename: str,
+        extract_tables: bool = True,
+        path: str | None = None,
+    ) -> ParsedDocument:
         """
         Parse PPTX document.
 
         Args:
             content: PPTX file content
             filename: Original filename
+            extract_tables: Extract table data
+            path: Local file path; opened directly instead of content
 
         Returns:
             ParsedDocument with extracted text and metadata
         """
+        from pptx import Presentation
+
+        prs = Presentation(path or io.BytesIO(content))
 
         # Extract metadata
         core_props = prs.core_properties
@@ -46,25 +61,22 @@ class PptxParser:
             slide_text_parts = []
             slide_title = None
 
+            # The title placeholder, looked up once instead of checking
+            # every shape's placeholder type
+            title_shape = slide.shapes.title
+            title_shape_id = title_shape.shape_id if title_shape is not None else None
+
             for shape in slide.shapes:
-                # Extract title
                 if shape.has_text_frame:
                     text = self._extract_text_from_shape(shape)
                     if text:
                         slide_text_parts.append(text)
-                        # First text shape with content is often the title
-                        if (
-                            slide_title is None
-                            and shape.shape_type
-                            and hasattr(shape, 'is_placeholder')
-                            and shape.is_placeholder
-                        ):
-                            placeholder_type = shape.placeholder_format.type
-                            if placeholder_type and placeholder_type.name in ['TITLE', 'CENTER_TITLE']:
-                                slide_title = text
+                        # Extract title
+                        if slide_title is None and shape.shape_id == title_shape_id:
+                            slide_title = text
 
                 # Extract tables
-                if shape.has_table:
+                elif extract_tables and shape.has_table:
                     table_data = self._extract_table(shape.table)
                     if table_data:
                         tables.append({
@@ -107,14 +119,7 @@ class PptxParser:
 
     def _extract_table(self, table) -> list[list[str]]:
         """Extract data from a table shape."""
-        rows = []
-        for row in table.rows:
-            cells = []
-            for cell in row.cells:
-                cell_text = cell.text.strip()
-                cells.append(cell_text)
-            rows.append(cells)
-        return rows
+        return [[cell.text.strip() for cell in row.cells] for row in table.rows]
 
     def _build_sections(self, slides: list[dict]) -> list[dict]:
         """Build sections from slides based on titles."""
@@ -1,42 +1,58 @@
 """Plain text document parser."""
 
+import re
 from pathlib import Path
 
 from src.nlp.ingestion.parser import ParsedDocument
 
 
+# ATX markdown heading: 1-6 '#' characters followed by the heading text
+_HEADING_RE = re.compile(r"^[ \t]*(#{1,6})[ \t]+(.*?)[ \t\r]*$", re.MULTILINE)
+
+
 class TextParser:
     """Parser for plain text documents."""
 
-    SUPPORTED_EXTENSIONS = [".txt", ".md", ".markdown", ".rst", ".text"]
+    extensions = (".txt", ".md", ".markdown", ".rst", ".text")
 
-    def supports(self, filename: str) -> bool:
+    def supports(self, filename: str, suffix: str | None = None) -> bool:
         """Check if this parser supports the file."""
-        suffix = Path(filename).suffix.lower()
-        return suffix in self.SUPPORTED_EXTENSIONS
+        if suffix is None:
+            suffix = Path(filename).suffix.lower()
+        return suffix in self.extensions
 
-    async def parse(self, content: bytes, filename: str) -> ParsedDocument:
+    def parse(
+        self,
+        content: bytes,
+        filename: str,
+        extract_tables: bool = True,
+        path: str | None = None,
+    ) -> ParsedDocument:
         """
         Parse text document.
         
         Args:
             content: Text file content
             filename: Original filename
+            extract_tables: Unused; plain text has no tables
+            path: Unused; text is decoded from content
             
         Returns:
             ParsedDocument with text content
         """
-        # Try different encodings
-        text = None
-        for encoding in ["utf-8", "utf-16", "latin-1", "cp1252"]:
-            try:
-                text = content.decode(encoding)
-                break
-            except UnicodeDecodeError:
-                continue
-
-        if text is None:
-            raise ValueError(f"Unable to decode file: {filename}")
+        # UTF-8 covers almost every upload; otherwise detect the encoding
+        try:
+            text = content.decode("utf-8")
+            # A UTF-8 newline is always the single byte 0x0A
+            newline_count = content.count(b"\n")
+        except UnicodeDecodeError:
+            from charset_normalizer import from_bytes
+
+            best = from_bytes(content).best()
+            if best is None:
+                raise ValueError(f"Unable to decode file: {filename}")
+            text = str(best)
+            newline_count = text.count("\n")
 
         # Extract sections for markdown files
         sections = None
@@ -46,7 +62,7 @@ class TextParser:
         metadata = {
             "filename": filename,
             "char_count": len(text),
-            "line_count": text.count("\n") + 1,
+            "line_count": newline_count + 1,
         }
 
         return ParsedDocument(
@@ -58,37 +74,40 @@ class TextParser:
     def _extract_markdown_sections(self, text: str) -> list[dict]:
         """Extract sections from markdown based on headings."""
         sections = []
-        current_section = {"heading": None, "heading_level": 0, "content": []}
-        
-        for line in text.split("\n"):
-            stripped = line.strip()
-            
-            # Check for markdown headings
-            if stripped.startswith("#"):
-                # Count heading level
-                level = 0
-                for char in stripped:
-                    if char == "#":
-                        level += 1
-                    else:
-                        break
-
-                heading_text = stripped[level:].strip()
-                
-                # Save previous section
-                if current_section["content"] or current_section["heading"]:
-                    sections.append(current_section)
-                
-                current_section = {
-                    "heading": heading_text,
-                    "heading_level": level,
-                    "content": [],
-                }
-            else:
-                current_section["content"].append(line)
+        heading = None
+        level = 0
+        start = 0
+
+        # Each section's content is the text between its heading and the next
+        for match in _HEADING_RE.finditer(text):
+            self._append_section(sections, heading, level, text[start:match.start()])
+            heading = match.group(2)
+            level = len(match.group(1))
+            start = match.end()
 
         # Add last section
-        if current_section["content"] or current_section["heading"]:
-            sections.append(current_section)
+        self._append_section(sections, heading, level, text[start:])
 
         return sections
+
+    def _append_section(
+        self,
+        sections: list[dict],
+        heading: str | None,
+        level: int,
+        block: str,
+    ):
+        """Append a section unless it has neither heading nor content."""
+        # Drop the newlines that end the heading line and the block itself
+        if block.startswith("\n"):
+            block = block[1:]
+        if block.endswith("\n"):
+            block = block[:-1]
+
+        content = block.split("\n") if block else []
+        if content or heading:
+            sections.append({
+                "heading": heading,
+                "heading_level": level,
+                "content": content,
+            })
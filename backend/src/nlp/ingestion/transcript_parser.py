@@ -6,6 +6,13 @@ from dataclasses import dataclass
 
 from src.nlp.ingestion.parser import ParsedDocument
 
+try:
+    import lxml  # noqa: F401
+
+    _HTML_PARSER = "lxml"
+except ImportError:  # Optional, faster C parser for BeautifulSoup
+    _HTML_PARSER = "html.parser"
+
 
 @dataclass
 class SpeakerTurn:
@@ -19,45 +26,67 @@ class SpeakerTurn:
 class TranscriptParser:
     """Parser for earnings call transcripts."""
 
-    SUPPORTED_EXTENSIONS = [".html", ".htm"]
+    extensions = (".html", ".htm")
 
-    # Common patterns for speaker identification
+    # Common patterns for speaker identification. Each matches a whole
+    # line, so whitespace classes exclude newlines.
     SPEAKER_PATTERNS = [
-        r"^([A-Z][A-Za-z\s\.]+)(?:\s*[-–—]\s*|\s*,\s*)(CEO|CFO|COO|CTO|CMO|President|Chairman|Analyst|Director|VP|Vice President|Executive)[:\s]*$",
-        r"^([A-Z][A-Za-z\s\.]+)\s*\((CEO|CFO|COO|CTO|CMO|President|Chairman|Analyst|Director|VP|Vice President|Executive)\)[:\s]*$",
-        r"^Operator[:\s]*$",
-        r"^([A-Z][A-Za-z\s\.]+)[:\s]*$",
+        r"^[ \t]*([A-Z][A-Za-z \t\.]+)(?:[ \t]*[-–—][ \t]*|[ \t]*,[ \t]*)(CEO|CFO|COO|CTO|CMO|President|Chairman|Analyst|Director|VP|Vice President|Executive)[: \t]*$",
+        r"^[ \t]*([A-Z][A-Za-z \t\.]+)[ \t]*\((CEO|CFO|COO|CTO|CMO|President|Chairman|Analyst|Director|VP|Vice President|Executive)\)[: \t]*$",
+        r"^[ \t]*Operator[: \t]*$",
+        r"^[ \t]*([A-Z][A-Za-z \t\.]+)[: \t]*$",
     ]
 
-    def supports(self, filename: str) -> bool:
+    # All patterns in one alternation, tried in the same order; MULTILINE
+    # so a single finditer over the body finds every speaker line
+    _SPEAKER_RE = re.compile(
+        "|".join(f"(?:{p})" for p in SPEAKER_PATTERNS),
+        re.MULTILINE,
+    )
+
+    # Keywords marking an HTML filename as a transcript
+    _TRANSCRIPT_NAME_RE = re.compile(r"transcript|earnings|call|conference", re.IGNORECASE)
+
+    # Call date, e.g. "January 5, 2025"
+    _DATE_RE = re.compile(
+        r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}"
+    )
+
+    # Last matched group index -> (speaker group, role group) in _SPEAKER_RE
+    _SPEAKER_GROUPS = {2: (1, 2), 4: (3, 4), 5: (5, None)}
+
+    def supports(self, filename: str, suffix: str | None = None) -> bool:
         """Check if this parser supports the file."""
-        suffix = Path(filename).suffix.lower()
+        if suffix is None:
+            suffix = Path(filename).suffix.lower()
+        if suffix not in self.extensions:
+            return False
         # Check for transcript-like filenames
-        name_lower = filename.lower()
-        is_transcript = any(
-            keyword in name_lower
-            for keyword in ["transcript", "earnings", "call", "conference"]
-        )
-        return suffix in self.SUPPORTED_EXTENSIONS and is_transcript
-
-    async def parse(self, content: bytes, filename: str) -> ParsedDocument:
+        return self._TRANSCRIPT_NAME_RE.search(filename) is not None
+
+    def parse(
+        self,
+        content: bytes,
+        filename: str,
+        extract_tables: bool = True,
+        path: str | None = None,
+    ) -> ParsedDocument:
         """
         Parse earnings call transcript.
         
         Args:
             content: HTML file content
             filename: Original filename
+            extract_tables: Unused; transcripts have no tables
+            path: Unused; HTML is parsed from content
             
         Returns:
             ParsedDocument with structured transcript content
         """
         from bs4 import BeautifulSoup
 
-        # Decode content
-        text = content.decode("utf-8", errors="replace")
-        
-        # Parse HTML
-        soup = BeautifulSoup(text, "html.parser")
+        # Parse HTML straight from bytes; BeautifulSoup decodes it once
+        soup = BeautifulSoup(content, _HTML_PARSER, from_encoding="utf-8")
         
         # Extract metadata from title/headers
         title = soup.find("title")
@@ -67,16 +96,13 @@ class TranscriptParser:
             "type": "earnings_call_transcript",
         }
 
+        # Extract text content
+        body_text = soup.get_text(separator="\n")
+
         # Try to extract date
-        date_match = re.search(
-            r"(January|February|March|April|May|June|July|August|September|October|November|December)\s+\d{1,2},?\s+\d{4}",
-            soup.get_text(),
-        )
+        date_match = self._DATE_RE.search(body_text)
         if date_match:
             metadata["date"] = date_match.group()
-
-        # Extract text content
-        body_text = soup.get_text(separator="\n")
         
         # Parse speaker turns
         sections = self._parse_sections(body_text)
@@ -108,57 +134,75 @@ class TranscriptParser:
     def _parse_sections(self, text: str) -> list[dict]:
         """Parse transcript into speaker sections."""
         sections = []
-        lines = text.split("\n")
-        
         current_speaker = None
         current_role = None
-        current_content = []
+        content_start = 0
+
+        # The speaker patterns only allow spaces and tabs around a name,
+        # so normalize CRLF line endings and non-breaking spaces (&nbsp;)
+        text = text.replace("\r\n", "\n").replace("\r", "\n").replace("\xa0", " ")
+
+        # One scan over the whole body; the text between two speaker
+        # lines is the earlier speaker's content
+        for match in self._SPEAKER_RE.finditer(text):
+            self._append_section(
+                sections,
+                current_speaker,
+                current_role,
+                text[content_start:match.start()],
+            )
+            speaker = self._speaker_from_match(match)
+            current_speaker = speaker["speaker"]
+            current_role = speaker["role"]
+            content_start = match.end()
 
-        for line in lines:
-            line = line.strip()
-            if not line:
-                continue
+        # Add last section
+        self._append_section(
+            sections,
+            current_speaker,
+            current_role,
+            text[content_start:],
+        )
 
-            # Check if this is a speaker line
-            speaker_match = self._match_speaker(line)
-            
-            if speaker_match:
-                # Save previous section
-                if current_speaker and current_content:
-                    sections.append({
-                        "heading": current_speaker,
-                        "speaker_role": current_role,
-                        "content": current_content,
-                    })
-                
-                current_speaker = speaker_match["speaker"]
-                current_role = speaker_match.get("role")
-                current_content = []
-            else:
-                current_content.append(line)
+        return sections
 
-        # Add last section
-        if current_speaker and current_content:
+    def _append_section(
+        self,
+        sections: list[dict],
+        speaker: str | None,
+        role: str | None,
+        block: str,
+    ):
+        """Append a speaker section if it has a speaker and any content."""
+        # Content stays a single slice of the body; chunkers accept a
+        # string as well as a list of lines
+        content = block.strip()
+        if speaker and content:
             sections.append({
-                "heading": current_speaker,
-                "speaker_role": current_role,
-                "content": current_content,
+                "heading": speaker,
+                "speaker_role": role,
+                "content": content,
             })
 
-        return sections
-
     def _match_speaker(self, line: str) -> dict | None:
         """Try to match a speaker line."""
-        for pattern in self.SPEAKER_PATTERNS:
-            match = re.match(pattern, line)
-            if match:
-                groups = match.groups()
-                if len(groups) >= 2:
-                    return {"speaker": groups[0], "role": groups[1]}
-                elif len(groups) == 1:
-                    return {"speaker": groups[0], "role": None}
-                else:
-                    # Operator case
-                    if "Operator" in line:
-                        return {"speaker": "Operator", "role": "Operator"}
-        return None
+        # Every speaker pattern starts with a capital letter
+        if not line or not line[0].isupper():
+            return None
+
+        match = self._SPEAKER_RE.match(line)
+        if not match:
+            return None
+        return self._speaker_from_match(match)
+
+    def _speaker_from_match(self, match: re.Match) -> dict:
+        """Build the speaker dict from a _SPEAKER_RE match."""
+        if match.lastindex is None:
+            # Operator case
+            return {"speaker": "Operator", "role": "Operator"}
+
+        speaker_group, role_group = self._SPEAKER_GROUPS[match.lastindex]
+        return {
+            "speaker": match.group(speaker_group).strip(),
+            "role": match.group(role_group) if role_group else None,
+        }
@@ -1,20 +1,50 @@
 """Hybrid retriever combining semantic and keyword search."""
 
 from dataclasses import dataclass
+from functools import lru_cache
 from typing import Any
+import asyncio
+import heapq
 import logging
+import re
+import threading
 
-from llama_index.core import VectorStoreIndex
+from cachetools import LRUCache
+from llama_index.core import Settings, VectorStoreIndex
 from llama_index.core.retrievers import VectorIndexRetriever
-from llama_index.core.schema import NodeWithScore
+from llama_index.core.schema import MetadataMode, NodeWithScore, QueryBundle
 
 from src.config.settings import get_settings
 from src.nlp.indexing.manager import IndexManager
 from src.nlp.retrieval.reranker import Reranker
+from src.nlp.retrieval.semantic_cache import SemanticCache
 
 
 logger = logging.getLogger(__name__)
 
+# Chunk IDs have the form {document_id}_chunk_{index}
+_CHUNK_ID_RE = re.compile(r"^(?P<document_id>.+)_chunk_(?P<index>\d+)$")
+
+# Guards the query embedding cache, which is used from worker threads
+_query_embedding_lock = threading.Lock()
+
+
+@lru_cache(maxsize=1)
+def _get_query_embedding_cache() -> LRUCache:
+    """Get the process-wide LRU of query embeddings, keyed by (model, text)."""
+    return LRUCache(maxsize=get_settings().query_embedding_cache_size)
+
+
+@lru_cache(maxsize=1)
+def _get_semantic_cache() -> SemanticCache:
+    """Get the process-wide semantic cache of retrieval results."""
+    settings = get_settings()
+    return SemanticCache(
+        maxsize=settings.semantic_cache_size,
+        threshold=settings.semantic_cache_threshold,
+        ttl_seconds=settings.semantic_cache_ttl_seconds,
+    )
+
 
 @dataclass
 class RetrievalResult:
@@ -25,6 +55,8 @@ class RetrievalResult:
     score: float
     metadata: dict
     document_id: str | None = None
+    # Chunk embedding, fetched when the heuristic reranker needs it
+    embedding: list[float] | None = None
 
 
 class HybridRetriever:
@@ -36,6 +68,7 @@ class HybridRetriever:
     - Metadata filtering
     - Optional reranking
     - Citation tracking
+    - Semantic cache of results for near-duplicate queries
     """
 
     def __init__(
@@ -47,6 +80,8 @@ class HybridRetriever:
         self.settings = get_settings()
         self.use_reranker = use_reranker
         self.reranker = Reranker() if use_reranker else None
+        # Shared by all retrievers, which are typically created per request
+        self.cache = _get_semantic_cache() if self.settings.semantic_cache_enabled else None
 
     async def retrieve(
         self,
@@ -71,40 +106,225 @@ class HybridRetriever:
         Returns:
             List of RetrievalResult ordered by relevance
         """
+        results = await self.retrieve_batch(
+            queries=[query],
+            company_id=company_id,
+            top_k=top_k,
+            document_ids=document_ids,
+            metadata_filters=metadata_filters,
+            min_score=min_score,
+        )
+        return results[0]
+
+    async def retrieve_batch(
+        self,
+        queries: list[str],
+        company_id: str,
+        top_k: int = 10,
+        document_ids: list[str] | None = None,
+        metadata_filters: dict[str, Any] | None = None,
+        min_score: float = 0.0,
+    ) -> list[list[RetrievalResult]]:
+        """
+        Retrieve relevant chunks for several queries at once.
+        
+        Queries are embedded in one call, searched concurrently with one
+        shared retriever and filter set, and reranked in one pass.
+        
+        Args:
+            queries: Search queries
+            company_id: Company to search within
+            top_k: Maximum number of results per query
+            document_ids: Optional list of document IDs to filter
+            metadata_filters: Optional metadata filters
+            min_score: Minimum similarity score threshold
+            
+        Returns:
+            One list of RetrievalResult per query, ordered by relevance
+        """
+        if not queries:
+            return []
+
         # Get index for company
         index = await self.index_manager.get_or_create_index(company_id)
 
+        # Embed once; the embeddings serve both the cache lookup and the
+        # vector search
+        query_embeddings = await asyncio.to_thread(self._embed_queries, queries)
+
+        results_per_query: list[list[RetrievalResult] | None] = [None] * len(queries)
+        cache_scope = None
+        if self.cache is not None:
+            cache_scope = self._cache_scope(
+                company_id, top_k, document_ids, metadata_filters, min_score
+            )
+            results_per_query = [
+                self.cache.get(cache_scope, embedding) for embedding in query_embeddings
+            ]
+
+        pending = [i for i, results in enumerate(results_per_query) if results is None]
+        if not pending:
+            return results_per_query
+
+        # Get more candidates for reranking, except within a single
+        # document where the candidate pool is already small
+        single_document = document_ids is not None and len(document_ids) == 1
+        overfetch = 2 if self.use_reranker and not single_document else 1
+
         # Build retriever with filters
         retriever = self._build_retriever(
             index=index,
-            top_k=top_k * 2 if self.use_reranker else top_k,  # Get more for reranking
+            top_k=top_k * overfetch,
             document_ids=document_ids,
             metadata_filters=metadata_filters,
         )
 
         # Retrieve nodes
-        nodes = retriever.retrieve(query)
+        nodes_per_query = await asyncio.gather(*(
+            asyncio.to_thread(
+                retriever.retrieve,
+                QueryBundle(query_str=queries[i], embedding=query_embeddings[i]),
+            )
+            for i in pending
+        ))
 
         # Convert to results
-        results = []
-        for node_with_score in nodes:
-            if node_with_score.score and node_with_score.score < min_score:
-                continue
-
-            result = RetrievalResult(
-                chunk_id=node_with_score.node.id_,
-                text=node_with_score.node.get_content(),
-                score=node_with_score.score or 0.0,
-                metadata=node_with_score.node.metadata,
-                document_id=node_with_score.node.metadata.get("document_id"),
+        pending_results = [
+            self._to_results(nodes, min_score) for nodes in nodes_per_query
+        ]
+
+        # Rerank if enabled; without over-fetching, a confident vector
+        # match is kept as is
+        if self.use_reranker and self.reranker:
+            to_rerank = [
+                j for j, results in enumerate(pending_results)
+                if overfetch > 1
+                or not results
+                or results[0].score < self.settings.rerank_skip_score
+            ]
+            if to_rerank:
+                if self.reranker.uses_embeddings():
+                    await self._attach_embeddings(
+                        company_id, [pending_results[j] for j in to_rerank]
+                    )
+                reranked = await self.reranker.rerank_batch(
+                    [queries[pending[j]] for j in to_rerank],
+                    [pending_results[j] for j in to_rerank],
+                    top_k=top_k,
+                    query_embeddings=[query_embeddings[pending[j]] for j in to_rerank],
+                )
+                for j, results in zip(to_rerank, reranked):
+                    pending_results[j] = results
+
+        for i, results in zip(pending, pending_results):
+            results = results[:top_k]
+            if self.cache is not None:
+                self.cache.put(cache_scope, query_embeddings[i], results)
+            results_per_query[i] = results
+
+        return results_per_query
+
+    def _embed_queries(self, queries: list[str]) -> list[list[float]]:
+        """
+        Embed queries, reusing cached embeddings of previously seen texts.
+        
+        Uncached queries are embedded in a single batched call when there
+        are several.
+        """
+        embed_model = Settings.embed_model
+        model_name = getattr(embed_model, "model_name", None)
+        cache = _get_query_embedding_cache()
+
+        with _query_embedding_lock:
+            embeddings = [cache.get((model_name, query)) for query in queries]
+
+        missing = [i for i, embedding in enumerate(embeddings) if embedding is None]
+        if not missing:
+            return embeddings
+
+        if len(missing) == 1:
+            new_embeddings = [embed_model.get_query_embedding(queries[missing[0]])]
+        else:
+            # Query and text embeddings coincide for the OpenAI embedding models
+            new_embeddings = embed_model.get_text_embedding_batch(
+                [queries[i] for i in missing], show_progress=False
             )
-            results.append(result)
 
-        # Rerank if enabled
-        if self.use_reranker and self.reranker and len(results) > 0:
-            results = await self.reranker.rerank(query, results, top_k=top_k)
+        with _query_embedding_lock:
+            for i, embedding in zip(missing, new_embeddings):
+                embeddings[i] = embedding
+                cache[(model_name, queries[i])] = embedding
+
+        return embeddings
+
+    def _to_results(
+        self,
+        nodes: list[NodeWithScore],
+        min_score: float,
+    ) -> list[RetrievalResult]:
+        """Convert retrieved nodes to results, dropping low scores."""
+        # MetadataMode.NONE returns the raw text without formatting metadata
+        return [
+            RetrievalResult(
+                chunk_id=n.node.id_,
+                text=n.node.get_content(metadata_mode=MetadataMode.NONE),
+                score=n.score or 0.0,
+                metadata=(metadata := n.node.metadata),
+                document_id=metadata.get("document_id"),
+                embedding=n.node.embedding,
+            )
+            for n in nodes
+            if not (n.score and n.score < min_score)
+        ]
 
-        return results[:top_k]
+    async def _attach_embeddings(
+        self,
+        company_id: str,
+        results_per_query: list[list[RetrievalResult]],
+    ):
+        """
+        Fill in the chunk embeddings of results with one vector store call.
+        
+        Vector search responses do not include embeddings, so they are
+        fetched by chunk ID.
+        """
+        missing = {
+            r.chunk_id
+            for results in results_per_query
+            for r in results
+            if r.embedding is None
+        }
+        if not missing:
+            return
+
+        embeddings = await self.index_manager.get_chunk_embeddings(
+            company_id, list(missing)
+        )
+        for results in results_per_query:
+            for r in results:
+                if r.embedding is None:
+                    r.embedding = embeddings.get(r.chunk_id)
+
+    def _cache_scope(
+        self,
+        company_id: str,
+        top_k: int,
+        document_ids: list[str] | None,
+        metadata_filters: dict[str, Any] | None,
+        min_score: float,
+    ) -> tuple:
+        """Build the key a cached query must share to be reused."""
+        return (
+            company_id,
+            self.index_manager.get_index_version(company_id),
+            top_k,
+            tuple(sorted(document_ids)) if document_ids else (),
+            tuple(sorted((k, repr(v)) for k, v in (metadata_filters or {}).items())),
+            min_score,
+            # The cache is process-wide, so results must match how they were ranked
+            self.use_reranker,
+            self.reranker.model_name if self.reranker else None,
+        )
 
     async def retrieve_for_document(
         self,
@@ -138,32 +358,25 @@ class HybridRetriever:
         Useful for improving recall by searching with
         different phrasings of the same question.
         """
-        all_results: dict[str, RetrievalResult] = {}
-
-        for query in queries:
-            results = await self.retrieve(
-                query=query,
-                company_id=company_id,
-                top_k=top_k,
-                document_ids=document_ids,
-            )
-
-            for result in results:
-                if result.chunk_id not in all_results:
-                    all_results[result.chunk_id] = result
-                else:
-                    # Keep the higher score
-                    if result.score > all_results[result.chunk_id].score:
-                        all_results[result.chunk_id] = result
-
-        # Sort by score and return top_k
-        sorted_results = sorted(
-            all_results.values(),
-            key=lambda r: r.score,
-            reverse=True,
+        results_per_query = await self.retrieve_batch(
+            queries=queries,
+            company_id=company_id,
+            top_k=top_k,
+            document_ids=document_ids,
         )
 
-        return sorted_results[:top_k]
+        # Each list is already sorted by score, so merge them instead of
+        # re-sorting; the first occurrence of a chunk has its higher score
+        merged: dict[str, RetrievalResult] = {}
+        for result in heapq.merge(
+            *results_per_query, key=lambda r: r.score, reverse=True
+        ):
+            if result.chunk_id not in merged:
+                merged[result.chunk_id] = result
+                if len(merged) == top_k:
+                    break
+
+        return list(merged.values())
 
     def _build_retriever(
         self,
@@ -237,39 +450,34 @@ class HybridRetriever:
             List of chunks including the center and surrounding chunks
         """
         # Parse chunk ID to find document and chunk index
-        # Format: {document_id}_chunk_{index}
-        parts = chunk_id.rsplit("_chunk_", 1)
-        if len(parts) != 2:
+        match = _CHUNK_ID_RE.match(chunk_id)
+        if match is None:
             return []
 
-        document_id = parts[0]
-        try:
-            center_index = int(parts[1])
-        except ValueError:
-            return []
+        document_id = match["document_id"]
+        center_index = int(match["index"])
 
-        # Get chunks from the same document
-        results = []
-        for i in range(center_index - window_size, center_index + window_size + 1):
-            target_id = f"{document_id}_chunk_{i}"
-            
-            # Retrieve the specific chunk
-            chunk_results = await self.index_manager.get_document_chunks(
+        # Fetch the document's chunks once and index them by ID
+        chunk_results = await self.index_manager.get_document_chunks(
+            document_id=document_id,
+            company_id=company_id,
+        )
+        by_id = {chunk.get("id"): chunk for chunk in chunk_results}
+
+        target_ids = [
+            f"{document_id}_chunk_{i}"
+            for i in range(center_index - window_size, center_index + window_size + 1)
+        ]
+
+        # Already in chunk order
+        return [
+            RetrievalResult(
+                chunk_id=target_id,
+                text=chunk.get("text", ""),
+                score=1.0 if target_id == chunk_id else 0.9,
+                metadata=chunk.get("metadata", {}),
                 document_id=document_id,
-                company_id=company_id,
             )
-
-            for chunk in chunk_results:
-                if chunk.get("id") == target_id:
-                    results.append(
-                        RetrievalResult(
-                            chunk_id=chunk["id"],
-                            text=chunk.get("text", ""),
-                            score=1.0 if chunk["id"] == chunk_id else 0.9,
-                            metadata=chunk.get("metadata", {}),
-                            document_id=document_id,
-                        )
-                    )
-                    break
-
-        return sorted(results, key=lambda r: r.chunk_id)
+            for target_id in target_ids
+            if (chunk := by_id.get(target_id)) is not None
+        ]
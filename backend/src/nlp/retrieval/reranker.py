@@ -1,8 +1,11 @@
 """Reranker for improving retrieval quality."""
 
 from typing import TYPE_CHECKING
+import asyncio
 import logging
 
+import numpy as np
+
 from src.config.settings import get_settings
 
 
@@ -12,6 +15,93 @@ if TYPE_CHECKING:
 
 logger = logging.getLogger(__name__)
 
+# Speaker roles whose statements get a heuristic boost
+_IMPORTANT_ROLES = frozenset({"CEO", "CFO", "President"})
+
+
+class _PredictBatcher:
+    """
+    Micro-batches cross-encoder predict calls across concurrent reranks.
+
+    Pairs queued within max_wait_ms of each other, or until max_batch
+    pairs are waiting, are scored together in one predict call.
+    """
+
+    def __init__(self, model, max_batch: int, max_wait_ms: float):
+        self.model = model
+        self.max_batch = max_batch
+        self.max_wait = max_wait_ms / 1000
+        self._pending: list[tuple[list[tuple[str, str]], asyncio.Future]] = []
+        self._pending_pairs = 0
+        self._flush_task: asyncio.Task | None = None
+        # Running full-batch scoring tasks, referenced until they finish
+        self._score_tasks: set[asyncio.Task] = set()
+
+    async def predict(self, pairs: list[tuple[str, str]]) -> list[float]:
+        """Score query-document pairs as part of the next batch."""
+        future = asyncio.get_running_loop().create_future()
+        self._pending.append((pairs, future))
+        self._pending_pairs += len(pairs)
+
+        if self._pending_pairs >= self.max_batch:
+            # Batch is full: score it now instead of waiting. Scoring runs
+            # in its own task, so cancelling this caller can't strand the
+            # other callers in the batch.
+            if self._flush_task is not None:
+                self._flush_task.cancel()
+            task = asyncio.create_task(self._score(self._take_pending()))
+            self._score_tasks.add(task)
+            task.add_done_callback(self._score_tasks.discard)
+        elif self._flush_task is None:
+            self._flush_task = asyncio.create_task(self._flush_after_wait())
+
+        return await future
+
+    def _take_pending(self) -> list[tuple[list[tuple[str, str]], asyncio.Future]]:
+        """Remove and return the queued entries."""
+        batch = self._pending
+        self._pending = []
+        self._pending_pairs = 0
+        self._flush_task = None
+        return batch
+
+    async def _flush_after_wait(self):
+        """Score whatever is queued once max_wait has elapsed."""
+        await asyncio.sleep(self.max_wait)
+        await self._score(self._take_pending())
+
+    async def _score(self, batch: list[tuple[list[tuple[str, str]], asyncio.Future]]):
+        """Run one predict call for a batch and resolve its futures."""
+        all_pairs = [pair for pairs, _ in batch for pair in pairs]
+        try:
+            scores = await asyncio.to_thread(
+                self.model.predict,
+                all_pairs,
+                batch_size=self.max_batch,
+                convert_to_numpy=True,
+            )
+        except asyncio.CancelledError:
+            for _, future in batch:
+                future.cancel()
+            raise
+        except Exception as e:
+            for _, future in batch:
+                if not future.done():
+                    future.set_exception(e)
+            return
+
+        offset = 0
+        for pairs, future in batch:
+            if not future.done():
+                future.set_result(
+                    [float(score) for score in scores[offset:offset + len(pairs)]]
+                )
+            offset += len(pairs)
+
+
+# Batchers, and the models they wrap, shared by all Reranker instances
+_batchers: dict[str, _PredictBatcher] = {}
+
 
 class Reranker:
     """
@@ -25,6 +115,7 @@ class Reranker:
         self.settings = get_settings()
         self.model_name = model_name or self.settings.reranker_model
         self._model = None
+        self._batcher = None
 
     def _load_model(self):
         """Lazy load the reranker model."""
@@ -35,9 +126,22 @@ class Reranker:
             logger.info("No reranker model configured, using simple scoring")
             return
 
+        batcher = _batchers.get(self.model_name)
+        if batcher is not None:
+            self._batcher = batcher
+            self._model = batcher.model
+            return
+
         try:
             from sentence_transformers import CrossEncoder
             self._model = CrossEncoder(self.model_name)
+            self._set_precision(self._model)
+            self._batcher = _PredictBatcher(
+                self._model,
+                max_batch=self.settings.reranker_batch_size,
+                max_wait_ms=self.settings.reranker_batch_wait_ms,
+            )
+            _batchers[self.model_name] = self._batcher
             logger.info(f"Loaded reranker model: {self.model_name}")
         except ImportError:
             logger.warning(
@@ -46,11 +150,54 @@ class Reranker:
         except Exception as e:
             logger.error(f"Failed to load reranker model: {e}")
 
+    def uses_embeddings(self) -> bool:
+        """Whether reranking scores results by their chunk embeddings."""
+        self._load_model()
+        return self._model is None
+
+    async def warmup(self):
+        """Load the model and run one prediction so the first rerank is fast."""
+        await asyncio.to_thread(self._load_model)
+        if self._model:
+            await asyncio.to_thread(self._model.predict, [("warmup", "warmup")])
+            logger.info("Reranker model warmed up")
+
+    def _set_precision(self, model):
+        """Convert the model to settings.reranker_precision."""
+        precision = self.settings.reranker_precision
+        if precision == "fp32":
+            return
+
+        try:
+            import torch
+
+            on_gpu = next(model.model.parameters()).device.type == "cuda"
+            if precision == "auto":
+                precision = "fp16" if on_gpu else "int8"
+
+            if precision == "fp16" and on_gpu:
+                model.model.half()
+            elif precision == "int8" and not on_gpu:
+                # Dynamic quantization only runs on CPU
+                model.model = torch.quantization.quantize_dynamic(
+                    model.model, {torch.nn.Linear}, dtype=torch.qint8
+                )
+            else:
+                logger.warning(
+                    f"Reranker precision {precision} not supported on this device, "
+                    "using fp32"
+                )
+                return
+            logger.info(f"Reranker model converted to {precision}")
+        except Exception as e:
+            logger.warning(f"Failed to convert reranker model to {precision}: {e}")
+
     async def rerank(
         self,
         query: str,
         results: list["RetrievalResult"],
         top_k: int = 10,
+        query_embedding: list[float] | None = None,
     ) -> list["RetrievalResult"]:
         """
         Rerank retrieval results.
@@ -59,6 +206,8 @@ class Reranker:
             query: Original search query
             results: Initial retrieval results
             top_k: Number of top results to return
+            query_embedding: Query embedding, used by the heuristic
+                fallback when results carry chunk embeddings
             
         Returns:
             Reranked results
@@ -71,7 +220,64 @@ class Reranker:
         if self._model:
             return await self._rerank_with_model(query, results, top_k)
         else:
-            return await self._rerank_heuristic(query, results, top_k)
+            return await self._rerank_heuristic(
+                query, results, top_k, query_embedding
+            )
+
+    async def rerank_batch(
+        self,
+        queries: list[str],
+        results_per_query: list[list["RetrievalResult"]],
+        top_k: int = 10,
+        query_embeddings: list[list[float]] | None = None,
+    ) -> list[list["RetrievalResult"]]:
+        """
+        Rerank the results of several queries.
+        
+        With a cross-encoder, all query-document pairs are scored in a
+        single predict call.
+        
+        Args:
+            queries: Original search queries
+            results_per_query: Initial retrieval results for each query
+            top_k: Number of top results to return per query
+            query_embeddings: Query embeddings for the heuristic fallback
+            
+        Returns:
+            Reranked results for each query
+        """
+        self._load_model()
+
+        if not self._model:
+            embeddings = query_embeddings or [None] * len(queries)
+            return [
+                await self._rerank_heuristic(query, results, top_k, embedding)
+                if results else []
+                for query, results, embedding in zip(
+                    queries, results_per_query, embeddings
+                )
+            ]
+
+        pairs = [
+            (query, r.text)
+            for query, results in zip(queries, results_per_query)
+            for r in results
+        ]
+        if not pairs:
+            return [[] for _ in queries]
+
+        scores = await self._batcher.predict(pairs)
+
+        reranked = []
+        offset = 0
+        for results in results_per_query:
+            for result in results:
+                result.score = float(scores[offset])
+                offset += 1
+            reranked.append(
+                sorted(results, key=lambda r: r.score, reverse=True)[:top_k]
+            )
+        return reranked
 
     async def _rerank_with_model(
         self,
@@ -83,8 +289,8 @@ class Reranker:
         # Prepare query-document pairs
         pairs = [(query, r.text) for r in results]
 
-        # Score pairs
-        scores = self._model.predict(pairs)
+        # Score pairs, batched with concurrent reranks
+        scores = await self._batcher.predict(pairs)
 
         # Update scores and sort
         for i, result in enumerate(results):
@@ -98,41 +304,67 @@ class Reranker:
         query: str,
         results: list["RetrievalResult"],
         top_k: int,
+        query_embedding: list[float] | None = None,
     ) -> list["RetrievalResult"]:
         """
         Simple heuristic reranking.
         
+        Starts from the cosine similarity between the query and chunk
+        embeddings when both are available, else the retrieval score.
+        
         Boosts scores based on:
         - Exact query term matches
         - Query term coverage
         - Position in document
         """
-        query_terms = set(query.lower().split())
+        n = len(results)
+        query_lower = query.lower()
+        query_terms = frozenset(query_lower.split())
+        texts_lower = [r.text.lower() for r in results]
 
-        for result in results:
-            text_lower = result.text.lower()
-            text_terms = set(text_lower.split())
+        # Calculate term coverage
+        coverage = np.zeros(n)
+        if query_terms:
+            coverage = np.fromiter(
+                (len(query_terms.intersection(text.split())) for text in texts_lower),
+                dtype=np.float64,
+                count=n,
+            ) / len(query_terms)
 
-            # Calculate term overlap
-            overlap = len(query_terms & text_terms)
-            coverage = overlap / len(query_terms) if query_terms else 0
+        # Check for exact phrase match
+        exact_match = np.fromiter(
+            (query_lower in text for text in texts_lower), dtype=bool, count=n
+        )
 
-            # Check for exact phrase match
-            exact_match = query.lower() in text_lower
+        # Check for important metadata
+        important_speaker = np.fromiter(
+            (r.metadata.get("speaker_role") in _IMPORTANT_ROLES for r in results),
+            dtype=bool,
+            count=n,
+        )
 
-            # Calculate boost
-            boost = 0.0
-            if exact_match:
-                boost += 0.2
-            boost += coverage * 0.1
+        # Apply boosts to all scores at once
+        if query_embedding is not None and all(r.embedding is not None for r in results):
+            scores = self._cosine_scores(query_embedding, results)
+        else:
+            scores = np.fromiter((r.score for r in results), dtype=np.float64, count=n)
+        scores += 0.2 * exact_match + 0.1 * coverage + 0.1 * important_speaker
+        for result, score in zip(results, scores):
+            result.score = float(score)
 
-            # Check for important metadata
-            metadata = result.metadata
-            if metadata.get("speaker_role") in ["CEO", "CFO", "President"]:
-                boost += 0.1
+        # Stable, so ties keep their retrieval order
+        order = np.argsort(-scores, kind="stable")[:top_k]
+        return [results[i] for i in order]
 
-            # Apply boost
-            result.score = result.score + boost
+    def _cosine_scores(
+        self,
+        query_embedding: list[float],
+        results: list["RetrievalResult"],
+    ) -> np.ndarray:
+        """Cosine similarity of the query to every result in one matrix product."""
+        matrix = np.asarray([r.embedding for r in results], dtype=np.float32)
+        query = np.asarray(query_embedding, dtype=np.float32)
 
-        sorted_results = sorted(results, key=lambda r: r.score, reverse=True)
-        return sorted_results[:top_k]
+        norms = np.linalg.norm(matrix, axis=1) * np.sqrt(np.vdot(query, query))
+        norms[norms == 0] = 1.0
+        return (matrix @ query / norms).astype(np.float64)
@@ -0,0 +1,114 @@
+"""Semantic cache for retrieval results keyed on query embeddings."""
+
+from collections import OrderedDict
+from copy import copy
+from typing import Any, Hashable
+import logging
+import time
+
+import numpy as np
+
+
+logger = logging.getLogger(__name__)
+
+
+class SemanticCache:
+    """
+    LRU cache of retrieval results matched by query similarity.
+
+    Entries are grouped by scope (company, index version, filters and
+    other retrieval parameters); a lookup returns the results of the
+    most similar cached query in the same scope when its cosine
+    similarity reaches the threshold. Entries expire after ttl_seconds.
+    """
+
+    def __init__(self, maxsize: int, threshold: float, ttl_seconds: float):
+        self.maxsize = maxsize
+        self.threshold = threshold
+        self.ttl_seconds = ttl_seconds
+        # scope -> entry id -> (normalized embedding, results, stored at)
+        self._scopes: dict[Hashable, dict[int, tuple[np.ndarray, list, float]]] = {}
+        # (scope, entry id) of every entry, least recently used first
+        self._lru: OrderedDict[tuple, None] = OrderedDict()
+        self._next_id = 0
+        self.hits = 0
+        self.misses = 0
+
+    @staticmethod
+    def _normalize(embedding: list[float]) -> np.ndarray:
+        """L2-normalize an embedding so a dot product is cosine similarity."""
+        vector = np.asarray(embedding, dtype=np.float32)
+        norm = np.linalg.norm(vector)
+        return vector / norm if norm else vector
+
+    def get(self, scope: Hashable, embedding: list[float]) -> list | None:
+        """
+        Look up results for a query embedding.
+
+        Args:
+            scope: Key the cached query must share with this one
+            embedding: Query embedding
+
+        Returns:
+            Copies of the cached results, or None on a miss
+        """
+        entries = self._scopes.get(scope, {})
+        now = time.monotonic()
+        ids = []
+        vectors = []
+        for entry_id, (vector, _, stored_at) in list(entries.items()):
+            if now - stored_at >= self.ttl_seconds:
+                self._remove(scope, entry_id)
+            else:
+                ids.append(entry_id)
+                vectors.append(vector)
+
+        if vectors:
+            similarities = np.stack(vectors) @ self._normalize(embedding)
+            best = int(np.argmax(similarities))
+            if similarities[best] >= self.threshold:
+                entry_id = ids[best]
+                self._lru.move_to_end((scope, entry_id))
+                self.hits += 1
+                # Callers (e.g. the reranker) mutate result scores
+                return [copy(result) for result in entries[entry_id][1]]
+
+        self.misses += 1
+        return None
+
+    def put(self, scope: Hashable, embedding: list[float], results: list) -> None:
+        """Cache results for a query embedding, evicting the LRU entry if full."""
+        entry_id = self._next_id
+        self._next_id += 1
+        self._scopes.setdefault(scope, {})[entry_id] = (
+            self._normalize(embedding),
+            [copy(result) for result in results],
+            time.monotonic(),
+        )
+        self._lru[(scope, entry_id)] = None
+        while len(self._lru) > self.maxsize:
+            self._remove(*next(iter(self._lru)))
+
+    def _remove(self, scope: Hashable, entry_id: int) -> None:
+        """Drop one entry, and its scope once empty."""
+        del self._lru[(scope, entry_id)]
+        entries = self._scopes[scope]
+        del entries[entry_id]
+        if not entries:
+            del self._scopes[scope]
+
+    def clear(self) -> None:
+        """Drop all cached results."""
+        self._scopes.clear()
+        self._lru.clear()
+
+    def stats(self) -> dict[str, Any]:
+        """Get size and hit-rate statistics."""
+        total = self.hits + self.misses
+        return {
+            "size": len(self._lru),
+            "maxsize": self.maxsize,
+            "hits": self.hits,
+            "misses": self.misses,
+            "hit_rate": self.hits / total if total else 0.0,
+        }
@@ -1,12 +1,16 @@
 """Analysis repository."""
 
 from datetime import datetime
-from sqlalchemy import select, func, and_
+from sqlalchemy import case, delete, select, func, and_, update
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
+from sqlalchemy.orm import raiseload, selectinload
 
 from src.repositories.base import BaseRepository
 from src.models.db.analysis import AnalysisModel, InsightModel, EvidenceModel, InitiativeModel
+from src.utils.helpers import utc_now
+
+# Sort keys (all descending) for keyset pagination of insights
+INSIGHT_PAGE_KEYS = (InsightModel.confidence_score, InsightModel.id)
 
 
 class AnalysisRepository(BaseRepository[AnalysisModel]):
@@ -27,23 +31,13 @@ class AnalysisRepository(BaseRepository[AnalysisModel]):
         if status:
             filters.append(AnalysisModel.status == status)
 
-        count_result = await self.db.execute(
-            select(func.count())
-            .select_from(AnalysisModel)
-            .where(and_(*filters))
-        )
-        total = count_result.scalar_one()
-
-        result = await self.db.execute(
+        return await self.paginate(
             select(AnalysisModel)
             .where(and_(*filters))
-            .order_by(AnalysisModel.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            .order_by(AnalysisModel.created_at.desc()),
+            offset=offset,
+            limit=limit,
         )
-        analyses = list(result.scalars().all())
-
-        return analyses, total
 
     async def get_latest_completed(self, company_id: str) -> AnalysisModel | None:
         """Get the most recent completed analysis for a company."""
@@ -66,17 +60,24 @@ class AnalysisRepository(BaseRepository[AnalysisModel]):
         progress: float,
         status: str | None = None,
     ) -> None:
-        """Update analysis progress."""
-        analysis = await self.get_by_id(id)
-        if analysis:
-            analysis.progress = progress
-            if status:
-                analysis.status = status
-                if status == "processing" and not analysis.started_at:
-                    analysis.started_at = datetime.utcnow()
-                elif status == "completed":
-                    analysis.completed_at = datetime.utcnow()
-            await self.db.flush()
+        """Update analysis progress with a single UPDATE statement."""
+        values = {"progress": progress}
+        if status:
+            values["status"] = status
+            if status == "processing":
+                # Keep the original start time on repeated transitions
+                values["started_at"] = func.coalesce(
+                    AnalysisModel.started_at, utc_now()
+                )
+            elif status == "completed":
+                values["completed_at"] = utc_now()
+
+        await self.db.execute(
+            update(AnalysisModel)
+            .where(AnalysisModel.id == id)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
 
 
 class InsightRepository(BaseRepository[InsightModel]):
@@ -92,8 +93,14 @@ class InsightRepository(BaseRepository[InsightModel]):
         confidence_min: float | None = None,
         offset: int = 0,
         limit: int = 20,
+        cursor: str | None = None,
     ) -> tuple[list[InsightModel], int]:
-        """Get insights for a company with filters."""
+        """
+        Get insights for a company with filters.
+        
+        Pass page_cursor(last insight, INSIGHT_PAGE_KEYS) as cursor to get
+        the next page by keyset instead of offset.
+        """
         filters = [InsightModel.company_id == company_id]
         
         if category:
@@ -101,30 +108,26 @@ class InsightRepository(BaseRepository[InsightModel]):
         if confidence_min is not None:
             filters.append(InsightModel.confidence_score >= confidence_min)
 
-        count_result = await self.db.execute(
-            select(func.count())
-            .select_from(InsightModel)
-            .where(and_(*filters))
-        )
-        total = count_result.scalar_one()
-
-        result = await self.db.execute(
+        # List consumers don't read evidence, so it isn't loaded here
+        return await self.paginate(
             select(InsightModel)
-            .options(selectinload(InsightModel.evidence))
             .where(and_(*filters))
-            .order_by(InsightModel.confidence_score.desc())
-            .offset(offset)
-            .limit(limit)
+            .order_by(InsightModel.confidence_score.desc(), InsightModel.id.desc()),
+            offset=offset,
+            limit=limit,
+            after=self.after_cursor(cursor, INSIGHT_PAGE_KEYS) if cursor else None,
         )
-        insights = list(result.scalars().all())
-
-        return insights, total
 
     async def get_with_evidence(self, id: str) -> InsightModel | None:
-        """Get insight with all evidence."""
+        """
+        Get insight with all evidence.
+        
+        Evidence is loaded with one extra SELECT; other relationships
+        raise on access instead of lazy loading.
+        """
         result = await self.db.execute(
             select(InsightModel)
-            .options(selectinload(InsightModel.evidence))
+            .options(selectinload(InsightModel.evidence), raiseload("*"))
             .where(InsightModel.id == id)
         )
         return result.scalar_one_or_none()
@@ -139,10 +142,16 @@ class InsightRepository(BaseRepository[InsightModel]):
         return list(result.scalars().all())
 
     async def delete_by_company(self, company_id: str) -> int:
-        """Delete all insights for a company."""
-        from sqlalchemy import delete
+        """
+        Delete all insights for a company.
+        
+        Runs as one DELETE without loading the rows into the session;
+        it commits with the caller's transaction.
+        """
         result = await self.db.execute(
-            delete(InsightModel).where(InsightModel.company_id == company_id)
+            delete(InsightModel)
+            .where(InsightModel.company_id == company_id)
+            .execution_options(synchronize_session=False)
         )
         return result.rowcount
 
@@ -193,23 +202,57 @@ class InitiativeRepository(BaseRepository[InitiativeModel]):
         if is_active is not None:
             filters.append(InitiativeModel.is_active == is_active)
 
-        count_result = await self.db.execute(
-            select(func.count())
-            .select_from(InitiativeModel)
+        return await self.paginate(
+            select(InitiativeModel)
             .where(and_(*filters))
+            .order_by(InitiativeModel.last_mentioned_at.desc()),
+            offset=offset,
+            limit=limit,
         )
-        total = count_result.scalar_one()
 
+    async def get_by_categories(
+        self,
+        company_id: str,
+        categories: list[str],
+    ) -> list[InitiativeModel]:
+        """Get all of a company's initiatives in any of the given categories."""
         result = await self.db.execute(
             select(InitiativeModel)
-            .where(and_(*filters))
-            .order_by(InitiativeModel.last_mentioned_at.desc())
-            .offset(offset)
-            .limit(limit)
+            .where(
+                and_(
+                    InitiativeModel.company_id == company_id,
+                    InitiativeModel.category.in_(categories),
+                )
+            )
+            .order_by(InitiativeModel.created_at)
         )
-        initiatives = list(result.scalars().all())
+        return list(result.scalars().all())
 
-        return initiatives, total
+    async def add_mentions(
+        self,
+        mention_counts: dict[str, int],
+        mentioned_at: datetime,
+    ) -> None:
+        """
+        Increment mention counts of several initiatives in one UPDATE.
+        
+        Args:
+            mention_counts: Initiative ID -> number of new mentions
+            mentioned_at: New last_mentioned_at for those initiatives
+        """
+        if not mention_counts:
+            return
+
+        await self.db.execute(
+            update(InitiativeModel)
+            .where(InitiativeModel.id.in_(mention_counts))
+            .values(
+                mention_count=InitiativeModel.mention_count
+                + case(mention_counts, value=InitiativeModel.id, else_=0),
+                last_mentioned_at=mentioned_at,
+            )
+            .execution_options(synchronize_session=False)
+        )
 
     async def find_similar(
         self,
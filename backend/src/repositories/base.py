@@ -1,15 +1,44 @@
 """Base repository class with common CRUD operations."""
 
-from typing import Any, Generic, TypeVar, Type
+from datetime import datetime
+from functools import lru_cache
+from typing import Any, Generic, Hashable, TypeVar, Type
+import base64
+import binascii
+import json
 
-from sqlalchemy import select, func, delete
+from cachetools import TTLCache
+from sqlalchemy import (
+    ColumnElement,
+    Row,
+    Select,
+    and_,
+    delete,
+    false,
+    func,
+    insert,
+    lambda_stmt,
+    literal,
+    or_,
+    select,
+    update,
+)
 from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import InstrumentedAttribute
 
-from src.db.base import Base
+from src.config.settings import get_settings
+from src.db.base import Base, generate_uuid
+from src.utils.exceptions import ValidationError
 
 ModelType = TypeVar("ModelType", bound=Base)
 
 
+@lru_cache(maxsize=1)
+def _get_count_cache() -> TTLCache:
+    """Get the process-wide cache of page totals, keyed by (table, filters)."""
+    return TTLCache(maxsize=1024, ttl=get_settings().pagination_count_ttl_seconds)
+
+
 class BaseRepository(Generic[ModelType]):
     """Base repository with common CRUD operations."""
 
@@ -19,8 +48,11 @@ class BaseRepository(Generic[ModelType]):
 
     async def get_by_id(self, id: str) -> ModelType | None:
         """Get a single record by ID."""
+        # Lambda statements are built and cache-keyed once per model,
+        # not on every call
+        model = self.model
         result = await self.db.execute(
-            select(self.model).where(self.model.id == id)
+            lambda_stmt(lambda: select(model).where(model.id == id))
         )
         return result.scalar_one_or_none()
 
@@ -38,6 +70,183 @@ class BaseRepository(Generic[ModelType]):
         )
         return list(result.scalars().all())
 
+    async def paginate(
+        self,
+        stmt: Select,
+        offset: int,
+        limit: int,
+        count_key: Hashable | None = None,
+        after: ColumnElement[bool] | None = None,
+    ) -> tuple[list[ModelType], int]:
+        """
+        Get one page of a query along with the total number of matches.
+        
+        Args:
+            stmt: Select of the model with filters and ordering applied
+            offset: Number of records to skip
+            limit: Maximum number of records to return
+            count_key: Key identifying the query's filters; when given,
+                the total is cached briefly and reused for other pages
+            after: Keyset condition from after_cursor; replaces offset
+            
+        Returns:
+            Tuple of (records, total)
+        """
+        rows, total = await self.paginate_rows(stmt, offset, limit, count_key, after)
+        return [row[0] for row in rows], total
+
+    async def paginate_rows(
+        self,
+        stmt: Select,
+        offset: int,
+        limit: int,
+        count_key: Hashable | None = None,
+        after: ColumnElement[bool] | None = None,
+    ) -> tuple[list[Row], int]:
+        """
+        Get one page of rows of any select along with the total count.
+        
+        The total comes from a COUNT(*) OVER () window column, so page and
+        count are read in a single query. Rows keep that column last,
+        labelled "total". With a count_key, a total cached by an earlier
+        page is selected as a literal instead, skipping the count.
+        
+        With an after condition (keyset pagination), the page is the first
+        limit rows matching it and offset is ignored. The total still
+        counts every row of stmt.
+        
+        Args:
+            stmt: Select with filters and ordering applied
+            offset: Number of rows to skip
+            limit: Maximum number of rows to return
+            count_key: Key identifying the query's filters, for caching
+                the total
+            after: Keyset condition from after_cursor
+            
+        Returns:
+            Tuple of (rows, total)
+        """
+        cache_key = None
+        total = None
+        if count_key is not None and get_settings().pagination_count_ttl_seconds > 0:
+            cache_key = (self.model.__tablename__, count_key)
+            total = _get_count_cache().get(cache_key)
+
+        if total is None and after is not None:
+            # The window count would only cover rows after the cursor
+            total = await self._count_rows(stmt)
+            if cache_key is not None:
+                _get_count_cache()[cache_key] = total
+
+        if total is not None:
+            if after is not None:
+                stmt = stmt.where(after)
+                offset = 0
+            result = await self.db.execute(
+                stmt.add_columns(literal(total).label("total"))
+                .offset(offset)
+                .limit(limit)
+            )
+            return result.all(), total
+
+        result = await self.db.execute(
+            stmt.add_columns(func.count().over().label("total"))
+            .offset(offset)
+            .limit(limit)
+        )
+        rows = result.all()
+        if rows:
+            total = rows[0][-1]
+        elif offset == 0:
+            total = 0
+        else:
+            # Page is past the end, so there's no row to carry the total
+            total = await self._count_rows(stmt)
+
+        if cache_key is not None:
+            _get_count_cache()[cache_key] = total
+        return rows, total
+
+    async def _count_rows(self, stmt: Select) -> int:
+        """Count the rows a select returns."""
+        result = await self.db.execute(
+            select(func.count()).select_from(stmt.order_by(None).subquery())
+        )
+        return result.scalar_one()
+
+    @staticmethod
+    def page_cursor(record: Any, keys: tuple[InstrumentedAttribute, ...]) -> str:
+        """
+        Encode a record's sort key values as an opaque page cursor.
+        
+        Args:
+            record: Last record of a page
+            keys: Columns the page is ordered by
+            
+        Returns:
+            URL-safe cursor for after_cursor
+        """
+        values = [getattr(record, key.key) for key in keys]
+        payload = json.dumps(
+            [value.isoformat() if isinstance(value, datetime) else value for value in values]
+        )
+        return base64.urlsafe_b64encode(payload.encode()).decode()
+
+    @staticmethod
+    def after_cursor(
+        cursor: str,
+        keys: tuple[InstrumentedAttribute, ...],
+    ) -> ColumnElement[bool]:
+        """
+        Build the keyset condition for rows after a page cursor.
+        
+        Rows must be ordered by keys descending, with NULLs last; the
+        last key should be unique (e.g. the ID).
+        
+        Args:
+            cursor: Cursor from page_cursor
+            keys: Columns the page is ordered by
+            
+        Returns:
+            Condition selecting the rows that sort after the cursor
+        """
+        try:
+            values = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+            if not isinstance(values, list) or len(values) != len(keys):
+                raise ValueError("wrong number of values")
+            values = [
+                datetime.fromisoformat(value)
+                if value is not None and key.type.python_type is datetime
+                else value
+                for key, value in zip(keys, values)
+            ]
+        except (binascii.Error, TypeError, ValueError) as e:
+            raise ValidationError(f"Invalid page cursor: {e}", field="cursor")
+
+        # (k1 after v1) OR (k1 = v1 AND k2 after v2) OR ...
+        conditions = []
+        for i, (key, value) in enumerate(zip(keys, values)):
+            if value is None:
+                # NULLs sort last, so nothing comes after one
+                after = false()
+            elif key.nullable:
+                after = or_(key < value, key.is_(None))
+            else:
+                after = key < value
+            prefix = [
+                prefix_key.is_(None) if prefix_value is None else prefix_key == prefix_value
+                for prefix_key, prefix_value in zip(keys[:i], values[:i])
+            ]
+            conditions.append(and_(*prefix, after))
+        return or_(*conditions)
+
+    def _invalidate_counts(self, table: str | None = None) -> None:
+        """Drop cached page totals for a table, by default this repository's."""
+        cache = _get_count_cache()
+        table = table or self.model.__tablename__
+        for key in [key for key in cache.keys() if key[0] == table]:
+            cache.pop(key, None)
+
     async def count(self) -> int:
         """Count all records."""
         result = await self.db.execute(
@@ -51,32 +260,65 @@ class BaseRepository(Generic[ModelType]):
         self.db.add(instance)
         await self.db.flush()
         await self.db.refresh(instance)
+        self._invalidate_counts()
         return instance
 
-    async def update(self, id: str, **kwargs: Any) -> ModelType | None:
-        """Update a record by ID."""
-        instance = await self.get_by_id(id)
-        if instance is None:
-            return None
+    async def create_many(self, rows: list[dict[str, Any]]) -> list[str]:
+        """
+        Create records with a single executemany INSERT.
         
-        for key, value in kwargs.items():
-            if value is not None and hasattr(instance, key):
-                setattr(instance, key, value)
+        IDs are generated client-side, so rows can reference each other's
+        records before they are inserted. Instances aren't loaded into
+        the session.
         
-        await self.db.flush()
-        await self.db.refresh(instance)
-        return instance
+        Args:
+            rows: Column values for each record; an "id" key is kept
+            
+        Returns:
+            IDs of the created records, in row order
+        """
+        if not rows:
+            return []
+
+        rows = [{"id": generate_uuid(), **row} for row in rows]
+        await self.db.execute(insert(self.model), rows)
+        self._invalidate_counts()
+        return [row["id"] for row in rows]
+
+    async def update(self, id: str, **kwargs: Any) -> ModelType | None:
+        """Update a record by ID with a single UPDATE ... RETURNING."""
+        values = {
+            key: value
+            for key, value in kwargs.items()
+            if value is not None and hasattr(self.model, key)
+        }
+        if not values:
+            return await self.get_by_id(id)
+
+        result = await self.db.execute(
+            update(self.model)
+            .where(self.model.id == id)
+            .values(**values)
+            .returning(self.model)
+            # Refresh the instance if it's already in the session
+            .execution_options(populate_existing=True)
+        )
+        # Updated columns may be filtered on
+        self._invalidate_counts()
+        return result.scalar_one_or_none()
 
     async def delete(self, id: str) -> bool:
         """Delete a record by ID."""
         result = await self.db.execute(
             delete(self.model).where(self.model.id == id)
         )
+        self._invalidate_counts()
         return result.rowcount > 0
 
     async def exists(self, id: str) -> bool:
         """Check if a record exists."""
+        model = self.model
         result = await self.db.execute(
-            select(func.count()).select_from(self.model).where(self.model.id == id)
+            lambda_stmt(lambda: select(1).where(model.id == id).limit(1))
         )
-        return result.scalar_one() > 0
+        return result.first() is not None
@@ -1,11 +1,16 @@
 """Company repository."""
 
-from sqlalchemy import select, func, or_
+from sqlalchemy import select, func, lambda_stmt, or_
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy.orm import selectinload
 
 from src.repositories.base import BaseRepository
+from src.models.db.analysis import AnalysisModel
 from src.models.db.company import CompanyModel
+from src.models.db.document import DocumentModel
+
+
+# pg_trgm can't match on fewer than 3 characters
+_TRIGRAM_MIN_QUERY_LENGTH = 3
 
 
 class CompanyRepository(BaseRepository[CompanyModel]):
@@ -14,10 +19,18 @@ class CompanyRepository(BaseRepository[CompanyModel]):
     def __init__(self, db: AsyncSession):
         super().__init__(db, CompanyModel)
 
+    async def delete(self, id: str) -> bool:
+        """Delete a company; its documents are deleted by cascade."""
+        deleted = await super().delete(id)
+        # Cascaded deletes bypass DocumentRepository's invalidation
+        self._invalidate_counts(DocumentModel.__tablename__)
+        return deleted
+
     async def get_by_ticker(self, ticker: str) -> CompanyModel | None:
         """Get company by ticker symbol."""
+        ticker = ticker.upper()
         result = await self.db.execute(
-            select(CompanyModel).where(CompanyModel.ticker == ticker.upper())
+            lambda_stmt(lambda: select(CompanyModel).where(CompanyModel.ticker == ticker))
         )
         return result.scalar_one_or_none()
 
@@ -27,63 +40,78 @@ class CompanyRepository(BaseRepository[CompanyModel]):
         offset: int = 0,
         limit: int = 20,
     ) -> tuple[list[CompanyModel], int]:
-        """Search companies by name or ticker."""
+        """
+        Search companies by name or ticker.
+        
+        On PostgreSQL, queries of 3+ characters also match names by
+        trigram similarity (pg_trgm) and return the closest names first.
+        """
         base_query = select(CompanyModel)
-        count_query = select(func.count()).select_from(CompanyModel)
+        order_by = [CompanyModel.ticker]
 
         if query:
-            search_filter = or_(
+            filters = [
                 CompanyModel.ticker.ilike(f"%{query}%"),
                 CompanyModel.name.ilike(f"%{query}%"),
-            )
-            base_query = base_query.where(search_filter)
-            count_query = count_query.where(search_filter)
+            ]
+            if (
+                len(query) >= _TRIGRAM_MIN_QUERY_LENGTH
+                and self.db.get_bind().dialect.name == "postgresql"
+            ):
+                # Index-backed by the trigram index on name
+                filters.append(CompanyModel.name.op("%")(query))
+                order_by.insert(0, func.similarity(CompanyModel.name, query).desc())
+            base_query = base_query.where(or_(*filters))
 
-        # Get total count
-        total_result = await self.db.execute(count_query)
-        total = total_result.scalar_one()
-
-        # Get paginated results
-        result = await self.db.execute(
-            base_query
-            .order_by(CompanyModel.ticker)
-            .offset(offset)
-            .limit(limit)
+        return await self.paginate(
+            base_query.order_by(*order_by),
+            offset=offset,
+            limit=limit,
         )
-        companies = list(result.scalars().all())
-
-        return companies, total
 
     async def get_with_stats(self, id: str) -> CompanyModel | None:
         """Get company with document and analysis counts."""
-        result = await self.db.execute(
-            select(CompanyModel)
-            .options(
-                selectinload(CompanyModel.documents),
-                selectinload(CompanyModel.analyses),
+        # Aggregate in the database instead of loading the collections
+        document_count = (
+            select(func.count(DocumentModel.id))
+            .where(DocumentModel.company_id == CompanyModel.id)
+            .scalar_subquery()
+        )
+        analysis_count = (
+            select(func.count(AnalysisModel.id))
+            .where(AnalysisModel.company_id == CompanyModel.id)
+            .scalar_subquery()
+        )
+        latest_analysis_at = (
+            select(func.max(AnalysisModel.completed_at))
+            .where(
+                AnalysisModel.company_id == CompanyModel.id,
+                AnalysisModel.status == "completed",
             )
+            .scalar_subquery()
+        )
+
+        result = await self.db.execute(
+            select(CompanyModel, document_count, analysis_count, latest_analysis_at)
             .where(CompanyModel.id == id)
         )
-        company = result.scalar_one_or_none()
-        
-        if company:
-            # Add computed stats
-            company.document_count = len(company.documents)
-            company.analysis_count = len(company.analyses)
-            if company.analyses:
-                completed = [a for a in company.analyses if a.status == "completed"]
-                if completed:
-                    company.latest_analysis_at = max(a.completed_at for a in completed if a.completed_at)
-        
+        row = result.one_or_none()
+        if row is None:
+            return None
+
+        # Add computed stats
+        company = row[0]
+        company.document_count = row[1]
+        company.analysis_count = row[2]
+        company.latest_analysis_at = row[3]
+
         return company
 
     async def ticker_exists(self, ticker: str, exclude_id: str | None = None) -> bool:
         """Check if ticker already exists."""
-        query = select(func.count()).select_from(CompanyModel).where(
-            CompanyModel.ticker == ticker.upper()
-        )
+        query = select(1).where(CompanyModel.ticker == ticker.upper())
         if exclude_id:
             query = query.where(CompanyModel.id != exclude_id)
         
-        result = await self.db.execute(query)
-        return result.scalar_one() > 0
+        result = await self.db.execute(query.limit(1))
+        return result.first() is not None
@@ -1,11 +1,18 @@
 """Document repository."""
 
-from datetime import datetime
-from sqlalchemy import select, func, and_
+from sqlalchemy import select, exists, func, and_, lambda_stmt, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from sqlalchemy.ext.asyncio import AsyncSession
 
+from src.db.base import generate_uuid
 from src.repositories.base import BaseRepository
 from src.models.db.document import DocumentModel
+from src.utils.helpers import utc_now
+
+# Sort keys (all descending) for keyset pagination
+COMPANY_PAGE_KEYS = (DocumentModel.document_date, DocumentModel.created_at, DocumentModel.id)
+LIST_PAGE_KEYS = (DocumentModel.created_at, DocumentModel.id)
 
 
 class DocumentRepository(BaseRepository[DocumentModel]):
@@ -21,8 +28,14 @@ class DocumentRepository(BaseRepository[DocumentModel]):
         status: str | None = None,
         offset: int = 0,
         limit: int = 20,
+        cursor: str | None = None,
     ) -> tuple[list[DocumentModel], int]:
-        """Get documents for a company with optional filters."""
+        """
+        Get documents for a company with optional filters.
+        
+        Pass page_cursor(last document, COMPANY_PAGE_KEYS) as cursor to
+        get the next page by keyset instead of offset.
+        """
         filters = [DocumentModel.company_id == company_id]
         
         if document_type:
@@ -30,25 +43,19 @@ class DocumentRepository(BaseRepository[DocumentModel]):
         if status:
             filters.append(DocumentModel.status == status)
 
-        # Count query
-        count_result = await self.db.execute(
-            select(func.count())
-            .select_from(DocumentModel)
-            .where(and_(*filters))
-        )
-        total = count_result.scalar_one()
-
-        # Data query
-        result = await self.db.execute(
+        return await self.paginate(
             select(DocumentModel)
             .where(and_(*filters))
-            .order_by(DocumentModel.document_date.desc().nullslast(), DocumentModel.created_at.desc())
-            .offset(offset)
-            .limit(limit)
+            .order_by(
+                DocumentModel.document_date.desc().nullslast(),
+                DocumentModel.created_at.desc(),
+                DocumentModel.id.desc(),
+            ),
+            offset=offset,
+            limit=limit,
+            count_key=("company", company_id, document_type, status),
+            after=self.after_cursor(cursor, COMPANY_PAGE_KEYS) if cursor else None,
         )
-        documents = list(result.scalars().all())
-
-        return documents, total
 
     async def list_all(
         self,
@@ -56,8 +63,14 @@ class DocumentRepository(BaseRepository[DocumentModel]):
         document_type: str | None = None,
         offset: int = 0,
         limit: int = 20,
+        cursor: str | None = None,
     ) -> tuple[list[DocumentModel], int]:
-        """List all documents with optional filters."""
+        """
+        List all documents with optional filters.
+        
+        Pass page_cursor(last document, LIST_PAGE_KEYS) as cursor to get
+        the next page by keyset instead of offset.
+        """
         filters = []
         
         if company_id:
@@ -65,35 +78,73 @@ class DocumentRepository(BaseRepository[DocumentModel]):
         if document_type:
             filters.append(DocumentModel.document_type == document_type)
 
-        # Count query
-        count_query = select(func.count()).select_from(DocumentModel)
-        if filters:
-            count_query = count_query.where(and_(*filters))
-        count_result = await self.db.execute(count_query)
-        total = count_result.scalar_one()
-
-        # Data query
         data_query = select(DocumentModel)
         if filters:
             data_query = data_query.where(and_(*filters))
-        data_query = (
-            data_query
-            .order_by(DocumentModel.created_at.desc())
-            .offset(offset)
-            .limit(limit)
-        )
-        result = await self.db.execute(data_query)
-        documents = list(result.scalars().all())
 
-        return documents, total
+        return await self.paginate(
+            data_query.order_by(DocumentModel.created_at.desc(), DocumentModel.id.desc()),
+            offset=offset,
+            limit=limit,
+            count_key=("all", company_id, document_type),
+            after=self.after_cursor(cursor, LIST_PAGE_KEYS) if cursor else None,
+        )
 
     async def get_by_hash(self, content_hash: str) -> DocumentModel | None:
         """Get document by content hash (for deduplication)."""
         result = await self.db.execute(
-            select(DocumentModel).where(DocumentModel.content_hash == content_hash)
+            lambda_stmt(
+                lambda: select(DocumentModel)
+                .where(DocumentModel.content_hash == content_hash)
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def get_by_hash_for_company(
+        self,
+        content_hash: str,
+        company_id: str,
+    ) -> DocumentModel | None:
+        """Get a company's document by content hash (for deduplication)."""
+        result = await self.db.execute(
+            lambda_stmt(
+                lambda: select(DocumentModel)
+                .where(
+                    and_(
+                        DocumentModel.company_id == company_id,
+                        DocumentModel.content_hash == content_hash,
+                    )
+                )
+                .limit(1)
+            )
         )
         return result.scalar_one_or_none()
 
+    async def create_if_new(self, **kwargs) -> DocumentModel | None:
+        """
+        Create a document unless the company already has its content.
+        
+        A single INSERT ... ON CONFLICT (company_id, content_hash) DO
+        NOTHING RETURNING, so the duplicate check can't race the insert.
+        
+        Returns:
+            The created document, or None if it is a duplicate
+        """
+        values = {"id": generate_uuid(), **kwargs}
+        insert = (
+            pg_insert if self.db.get_bind().dialect.name == "postgresql" else sqlite_insert
+        )
+        result = await self.db.execute(
+            insert(DocumentModel)
+            .values(**values)
+            .on_conflict_do_nothing(index_elements=["company_id", "content_hash"])
+            .returning(DocumentModel)
+        )
+        document = result.scalar_one_or_none()
+        if document is not None:
+            self._invalidate_counts()
+        return document
+
     async def update_status(
         self,
         id: str,
@@ -101,15 +152,29 @@ class DocumentRepository(BaseRepository[DocumentModel]):
         error_message: str | None = None,
         **kwargs,
     ) -> DocumentModel | None:
-        """Update document processing status."""
+        """
+        Update document processing status with a single UPDATE ... RETURNING.
+        
+        Unlike update, None values are written, so a retry clears the
+        previous error_message and processed_at.
+        """
         update_data = {"status": status, "error_message": error_message, **kwargs}
         
         if status == "processing":
             update_data["processed_at"] = None
         elif status == "completed":
-            update_data["processed_at"] = datetime.utcnow()
+            update_data["processed_at"] = utc_now()
         
-        return await self.update(id, **update_data)
+        result = await self.db.execute(
+            update(DocumentModel)
+            .where(DocumentModel.id == id)
+            .values(**update_data)
+            .returning(DocumentModel)
+            .execution_options(populate_existing=True)
+        )
+        # Status is filtered on by the paginated lists
+        self._invalidate_counts()
+        return result.scalar_one_or_none()
 
     async def get_unprocessed(self, limit: int = 10) -> list[DocumentModel]:
         """Get documents that need processing."""
@@ -121,11 +186,56 @@ class DocumentRepository(BaseRepository[DocumentModel]):
         )
         return list(result.scalars().all())
 
+    async def claim_unprocessed(self, limit: int = 10) -> list[DocumentModel]:
+        """
+        Atomically mark the oldest pending documents as processing.
+        
+        Pending rows are picked with FOR UPDATE SKIP LOCKED (on PostgreSQL)
+        and updated in the same statement, so concurrent workers never
+        claim the same document.
+        
+        Args:
+            limit: Maximum number of documents to claim
+            
+        Returns:
+            The claimed documents, in processing status
+        """
+        pending = (
+            select(DocumentModel.id)
+            .where(DocumentModel.status == "pending")
+            .order_by(DocumentModel.created_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+            .cte("pending")
+        )
+        result = await self.db.execute(
+            update(DocumentModel)
+            .where(DocumentModel.id.in_(select(pending.c.id)))
+            .values(status="processing", processed_at=None)
+            .returning(DocumentModel)
+            .execution_options(populate_existing=True)
+        )
+        documents = list(result.scalars().all())
+        if documents:
+            self._invalidate_counts()
+        return sorted(documents, key=lambda d: d.created_at)
+
     async def count_by_company(self, company_id: str) -> int:
         """Count documents for a company."""
         result = await self.db.execute(
-            select(func.count())
-            .select_from(DocumentModel)
-            .where(DocumentModel.company_id == company_id)
+            lambda_stmt(
+                lambda: select(func.count())
+                .select_from(DocumentModel)
+                .where(DocumentModel.company_id == company_id)
+            )
+        )
+        return result.scalar_one()
+
+    async def has_documents(self, company_id: str) -> bool:
+        """Check if a company has any documents, stopping at the first match."""
+        result = await self.db.execute(
+            lambda_stmt(
+                lambda: select(exists().where(DocumentModel.company_id == company_id))
+            )
         )
         return result.scalar_one()
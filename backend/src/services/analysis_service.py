@@ -1,27 +1,53 @@
 """Analysis service for running NLP extraction."""
 
-from datetime import datetime
+from collections import Counter
+from collections.abc import AsyncIterator
+from contextlib import asynccontextmanager
+from datetime import timezone
+import asyncio
+import time
+
+from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
 
 from src.models.schemas.requests.analysis import AnalysisRequest
 from src.models.db.analysis import AnalysisModel, InsightModel
 from src.repositories.analysis_repository import (
     AnalysisRepository,
+    EvidenceRepository,
+    INSIGHT_PAGE_KEYS,
     InsightRepository,
     InitiativeRepository,
 )
+from src.config.settings import get_settings
+from src.db.base import generate_uuid
 from src.utils.exceptions import NotFoundError, NLPError
+from src.utils.helpers import utc_now
 from src.config.logging import get_logger
 
 logger = get_logger(__name__)
 
+# Per-chunk progress is only written once it has advanced this much, or
+# this many seconds have passed since the last write
+_PROGRESS_MIN_STEP = 0.01
+_PROGRESS_MAX_INTERVAL_SECONDS = 2.0
+
 
 class AnalysisService:
     """Service for analysis operations."""
 
-    def __init__(self, repository: AnalysisRepository):
+    def __init__(
+        self,
+        repository: AnalysisRepository,
+        session_factory: async_sessionmaker[AsyncSession] | None = None,
+    ):
         self.repository = repository
         self.insight_repo = InsightRepository(repository.db)
         self.initiative_repo = InitiativeRepository(repository.db)
+        if session_factory is None:
+            from src.db.session import AsyncSessionLocal
+            session_factory = AsyncSessionLocal
+        # Sessions for run_analysis, which outlives the request's session
+        self.session_factory = session_factory
 
     async def create_analysis(self, request: AnalysisRequest) -> AnalysisModel:
         """Create a new analysis job."""
@@ -29,8 +55,12 @@ class AnalysisService:
         if not request.force_rerun:
             recent = await self.repository.get_latest_completed(request.company_id)
             if recent and recent.completed_at:
-                # Check if completed within last hour
-                age = datetime.utcnow() - recent.completed_at.replace(tzinfo=None)
+                # Check if completed within last hour (SQLite returns
+                # naive UTC datetimes)
+                completed_at = recent.completed_at
+                if completed_at.tzinfo is None:
+                    completed_at = completed_at.replace(tzinfo=timezone.utc)
+                age = utc_now() - completed_at
                 if age.total_seconds() < 3600:
                     logger.info(f"Recent analysis found for company {request.company_id}")
 
@@ -50,125 +80,228 @@ class AnalysisService:
             raise NotFoundError("Analysis", analysis_id)
         return analysis
 
+    @asynccontextmanager
+    async def _session_scope(self) -> AsyncIterator[AsyncSession]:
+        """Open a short-lived session for one step of run_analysis."""
+        async with self.session_factory() as db:
+            try:
+                yield db
+                await db.commit()
+            except Exception:
+                await db.rollback()
+                raise
+
+    async def _update_progress(
+        self,
+        analysis_id: str,
+        progress: float,
+        status: str | None = None,
+    ) -> None:
+        """Write analysis progress in its own short transaction."""
+        async with self._session_scope() as db:
+            await AnalysisRepository(db).update_progress(analysis_id, progress, status)
+
     async def run_analysis(self, analysis_id: str) -> None:
-        """Run the full analysis pipeline."""
+        """
+        Run the full analysis pipeline.
+        
+        Runs after the request that created the analysis has finished, so
+        it doesn't use the request's session. Each database step opens its
+        own short session instead, and no connection is held while
+        retrieval and LLM calls are in progress.
+        """
         try:
             # Update status
-            await self.repository.update_progress(analysis_id, 0.0, "processing")
-            
-            analysis = await self.repository.get_by_id(analysis_id)
-            if not analysis:
-                return
+            async with self._session_scope() as db:
+                analysis_repo = AnalysisRepository(db)
+                await analysis_repo.update_progress(analysis_id, 0.0, "processing")
 
-            logger.info(f"Starting analysis {analysis_id} for company {analysis.company_id}")
+                analysis = await analysis_repo.get_by_id(analysis_id)
+                if not analysis:
+                    return
+                company_id = analysis.company_id
+                document_ids = analysis.document_ids
+
+            logger.info(f"Starting analysis {analysis_id} for company {company_id}")
 
             # Step 1: Retrieve relevant chunks (20%)
-            await self.repository.update_progress(analysis_id, 0.1, "processing")
+            await self._update_progress(analysis_id, 0.1, "processing")
             
             from src.nlp.retrieval import get_retriever
             retriever = get_retriever()
             chunks = await retriever.retrieve(
-                company_id=analysis.company_id,
-                document_ids=analysis.document_ids,
+                company_id=company_id,
+                document_ids=document_ids,
             )
             
-            await self.repository.update_progress(analysis_id, 0.2)
+            await self._update_progress(analysis_id, 0.2)
 
             # Step 2: Extract initiatives (60%)
             from src.nlp.dspy_programs import get_initiative_extractor
             extractor = get_initiative_extractor()
             
-            raw_insights = []
             total_chunks = len(chunks)
-            
-            for i, chunk in enumerate(chunks):
-                try:
-                    extracted = await extractor.extract(chunk)
-                    raw_insights.extend(extracted)
-                except Exception as e:
-                    logger.warning(f"Failed to extract from chunk {i}: {e}")
-                
-                # Update progress
-                progress = 0.2 + (0.4 * (i + 1) / total_chunks)
-                await self.repository.update_progress(analysis_id, progress)
-
-            await self.repository.update_progress(analysis_id, 0.6)
+            semaphore = asyncio.Semaphore(get_settings().llm_max_concurrency)
+
+            async def extract(i: int, chunk) -> tuple[int, list]:
+                async with semaphore:
+                    try:
+                        return i, await extractor.extract(chunk)
+                    except Exception as e:
+                        logger.warning(f"Failed to extract from chunk {i}: {e}")
+                        return i, []
+
+            # Extract concurrently; progress is written here, not in the
+            # tasks, so sessions aren't opened from many tasks at once
+            extracted_by_chunk: list[list] = [[] for _ in chunks]
+            last_progress, last_progress_at = 0.2, time.monotonic()
+            for done, next_result in enumerate(
+                asyncio.as_completed(
+                    [extract(i, chunk) for i, chunk in enumerate(chunks)]
+                ),
+                start=1,
+            ):
+                i, extracted = await next_result
+                extracted_by_chunk[i] = extracted
+
+                # Update progress, coalescing small steps
+                progress = 0.2 + (0.4 * done / total_chunks)
+                checked_at = time.monotonic()
+                if (
+                    progress - last_progress >= _PROGRESS_MIN_STEP
+                    or checked_at - last_progress_at >= _PROGRESS_MAX_INTERVAL_SECONDS
+                ):
+                    await self._update_progress(analysis_id, progress)
+                    last_progress, last_progress_at = progress, checked_at
+
+            # Keep insights in chunk order
+            raw_insights = [
+                insight for extracted in extracted_by_chunk for insight in extracted
+            ]
+
+            await self._update_progress(analysis_id, 0.6)
 
             # Step 3: Deduplicate and cluster (80%)
             from src.nlp.dspy_programs import get_deduplicator
             deduplicator = get_deduplicator()
             deduplicated = await deduplicator.deduplicate(raw_insights)
             
-            await self.repository.update_progress(analysis_id, 0.8)
+            await self._update_progress(analysis_id, 0.8)
 
             # Step 4: Store results (100%)
-            for insight_data in deduplicated:
-                # Check for existing initiative
-                initiative = await self.initiative_repo.find_similar(
-                    company_id=analysis.company_id,
-                    name=insight_data.get("title", ""),
-                    category=insight_data.get("category", "other"),
-                )
+            # Prefetch candidate initiatives once and match them in memory;
+            # initiatives, insights and evidence are then written in bulk
+            async with self._session_scope() as db:
+                analysis_repo = AnalysisRepository(db)
+                insight_repo = InsightRepository(db)
+                evidence_repo = EvidenceRepository(db)
+                initiative_repo = InitiativeRepository(db)
 
-                if initiative:
-                    # Update existing initiative
-                    initiative.mention_count += 1
-                    initiative.last_mentioned_at = datetime.utcnow()
-                    is_new = False
-                else:
-                    # Create new initiative
-                    initiative = await self.initiative_repo.create(
-                        company_id=analysis.company_id,
-                        name=insight_data.get("title", "Unknown"),
-                        description=insight_data.get("description", ""),
-                        category=insight_data.get("category", "other"),
-                        first_mentioned_at=datetime.utcnow(),
-                        last_mentioned_at=datetime.utcnow(),
-                        first_document_id=insight_data.get("document_id", ""),
-                    )
-                    is_new = True
-
-                # Create insight
-                confidence = insight_data.get("confidence_score", 0.5)
-                insight = await self.insight_repo.create(
-                    company_id=analysis.company_id,
-                    analysis_id=analysis_id,
-                    initiative_id=initiative.id,
-                    title=insight_data.get("title", "Unknown"),
-                    description=insight_data.get("description", ""),
-                    category=insight_data.get("category", "other"),
-                    confidence_score=confidence,
-                    confidence_level="high" if confidence >= 0.8 else "medium" if confidence >= 0.5 else "low",
-                    is_new=is_new,
-                    is_reiterated=not is_new,
+                now = utc_now()
+                existing = await initiative_repo.get_by_categories(
+                    company_id=company_id,
+                    categories=list({
+                        insight_data.get("category", "other")
+                        for insight_data in deduplicated
+                    }),
                 )
+                # Category -> [(initiative ID, lowercased name)]
+                candidates: dict[str, list[tuple[str, str]]] = {}
+                for initiative in existing:
+                    candidates.setdefault(initiative.category, []).append(
+                        (initiative.id, initiative.name.lower())
+                    )
 
-                # Create evidence
-                for evidence_data in insight_data.get("evidence", []):
-                    from src.repositories.analysis_repository import EvidenceRepository
-                    evidence_repo = EvidenceRepository(self.repository.db)
-                    await evidence_repo.create(
-                        insight_id=insight.id,
-                        document_id=evidence_data.get("document_id", ""),
-                        quote=evidence_data.get("quote", ""),
-                        context=evidence_data.get("context"),
-                        page_number=evidence_data.get("page_number"),
-                        section=evidence_data.get("section"),
-                        relevance_score=evidence_data.get("relevance_score", 0.0),
+                mention_counts: Counter[str] = Counter()
+                initiative_rows = []
+                insight_rows = []
+                evidence_rows = []
+                for insight_data in deduplicated:
+                    category = insight_data.get("category", "other")
+
+                    # Check for existing initiative (same match as find_similar)
+                    needle = insight_data.get("title", "")[:50].lower()
+                    initiative_id = next(
+                        (
+                            candidate_id
+                            for candidate_id, name in candidates.get(category, [])
+                            if needle in name
+                        ),
+                        None,
                     )
 
-            # Mark complete
-            analysis.insight_count = len(deduplicated)
-            await self.repository.update_progress(analysis_id, 1.0, "completed")
-            
+                    if initiative_id:
+                        # Update existing initiative
+                        mention_counts[initiative_id] += 1
+                        is_new = False
+                    else:
+                        # Create new initiative
+                        initiative_id = generate_uuid()
+                        name = insight_data.get("title", "Unknown")
+                        initiative_rows.append({
+                            "id": initiative_id,
+                            "company_id": company_id,
+                            "name": name,
+                            "description": insight_data.get("description", ""),
+                            "category": category,
+                            "first_mentioned_at": now,
+                            "last_mentioned_at": now,
+                            "first_document_id": insight_data.get("document_id", ""),
+                        })
+                        # Later insights in this batch can match it
+                        candidates.setdefault(category, []).append(
+                            (initiative_id, name.lower())
+                        )
+                        is_new = True
+
+                    # Create insight
+                    insight_id = generate_uuid()
+                    confidence = insight_data.get("confidence_score", 0.5)
+                    insight_rows.append({
+                        "id": insight_id,
+                        "company_id": company_id,
+                        "analysis_id": analysis_id,
+                        "initiative_id": initiative_id,
+                        "title": insight_data.get("title", "Unknown"),
+                        "description": insight_data.get("description", ""),
+                        "category": insight_data.get("category", "other"),
+                        "confidence_score": confidence,
+                        "confidence_level": "high" if confidence >= 0.8 else "medium" if confidence >= 0.5 else "low",
+                        "is_new": is_new,
+                        "is_reiterated": not is_new,
+                    })
+
+                    # Create evidence
+                    for evidence_data in insight_data.get("evidence", []):
+                        evidence_rows.append({
+                            "insight_id": insight_id,
+                            "document_id": evidence_data.get("document_id", ""),
+                            "quote": evidence_data.get("quote", ""),
+                            "context": evidence_data.get("context"),
+                            "page_number": evidence_data.get("page_number"),
+                            "section": evidence_data.get("section"),
+                            "relevance_score": evidence_data.get("relevance_score", 0.0),
+                        })
+
+                # Parents first, since insights and evidence reference them
+                await initiative_repo.create_many(initiative_rows)
+                # Also counts repeat mentions of the initiatives created above
+                await initiative_repo.add_mentions(mention_counts, now)
+                await insight_repo.create_many(insight_rows)
+                await evidence_repo.create_many(evidence_rows)
+
+                # Mark complete, in the same transaction as the results
+                await analysis_repo.update(analysis_id, insight_count=len(deduplicated))
+                await analysis_repo.update_progress(analysis_id, 1.0, "completed")
+
             logger.info(f"Analysis {analysis_id} completed with {len(deduplicated)} insights")
 
         except Exception as e:
             logger.exception(f"Analysis {analysis_id} failed: {e}")
-            analysis = await self.repository.get_by_id(analysis_id)
-            if analysis:
-                analysis.status = "failed"
-                analysis.error_message = str(e)
+            async with self._session_scope() as db:
+                await AnalysisRepository(db).update(
+                    analysis_id, status="failed", error_message=str(e)
+                )
             raise NLPError(f"Analysis failed: {e}")
 
     async def get_insights(
@@ -178,6 +311,7 @@ class AnalysisService:
         confidence_min: float | None = None,
         offset: int = 0,
         limit: int = 20,
+        cursor: str | None = None,
     ) -> tuple[list[InsightModel], int]:
         """Get insights for a company."""
         return await self.insight_repo.get_by_company(
@@ -186,8 +320,15 @@ class AnalysisService:
             confidence_min=confidence_min,
             offset=offset,
             limit=limit,
+            cursor=cursor,
         )
 
+    def next_insights_cursor(self, insights: list[InsightModel], limit: int) -> str | None:
+        """Get the cursor for the page after a get_insights page, if any."""
+        if len(insights) < limit:
+            return None
+        return self.insight_repo.page_cursor(insights[-1], INSIGHT_PAGE_KEYS)
+
     async def get_insight_detail(self, insight_id: str) -> InsightModel:
         """Get insight with evidence."""
         insight = await self.insight_repo.get_with_evidence(insight_id)
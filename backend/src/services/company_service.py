@@ -1,11 +1,37 @@
 """Company service for business logic."""
 
+from functools import lru_cache
+
+from cachetools import TTLCache
+from sqlalchemy import inspect
+
+from src.config.settings import get_settings
 from src.models.schemas.requests.company import CompanyCreate, CompanyUpdate
 from src.models.db.company import CompanyModel
 from src.repositories.company_repository import CompanyRepository
 from src.utils.exceptions import NotFoundError, ValidationError
 
 
+@lru_cache(maxsize=1)
+def _get_company_cache() -> TTLCache:
+    """Get the process-wide cache of companies, keyed by ("id" | "ticker", value)."""
+    settings = get_settings()
+    return TTLCache(
+        maxsize=settings.company_cache_size,
+        ttl=settings.company_cache_ttl_seconds,
+    )
+
+
+def _detached_copy(company: CompanyModel) -> CompanyModel:
+    """Copy a company's column values into a new instance not tied to a session."""
+    return CompanyModel(
+        **{
+            attr.key: getattr(company, attr.key)
+            for attr in inspect(CompanyModel).column_attrs
+        }
+    )
+
+
 class CompanyService:
     """Service for company operations."""
 
@@ -43,19 +69,57 @@ class CompanyService:
         )
 
     async def get_company(self, company_id: str) -> CompanyModel:
-        """Get company by ID."""
-        company = await self.repository.get_by_id(company_id)
-        if not company:
-            raise NotFoundError("Company", company_id)
+        """
+        Get company by ID.
+        
+        Served from a short-lived in-process cache when possible; cached
+        companies are detached copies without relationships loaded.
+        """
+        key = ("id", company_id)
+        company = self._get_cached(key)
+        if company is None:
+            company = await self.repository.get_by_id(company_id)
+            if not company:
+                raise NotFoundError("Company", company_id)
+            self._cache(company)
         return company
 
     async def get_company_by_ticker(self, ticker: str) -> CompanyModel:
-        """Get company by ticker symbol."""
-        company = await self.repository.get_by_ticker(ticker)
-        if not company:
-            raise NotFoundError("Company", ticker)
+        """
+        Get company by ticker symbol.
+        
+        Served from the same cache as get_company.
+        """
+        key = ("ticker", ticker.upper())
+        company = self._get_cached(key)
+        if company is None:
+            company = await self.repository.get_by_ticker(ticker)
+            if not company:
+                raise NotFoundError("Company", ticker)
+            self._cache(company)
         return company
 
+    def _get_cached(self, key: tuple[str, str]) -> CompanyModel | None:
+        """Get a cached company, if caching is enabled."""
+        if get_settings().company_cache_ttl_seconds <= 0:
+            return None
+        return _get_company_cache().get(key)
+
+    def _cache(self, company: CompanyModel) -> None:
+        """Cache a company under its ID and ticker."""
+        if get_settings().company_cache_ttl_seconds <= 0:
+            return
+        cache = _get_company_cache()
+        copy = _detached_copy(company)
+        cache[("id", company.id)] = copy
+        cache[("ticker", company.ticker)] = copy
+
+    def _invalidate(self, company_id: str) -> None:
+        """Drop a company's cache entries."""
+        cache = _get_company_cache()
+        for key in [key for key, value in cache.items() if value.id == company_id]:
+            cache.pop(key, None)
+
     async def get_company_with_stats(self, company_id: str) -> CompanyModel:
         """Get company with document and analysis counts."""
         company = await self.repository.get_with_stats(company_id)
@@ -69,20 +133,19 @@ class CompanyService:
         data: CompanyUpdate,
     ) -> CompanyModel:
         """Update company information."""
-        company = await self.repository.get_by_id(company_id)
+        # A single UPDATE ... RETURNING, or a plain SELECT if there's
+        # nothing to update
+        company = await self.repository.update(
+            company_id,
+            **data.model_dump(exclude_unset=True),
+        )
         if not company:
             raise NotFoundError("Company", company_id)
-
-        update_data = data.model_dump(exclude_unset=True)
-        if not update_data:
-            return company
-
-        updated = await self.repository.update(company_id, **update_data)
-        return updated
+        self._invalidate(company_id)
+        return company
 
     async def delete_company(self, company_id: str) -> None:
         """Delete a company and all associated data."""
-        if not await self.repository.exists(company_id):
+        if not await self.repository.delete(company_id):
             raise NotFoundError("Company", company_id)
-        
-        await self.repository.delete(company_id)
+        self._invalidate(company_id)
@@ -1,9 +1,11 @@
 """Document service for business logic."""
 
 from datetime import datetime
+from typing import AsyncIterator
+import hashlib
 
 from src.models.db.document import DocumentModel
-from src.repositories.document_repository import DocumentRepository
+from src.repositories.document_repository import DocumentRepository, LIST_PAGE_KEYS
 from src.storage.base import BaseStorage
 from src.utils.exceptions import NotFoundError, ValidationError, DocumentProcessingError
 from src.utils.helpers import compute_file_hash, sanitize_filename
@@ -23,6 +25,7 @@ class DocumentService:
         document_type: str | None = None,
         offset: int = 0,
         limit: int = 20,
+        cursor: str | None = None,
     ) -> tuple[list[DocumentModel], int]:
         """List documents with optional filtering."""
         return await self.repository.list_all(
@@ -30,8 +33,15 @@ class DocumentService:
             document_type=document_type,
             offset=offset,
             limit=limit,
+            cursor=cursor,
         )
 
+    def next_cursor(self, documents: list[DocumentModel], limit: int) -> str | None:
+        """Get the cursor for the page after a list_documents page, if any."""
+        if len(documents) < limit:
+            return None
+        return self.repository.page_cursor(documents[-1], LIST_PAGE_KEYS)
+
     async def upload_document(
         self,
         company_id: str,
@@ -49,9 +59,8 @@ class DocumentService:
         # Compute hash for deduplication
         content_hash = compute_file_hash(content)
         
-        # Check for duplicate
-        existing = await self.repository.get_by_hash(content_hash)
-        if existing and existing.company_id == company_id:
+        # Check for duplicate before writing to storage
+        if await self.repository.get_by_hash_for_company(content_hash, company_id):
             raise ValidationError(
                 "This document has already been uploaded",
                 field="file",
@@ -72,6 +81,113 @@ class DocumentService:
             company_id=company_id,
         )
 
+        return await self._create_record(
+            company_id=company_id,
+            filename=safe_filename,
+            file_type=file_type,
+            file_size=len(content),
+            storage_path=storage_path,
+            content_hash=content_hash,
+            document_type=document_type,
+            title=title,
+            date=date,
+        )
+
+    async def upload_document_stream(
+        self,
+        company_id: str,
+        filename: str,
+        chunks: AsyncIterator[bytes],
+        max_size: int | None = None,
+        document_type: str | None = None,
+        title: str | None = None,
+        date: str | None = None,
+    ) -> DocumentModel:
+        """
+        Upload and store a new document from a stream of chunks.
+        
+        The content is hashed and measured while it is written to storage,
+        so the whole file is never held in memory. Duplicates are only
+        known after the write, so their stored copy is removed.
+        
+        Args:
+            company_id: Company the document belongs to
+            filename: Original filename
+            chunks: File content in chunks
+            max_size: Maximum file size in bytes
+            document_type: Optional type classification
+            title: Optional title (defaults to the filename)
+            date: Optional document date (YYYY-MM-DD)
+            
+        Returns:
+            The created document record
+        """
+        # Sanitize filename
+        safe_filename = sanitize_filename(filename)
+
+        # Determine file type
+        file_type = get_document_type(safe_filename)
+        if not file_type:
+            raise ValidationError(
+                "Unsupported file type",
+                field="file",
+            )
+
+        hasher = hashlib.sha256()
+        file_size = 0
+
+        async def hashed_chunks() -> AsyncIterator[bytes]:
+            nonlocal file_size
+            async for chunk in chunks:
+                file_size += len(chunk)
+                if max_size is not None and file_size > max_size:
+                    raise ValidationError(
+                        f"File too large. Maximum size: {max_size // (1024 * 1024)}MB",
+                        field="file",
+                    )
+                hasher.update(chunk)
+                yield chunk
+
+        # Store file, computing the hash for deduplication on the way
+        storage_path = await self.storage.save_stream(
+            hashed_chunks(),
+            filename=safe_filename,
+            company_id=company_id,
+        )
+        content_hash = hasher.hexdigest()
+
+        # Duplicates are detected by the insert
+        return await self._create_record(
+            company_id=company_id,
+            filename=safe_filename,
+            file_type=file_type,
+            file_size=file_size,
+            storage_path=storage_path,
+            content_hash=content_hash,
+            document_type=document_type,
+            title=title,
+            date=date,
+        )
+
+    async def _create_record(
+        self,
+        company_id: str,
+        filename: str,
+        file_type: str,
+        file_size: int,
+        storage_path: str,
+        content_hash: str,
+        document_type: str | None,
+        title: str | None,
+        date: str | None,
+    ) -> DocumentModel:
+        """
+        Create the database record for a stored upload.
+        
+        If the company already has a document with this content (e.g. a
+        concurrent upload), the stored file is deleted and a
+        ValidationError raised.
+        """
         # Parse date if provided
         document_date = None
         if date:
@@ -81,18 +197,24 @@ class DocumentService:
                 pass
 
         # Create database record
-        document = await self.repository.create(
+        document = await self.repository.create_if_new(
             company_id=company_id,
-            filename=safe_filename,
+            filename=filename,
             file_type=file_type,
-            file_size=len(content),
+            file_size=file_size,
             storage_path=storage_path,
             content_hash=content_hash,
-            title=title or safe_filename,
+            title=title or filename,
             document_type=document_type,
             document_date=document_date,
             status="pending",
         )
+        if document is None:
+            await self.storage.delete(storage_path)
+            raise ValidationError(
+                "This document has already been uploaded",
+                field="file",
+            )
 
         return document
 
@@ -129,44 +251,33 @@ class DocumentService:
             content = await self.storage.read(document.storage_path)
             
             # Parse document
-            from src.nlp.ingestion import get_parser
-            parser = get_parser(document.file_type)
-            parsed = await parser.parse(content)
+            from src.nlp.ingestion import DocumentParser
+            parsed = await DocumentParser().parse(content, document.filename)
             
             # Update document with extracted info
             await self.repository.update(
                 document_id,
                 extracted_text=parsed.text,
-                page_count=parsed.page_count,
+                page_count=parsed.metadata.get("page_count"),
                 word_count=len(parsed.text.split()),
             )
 
-            # Chunk the text
-            from src.nlp.chunking import get_chunker
-            chunker = get_chunker()
-            chunks = await chunker.chunk(
-                text=parsed.text,
-                metadata={
-                    "document_id": document_id,
-                    "company_id": document.company_id,
-                    "filename": document.filename,
-                }
-            )
-
-            # Index chunks in vector store
+            # Chunk and index in one pass: chunks are embedded and written
+            # in batches as the chunker yields them
+            from src.nlp.chunking import StructuralChunker
             from src.nlp.indexing import get_index_manager
-            index_manager = get_index_manager()
-            await index_manager.index_chunks(
+            chunk_count = await get_index_manager().index_chunk_stream(
+                StructuralChunker().chunk_document(parsed, document_id),
                 company_id=document.company_id,
                 document_id=document_id,
-                chunks=chunks,
+                metadata={"filename": document.filename},
             )
 
             # Update status
             document = await self.repository.update_status(
                 document_id,
                 "completed",
-                chunk_count=len(chunks),
+                chunk_count=chunk_count,
             )
 
             return document
@@ -1,7 +1,7 @@
 """Base storage interface."""
 
 from abc import ABC, abstractmethod
-from typing import BinaryIO
+from typing import AsyncIterator, BinaryIO
 
 
 class BaseStorage(ABC):
@@ -27,6 +27,30 @@ class BaseStorage(ABC):
         """
         pass
 
+    async def save_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        company_id: str,
+    ) -> str:
+        """
+        Save file content from an async stream of chunks.
+        
+        Backends that can write incrementally override this; the default
+        collects the chunks and calls save. If the stream raises, nothing
+        is left in storage.
+        
+        Args:
+            chunks: File content in chunks
+            filename: Original filename
+            company_id: Company ID for organizing files
+            
+        Returns:
+            Storage path/key for the saved file
+        """
+        content = b"".join([chunk async for chunk in chunks])
+        return await self.save(content, filename, company_id)
+
     @abstractmethod
     async def read(self, path: str) -> bytes:
         """
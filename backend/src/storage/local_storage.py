@@ -4,6 +4,7 @@ import os
 import aiofiles
 from pathlib import Path
 from datetime import datetime
+from typing import AsyncIterator
 
 from src.storage.base import BaseStorage
 from src.utils.helpers import generate_uuid
@@ -16,13 +17,8 @@ class LocalStorage(BaseStorage):
         self.base_path = Path(base_path)
         self.base_path.mkdir(parents=True, exist_ok=True)
 
-    async def save(
-        self,
-        content: bytes,
-        filename: str,
-        company_id: str,
-    ) -> str:
-        """Save file to local filesystem."""
+    def _new_file_path(self, filename: str, company_id: str) -> Path:
+        """Get a unique path for a new file in the company's directory."""
         # Create company directory
         company_dir = self.base_path / company_id
         company_dir.mkdir(parents=True, exist_ok=True)
@@ -34,7 +30,16 @@ class LocalStorage(BaseStorage):
         new_filename = f"{timestamp}_{unique_id}{ext}"
 
         # Full path
-        file_path = company_dir / new_filename
+        return company_dir / new_filename
+
+    async def save(
+        self,
+        content: bytes,
+        filename: str,
+        company_id: str,
+    ) -> str:
+        """Save file to local filesystem."""
+        file_path = self._new_file_path(filename, company_id)
 
         # Write file
         async with aiofiles.open(file_path, "wb") as f:
@@ -43,6 +48,27 @@ class LocalStorage(BaseStorage):
         # Return relative path
         return str(file_path.relative_to(self.base_path))
 
+    async def save_stream(
+        self,
+        chunks: AsyncIterator[bytes],
+        filename: str,
+        company_id: str,
+    ) -> str:
+        """Save file to local filesystem one chunk at a time."""
+        file_path = self._new_file_path(filename, company_id)
+
+        try:
+            async with aiofiles.open(file_path, "wb") as f:
+                async for chunk in chunks:
+                    await f.write(chunk)
+        except BaseException:
+            # Don't leave a partial file behind
+            file_path.unlink(missing_ok=True)
+            raise
+
+        # Return relative path
+        return str(file_path.relative_to(self.base_path))
+
     async def read(self, path: str) -> bytes:
         """Read file from local filesystem."""
         file_path = self.base_path / path
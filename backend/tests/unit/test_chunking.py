@@ -108,7 +108,7 @@ class TestStructuralChunker:
             ],
         )
         
-        chunks = await chunker.chunk_document(doc, "doc_789")
+        chunks = await chunker.chunk_document_list(doc, "doc_789")
         
         assert len(chunks) == 2
         assert any(c.metadata.get("page_number") == 1 for c in chunks)
@@ -126,7 +126,7 @@ class TestStructuralChunker:
             ],
         )
         
-        chunks = await chunker.chunk_document(doc, "doc_101")
+        chunks = await chunker.chunk_document_list(doc, "doc_101")
         
         assert len(chunks) >= 2
 
@@ -141,11 +141,43 @@ class TestStructuralChunker:
             ],
         )
         
-        chunks = await chunker.chunk_document(doc, "doc_102")
+        chunks = await chunker.chunk_document_list(doc, "doc_102")
         
         table_chunks = [c for c in chunks if c.metadata.get("chunk_type") == "table"]
         assert len(table_chunks) == 1
 
+    @pytest.mark.asyncio
+    async def test_chunk_document_streams_chunks(self, chunker):
+        """Test that chunk_document yields chunks incrementally."""
+        doc = ParsedDocument(
+            text="All the text",
+            metadata={"filename": "report.pdf"},
+            pages=[
+                {"page_number": 1, "text": "Page 1 content"},
+                {"page_number": 2, "text": "Page 2 content"},
+            ],
+        )
+
+        stream = chunker.chunk_document(doc, "doc_103")
+        first = await stream.__anext__()
+
+        assert isinstance(first, Chunk)
+        assert first.metadata.get("page_number") == 1
+        assert [c.id async for c in stream] == ["doc_103_page_2"]
+
+    def test_chunk_text_skips_blank_paragraphs(self):
+        """Test that runs of blank lines do not produce empty paragraphs."""
+        chunker = StructuralChunker(max_chunk_size=20)
+
+        chunks = chunker._chunk_text(
+            "First paragraph\n\n\n\nSecond paragraph",
+            {},
+            "doc_104",
+            {"document_id": "doc_104"},
+        )
+
+        assert [c.text for c in chunks] == ["First paragraph", "Second paragraph"]
+
     def test_table_to_text(self, chunker):
         """Test table conversion to markdown."""
         table_data = [
@@ -0,0 +1,36 @@
+"""Unit tests for the DSPy result cache."""
+
+import pytest
+
+from src.nlp.dspy_programs.cache import DiskCacheBackend
+
+
+class TestDiskCacheBackend:
+    """Tests for DiskCacheBackend."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create a cache in a temporary directory."""
+        return DiskCacheBackend(str(tmp_path / "dspy"), size_limit=10 * 1024 * 1024)
+
+    def test_key_is_stable_and_input_sensitive(self, cache):
+        """Test that keys depend only on signature and inputs."""
+        key = cache.make_key("Sig/v1", {"a": "x", "b": "y"})
+
+        assert key == cache.make_key("Sig/v1", {"b": "y", "a": "x"})
+        assert key != cache.make_key("Sig/v1", {"a": "x", "b": "z"})
+        assert key != cache.make_key("Sig/v2", {"a": "x", "b": "y"})
+
+    def test_get_set_and_stats(self, cache):
+        """Test round-trip storage and hit/miss accounting."""
+        key = cache.make_key("Sig/v1", {"a": "x"})
+
+        assert cache.get(key) is None
+        cache.set(key, {"primary_category": "product"})
+        assert cache.get(key) == {"primary_category": "product"}
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["entries"] == 1
@@ -4,11 +4,14 @@ from unittest.mock import MagicMock, patch
 
 import pytest
 
-from src.nlp.dspy_programs.deduplicator import Deduplicator
+from src.nlp.dspy_programs.deduplicator import InitiativeDeduplicator
 from src.nlp.dspy_programs.initiative_extractor import (
     ExtractedInitiative,
     InitiativeExtractor,
 )
+from src.nlp.dspy_programs.insight_classifier import InsightClassifier
+from src.nlp.dspy_programs.cache import DiskCacheBackend
+from src.nlp.dspy_programs.question_answerer import QuestionAnswerer, _match_citations
 
 # Sample test data for regression tests
 SAMPLE_TRANSCRIPT = """
@@ -88,10 +91,10 @@ class TestInitiativeExtractor:
     @pytest.fixture
     def mock_extractor(self):
         """Create mock extractor with mocked LLM."""
-        with patch("src.nlp.dspy_programs.base.configure_dspy"):
+        with patch("src.nlp.dspy_programs.initiative_extractor.configure_dspy"):
             extractor = InitiativeExtractor()
             extractor.extractor = MagicMock()
-            return extractor
+            yield extractor
 
     def test_extractor_initialization(self, mock_extractor):
         """Test extractor initializes properly."""
@@ -134,6 +137,194 @@ class TestInitiativeExtractor:
         assert isinstance(results[0], ExtractedInitiative)
         assert results[0].name == "AI Platform Launch"
 
+    @pytest.mark.asyncio
+    async def test_extract_from_chunks_attaches_source(self, mock_extractor):
+        """Test that source chunk info is attached to each initiative."""
+        mock_extractor.extractor.return_value = MagicMock(
+            initiatives=[
+                {
+                    "name": "AI Platform Launch",
+                    "description": "New AI platform for enterprises",
+                    "category": "product",
+                    "evidence_quote": "launching our new AI platform",
+                }
+            ]
+        )
+
+        results = await mock_extractor.extract_from_chunks(
+            chunks=[{"id": "doc_1_chunk_0", "text": SAMPLE_TRANSCRIPT, "metadata": {"page": 1}}],
+            company_name="Test Company",
+        )
+
+        assert len(results) == 1
+        assert results[0].source_chunk_id == "doc_1_chunk_0"
+        assert results[0].source_metadata == {"page": 1}
+
+
+class TestInsightClassifier:
+    """Tests for InsightClassifier DSPy program."""
+
+    @pytest.fixture
+    def mock_classifier(self):
+        """Create classifier with mocked LLM and the result cache disabled."""
+        with (
+            patch("src.nlp.dspy_programs.insight_classifier.configure_dspy"),
+            patch("src.nlp.dspy_programs.insight_classifier.get_dspy_cache", return_value=None),
+        ):
+            classifier = InsightClassifier()
+            classifier.classifier = MagicMock()
+            yield classifier
+
+    @pytest.mark.asyncio
+    async def test_classify_batch_preserves_order_and_defaults_failures(self, mock_classifier):
+        """Test batch classification keeps input order and defaults failed items."""
+
+        def prediction(reasoning):
+            return MagicMock(
+                primary_category="Product",
+                secondary_categories=[],
+                importance_score=8,
+                sentiment="positive",
+                actionability="immediate",
+                reasoning=reasoning,
+            )
+
+        # Failed examples come back from DSPy's batch API as None
+        mock_classifier.classifier.batch.return_value = [
+            prediction("first"),
+            None,
+            prediction("third"),
+        ]
+
+        texts = [
+            "Launching a new cloud product",
+            "Restructuring the sales team",
+            "Expanding into European markets",
+        ]
+        results = await mock_classifier.classify_batch([{"text": t} for t in texts])
+
+        assert [r["text"] for r in results] == texts
+        assert results[0]["primary_category"] == "product"
+        assert results[1]["reasoning"] == "Classification failed"
+        assert results[2]["reasoning"] == "third"
+
+    @pytest.mark.asyncio
+    async def test_classify_batch_classifies_duplicates_once(self, mock_classifier):
+        """Test repeated insight texts share one LLM call."""
+        mock_classifier.classifier.batch.return_value = [
+            MagicMock(
+                primary_category="market",
+                secondary_categories=["strategy"],
+                importance_score=7,
+                sentiment="positive",
+                actionability="long term",
+                reasoning="expansion",
+            )
+        ]
+
+        insight = {"text": "Expanding into European markets", "context": "Q4 call"}
+        results = await mock_classifier.classify_batch([dict(insight), dict(insight)])
+
+        examples = mock_classifier.classifier.batch.call_args.args[0]
+        assert len(examples) == 1
+        assert [r["primary_category"] for r in results] == ["market", "market"]
+        assert results[0]["secondary_categories"] is not results[1]["secondary_categories"]
+
+    @pytest.mark.asyncio
+    async def test_classify_batch_skips_short_inputs(self, mock_classifier):
+        """Test empty and very short insights are not sent to the LLM."""
+        results = await mock_classifier.classify_batch([{"text": ""}, {"description": "n/a"}])
+
+        mock_classifier.classifier.batch.assert_not_called()
+        assert all(r["primary_category"] == "strategy" for r in results)
+        assert all(r["importance_score"] == 5.0 for r in results)
+
+    def test_normalize_actionability_variations(self, mock_classifier):
+        """Test free-form actionability labels map to valid values."""
+        assert mock_classifier._normalize_actionability("Short Term") == "short_term"
+        assert mock_classifier._normalize_actionability("long-term goal") == "long_term"
+        assert mock_classifier._normalize_actionability("act now") == "immediate"
+        assert mock_classifier._normalize_actionability("FYI") == "informational"
+
+    def test_normalize_actionability_keyword_priority(self, mock_classifier):
+        """Test mixed labels resolve by keyword priority, not position."""
+        assert mock_classifier._normalize_actionability("long-term, but act now") == "immediate"
+        assert mock_classifier._normalize_actionability("long or short term") == "short_term"
+        assert mock_classifier._normalize_actionability("short term, immediate") == "immediate"
+
+
+class TestQuestionAnswerer:
+    """Tests for QuestionAnswerer DSPy program."""
+
+    @pytest.fixture
+    def cache(self, tmp_path):
+        """Create an on-disk result cache in a temporary directory."""
+        return DiskCacheBackend(str(tmp_path), size_limit=2**20)
+
+    @pytest.fixture
+    def mock_answerer(self, cache):
+        """Create answerer with mocked LLM and a temporary result cache."""
+        with (
+            patch("src.nlp.dspy_programs.question_answerer.configure_dspy"),
+            patch("src.nlp.dspy_programs.question_answerer.get_dspy_cache", return_value=cache),
+        ):
+            answerer = QuestionAnswerer()
+            answerer.answerer = MagicMock()
+            yield answerer
+
+    @staticmethod
+    def _prediction(answer: str) -> MagicMock:
+        return MagicMock(answer=answer, citations=[], confidence=0.8, related_topics=[])
+
+    def test_answer_batch_falls_back_when_batch_fails(self, mock_answerer):
+        """Test that a failed batch is answered question by question."""
+        mock_answerer.answerer.batch.side_effect = Exception("Execution cancelled")
+        mock_answerer.answerer.side_effect = lambda **inputs: self._prediction(inputs["question"])
+
+        answers = mock_answerer.answer_batch(["q1", "q2"], ["c1", "c2"], "Acme")
+
+        assert [a["answer"] for a in answers] == ["q1", "q2"]
+
+    def test_answer_batch_never_cancels_on_errors(self, mock_answerer):
+        """Test that the batch tolerates every example failing."""
+        mock_answerer.answerer.batch.return_value = [None, None]
+        mock_answerer.answerer.side_effect = lambda **inputs: self._prediction(inputs["question"])
+
+        mock_answerer.answer_batch(["q1", "q2"], ["c1", "c2"], "Acme")
+
+        assert mock_answerer.answerer.batch.call_args.kwargs["max_errors"] > 2
+
+    def test_answer_batch_uses_result_cache(self, mock_answerer):
+        """Test that batch answers are cached and cached questions skip the LLM."""
+        mock_answerer.answerer.batch.return_value = [self._prediction("a1")]
+        mock_answerer.answer_batch(["q1"], ["c1"], "Acme")
+
+        mock_answerer.answerer.batch.return_value = [self._prediction("a2")]
+        answers = mock_answerer.answer_batch(["q1", "q2"], ["c1", "c2"], "Acme")
+
+        assert [a["answer"] for a in answers] == ["a1", "a2"]
+        examples = mock_answerer.answerer.batch.call_args.args[0]
+        assert [e.question for e in examples] == ["q2"]
+
+
+class TestCitationMatching:
+    """Tests for mapping answer citations to retrieved sources."""
+
+    def test_citations_attributed_per_source(self):
+        """Test each citation maps only to the sources containing it."""
+        texts = [
+            "Cloud revenue grew 45% year-over-year.",
+            "We are expanding into Europe. Cloud revenue grew 45% year-over-year.",
+            "Operating margins improved by 200 basis points.",
+        ]
+
+        matches = _match_citations(
+            ["Cloud revenue grew 45%", "margins improved", "not in any source", ""],
+            texts,
+        )
+
+        assert matches == [[0, 1], [2], [], []]
+
 
 class TestDeduplicator:
     """Tests for Deduplicator DSPy program."""
@@ -171,9 +362,9 @@ class TestDeduplicator:
     @pytest.fixture
     def mock_deduplicator(self):
         """Create mock deduplicator."""
-        with patch("src.nlp.dspy_programs.base.configure_dspy"):
-            dedup = Deduplicator()
-            return dedup
+        with patch("src.nlp.dspy_programs.deduplicator.configure_dspy"):
+            dedup = InitiativeDeduplicator()
+            yield dedup
 
     def test_deduplicator_initialization(self, mock_deduplicator):
         """Test deduplicator initializes properly."""
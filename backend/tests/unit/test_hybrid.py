@@ -0,0 +1,82 @@
+"""Unit tests for the hybrid retriever."""
+
+from unittest.mock import AsyncMock, MagicMock, patch
+
+import pytest
+
+from src.nlp.retrieval.hybrid import HybridRetriever
+
+
+def _node(chunk_id: str, text: str, score: float) -> MagicMock:
+    """A retrieved node without an embedding, as vector search returns it."""
+    node = MagicMock()
+    node.node.id_ = chunk_id
+    node.node.get_content.return_value = text
+    node.node.metadata = {"document_id": chunk_id.split("_chunk_")[0]}
+    node.node.embedding = None
+    node.score = score
+    return node
+
+
+class TestHybridRetrieverReranking:
+    """Tests for reranking inside HybridRetriever."""
+
+    @pytest.fixture
+    def index_manager(self):
+        manager = MagicMock()
+        manager.get_or_create_index = AsyncMock()
+        manager.get_index_version.return_value = 0
+        manager.get_chunk_embeddings = AsyncMock(return_value={
+            "doc1_chunk_0": [0.0, 1.0],
+            "doc1_chunk_1": [1.0, 0.0],
+        })
+        return manager
+
+    @pytest.fixture
+    def retriever(self, index_manager):
+        retriever = HybridRetriever(index_manager, use_reranker=True)
+        retriever.cache = None
+        retriever.reranker.model_name = ""
+        vector_retriever = MagicMock()
+        vector_retriever.retrieve.return_value = [
+            _node("doc1_chunk_0", "Operating margins held steady.", 0.9),
+            _node("doc1_chunk_1", "Headcount was flat this quarter.", 0.5),
+        ]
+        with (
+            patch.object(HybridRetriever, "_build_retriever", return_value=vector_retriever),
+            patch.object(HybridRetriever, "_embed_queries", return_value=[[1.0, 0.0]]),
+        ):
+            yield retriever
+
+    @pytest.mark.asyncio
+    async def test_heuristic_rerank_scores_by_fetched_embeddings(
+        self, retriever, index_manager
+    ):
+        """Test that candidate embeddings are fetched and used for cosine scores."""
+        results = await retriever.retrieve("cloud growth", company_id="comp1", top_k=2)
+
+        index_manager.get_chunk_embeddings.assert_awaited_once()
+        company_id, chunk_ids = index_manager.get_chunk_embeddings.await_args.args
+        assert company_id == "comp1"
+        assert sorted(chunk_ids) == ["doc1_chunk_0", "doc1_chunk_1"]
+        assert [r.chunk_id for r in results] == ["doc1_chunk_1", "doc1_chunk_0"]
+        assert results[0].score == pytest.approx(1.0)
+
+
+class TestHybridRetrieverCacheScope:
+    """Tests for the semantic cache scope of HybridRetriever."""
+
+    def test_scope_depends_on_reranking(self):
+        """Test that reranked and unreranked results are cached apart."""
+        index_manager = MagicMock()
+        index_manager.get_index_version.return_value = 0
+        args = ("comp1", 10, None, None, 0.0)
+
+        plain = HybridRetriever(index_manager, use_reranker=False)
+        reranking = HybridRetriever(index_manager, use_reranker=True)
+        reranking.reranker.model_name = "model-a"
+        other_model = HybridRetriever(index_manager, use_reranker=True)
+        other_model.reranker.model_name = "model-b"
+
+        scopes = {r._cache_scope(*args) for r in (plain, reranking, other_model)}
+        assert len(scopes) == 3
@@ -0,0 +1,35 @@
+"""Unit tests for the index handle cache."""
+
+from src.nlp.indexing.cache import HandleCache
+
+
+class TestHandleCache:
+    """Tests for HandleCache."""
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used handle is evicted."""
+        cache = HandleCache(maxsize=2, name="index")
+        cache["a"] = 1
+        cache["b"] = 2
+
+        # Touch "a" so "b" becomes least recently used
+        assert cache.get("a") == 1
+        cache["c"] = 3
+
+        assert "a" in cache
+        assert "b" not in cache
+        assert "c" in cache
+
+    def test_stats_track_hits_and_misses(self):
+        """Test hit/miss accounting."""
+        cache = HandleCache(maxsize=2, name="collection")
+        cache["a"] = 1
+
+        cache.get("a")
+        cache.get("missing")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+        assert stats["size"] == 1
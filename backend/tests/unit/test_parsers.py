@@ -28,19 +28,17 @@ class TestTextParser:
         """Test that parser does not support .pdf files."""
         assert parser.supports("document.pdf") is False
 
-    @pytest.mark.asyncio
-    async def test_parse_simple_text(self, parser):
+    def test_parse_simple_text(self, parser):
         """Test parsing simple text content."""
         content = b"Hello, World!\nThis is a test."
-        result = await parser.parse(content, "test.txt")
+        result = parser.parse(content, "test.txt")
 
         assert isinstance(result, ParsedDocument)
         assert "Hello, World!" in result.text
         assert result.metadata["filename"] == "test.txt"
         assert result.metadata["line_count"] == 2
 
-    @pytest.mark.asyncio
-    async def test_parse_markdown_sections(self, parser):
+    def test_parse_markdown_sections(self, parser):
         """Test that markdown sections are extracted."""
         content = b"""# Heading 1
 Some content under heading 1.
@@ -48,19 +46,26 @@ Some content under heading 1.
 ## Heading 2
 Content under heading 2.
 """
-        result = await parser.parse(content, "test.md")
+        result = parser.parse(content, "test.md")
 
         assert result.sections is not None
         assert len(result.sections) >= 2
         assert result.sections[0]["heading"] == "Heading 1"
         assert result.sections[0]["heading_level"] == 1
 
-    @pytest.mark.asyncio
-    async def test_handles_different_encodings(self, parser):
+    def test_parse_markdown_sections_crlf(self, parser):
+        """Test that headings in CRLF markdown have no trailing carriage return."""
+        content = b"# Intro\r\nFirst line.\r\n## Next  \r\nSecond line.\r\n"
+        result = parser.parse(content, "test.md")
+
+        assert [s["heading"] for s in result.sections] == ["Intro", "Next"]
+        assert [s["heading_level"] for s in result.sections] == [1, 2]
+
+    def test_handles_different_encodings(self, parser):
         """Test handling of different text encodings."""
         # UTF-8 content with special characters
         content = "Café résumé naïve".encode()
-        result = await parser.parse(content, "test.txt")
+        result = parser.parse(content, "test.txt")
         assert "Café" in result.text
 
 
@@ -100,6 +105,34 @@ class TestTranscriptParser:
         assert result is not None
         assert result["speaker"] == "Operator"
 
+    @pytest.mark.parametrize(
+        "newline,space",
+        [("\n", " "), ("\r\n", " "), ("\n", "\xa0")],
+        ids=["lf", "crlf", "nbsp"],
+    )
+    def test_parse_sections(self, parser, newline, space):
+        """Test splitting a transcript body into speaker sections."""
+        lines = [
+            "Operator:",
+            "Welcome to the Q3 2024 call.",
+            f"John Smith - CEO:{space}",
+            "Revenue grew 12% this quarter.",
+            f"Jane{space}Doe (CFO):",
+            "Margins improved by 40 basis points.",
+        ]
+        sections = parser._parse_sections(newline.join(lines) + newline)
+
+        assert [(s["heading"], s["speaker_role"]) for s in sections] == [
+            ("Operator", "Operator"),
+            ("John Smith", "CEO"),
+            ("Jane Doe", "CFO"),
+        ]
+        assert [s["content"] for s in sections] == [
+            "Welcome to the Q3 2024 call.",
+            "Revenue grew 12% this quarter.",
+            "Margins improved by 40 basis points.",
+        ]
+
 
 class TestPptxParser:
     """Tests for PptxParser."""
@@ -127,6 +160,32 @@ class TestPptxParser:
         assert parser.supports("document.docx") is False
 
 
+class TestPdfPool:
+    """Tests for the shared PDF worker pool."""
+
+    def test_pool_is_shared_and_not_forked(self):
+        """Test that the pool is reused and its workers are not forked."""
+        from src.nlp.ingestion.pdf_parser import get_pdf_pool, shutdown_pdf_pool
+
+        try:
+            pool = get_pdf_pool()
+            assert get_pdf_pool() is pool
+            assert pool._mp_context.get_start_method() != "fork"
+        finally:
+            shutdown_pdf_pool()
+
+    def test_shutdown_starts_a_new_pool_next_time(self):
+        """Test that a pool is recreated after shutdown."""
+        from src.nlp.ingestion.pdf_parser import get_pdf_pool, shutdown_pdf_pool
+
+        try:
+            pool = get_pdf_pool()
+            shutdown_pdf_pool()
+            assert get_pdf_pool() is not pool
+        finally:
+            shutdown_pdf_pool()
+
+
 class TestDocumentParser:
     """Tests for main DocumentParser."""
 
@@ -151,6 +210,14 @@ class TestDocumentParser:
         assert isinstance(result, ParsedDocument)
         assert "Simple text content" in result.text
 
+    @pytest.mark.asyncio
+    async def test_parse_many_preserves_order(self, parser):
+        """Test that batch parsing returns results in input order."""
+        items = [(f"Document number {i}".encode(), f"doc{i}.txt") for i in range(5)]
+        results = await parser.parse_many(items)
+
+        assert [r.text for r in results] == [f"Document number {i}" for i in range(5)]
+
     @pytest.mark.asyncio
     async def test_raises_for_unsupported_type(self, parser):
         """Test that unsupported types raise ValueError."""
@@ -0,0 +1,117 @@
+"""Unit tests for the reranker."""
+
+import asyncio
+import threading
+
+import pytest
+
+from src.nlp.retrieval.hybrid import RetrievalResult
+from src.nlp.retrieval.reranker import Reranker, _PredictBatcher
+
+
+def _result(chunk_id: str, text: str, score: float, **metadata) -> RetrievalResult:
+    return RetrievalResult(chunk_id=chunk_id, text=text, score=score, metadata=metadata)
+
+
+class TestHeuristicReranker:
+    """Tests for Reranker without a cross-encoder model."""
+
+    @pytest.fixture
+    def reranker(self):
+        return Reranker(model_name="")
+
+    @pytest.mark.asyncio
+    async def test_boosts_exact_phrase_match(self, reranker):
+        """Test that an exact phrase match outranks a higher vector score."""
+        results = [
+            _result("a", "Revenue grew in the cloud segment.", 0.80),
+            _result("b", "Cloud revenue growth accelerated.", 0.75),
+        ]
+
+        reranked = await reranker.rerank("cloud revenue", results, top_k=2)
+
+        assert [r.chunk_id for r in reranked] == ["b", "a"]
+        assert reranked[0].score == pytest.approx(0.75 + 0.2 + 0.1)
+
+    @pytest.mark.asyncio
+    async def test_boosts_executive_speakers(self, reranker):
+        """Test that executive speakers get a boost."""
+        results = [
+            _result("a", "We expect margins to expand.", 0.50, speaker_role="Analyst"),
+            _result("b", "We expect margins to expand.", 0.45, speaker_role="CFO"),
+        ]
+
+        reranked = await reranker.rerank("guidance", results, top_k=1)
+
+        assert [r.chunk_id for r in reranked] == ["b"]
+
+    @pytest.mark.asyncio
+    async def test_uses_embedding_similarity_when_available(self, reranker):
+        """Test that chunk embeddings replace the retrieval score."""
+        results = [
+            _result("a", "Unrelated text.", 0.90),
+            _result("b", "Other text.", 0.10),
+        ]
+        results[0].embedding = [0.0, 1.0]
+        results[1].embedding = [1.0, 0.0]
+
+        reranked = await reranker.rerank(
+            "guidance", results, top_k=2, query_embedding=[2.0, 0.0]
+        )
+
+        assert [r.chunk_id for r in reranked] == ["b", "a"]
+        assert reranked[0].score == pytest.approx(1.0)
+
+
+class _BlockingModel:
+    """Cross-encoder stand-in whose predict waits until released."""
+
+    def __init__(self, fail: bool = False):
+        self.release = threading.Event()
+        self.fail = fail
+
+    def predict(self, pairs, **kwargs):
+        self.release.wait(timeout=5)
+        if self.fail:
+            raise RuntimeError("model failed")
+        return [float(len(document)) for _, document in pairs]
+
+
+class TestPredictBatcher:
+    """Tests for micro-batching cross-encoder predict calls."""
+
+    @pytest.mark.asyncio
+    async def test_cancelled_caller_does_not_strand_batch(self):
+        """Test that cancelling the caller that filled a batch still scores the rest."""
+        model = _BlockingModel()
+        batcher = _PredictBatcher(model, max_batch=2, max_wait_ms=1000)
+
+        first = asyncio.create_task(batcher.predict([("q", "a")]))
+        await asyncio.sleep(0)
+        filling = asyncio.create_task(batcher.predict([("q", "bb")]))
+        await asyncio.sleep(0)
+
+        filling.cancel()
+        model.release.set()
+
+        assert await asyncio.wait_for(first, timeout=5) == [1.0]
+        with pytest.raises(asyncio.CancelledError):
+            await filling
+
+    @pytest.mark.asyncio
+    async def test_scoring_failure_fails_every_caller(self):
+        """Test that a failed predict call raises in every caller of the batch."""
+        model = _BlockingModel(fail=True)
+        model.release.set()
+        batcher = _PredictBatcher(model, max_batch=2, max_wait_ms=1000)
+
+        results = await asyncio.wait_for(
+            asyncio.gather(
+                batcher.predict([("q", "a")]),
+                batcher.predict([("q", "b")]),
+                return_exceptions=True,
+            ),
+            timeout=5,
+        )
+
+        assert all(isinstance(r, RuntimeError) for r in results)
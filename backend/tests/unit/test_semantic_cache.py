@@ -0,0 +1,54 @@
+"""Unit tests for the retrieval semantic cache."""
+
+from src.nlp.retrieval.semantic_cache import SemanticCache
+
+
+class TestSemanticCache:
+    """Tests for SemanticCache."""
+
+    def test_hit_on_similar_query(self):
+        """Test that a near-duplicate embedding returns cached results."""
+        cache = SemanticCache(maxsize=8, threshold=0.95, ttl_seconds=60)
+        cache.put("comp1", [1.0, 0.0, 0.0], ["result"])
+
+        assert cache.get("comp1", [0.99, 0.05, 0.0]) == ["result"]
+        assert cache.get("comp1", [0.0, 1.0, 0.0]) is None
+
+    def test_scope_must_match(self):
+        """Test that results are not shared across scopes."""
+        cache = SemanticCache(maxsize=8, threshold=0.95, ttl_seconds=60)
+        cache.put("comp1", [1.0, 0.0], ["result"])
+
+        assert cache.get("comp2", [1.0, 0.0]) is None
+
+    def test_evicts_least_recently_used(self):
+        """Test that the least recently used entry is evicted."""
+        cache = SemanticCache(maxsize=2, threshold=0.95, ttl_seconds=60)
+        cache.put("comp1", [1.0, 0.0, 0.0], ["a"])
+        cache.put("comp1", [0.0, 1.0, 0.0], ["b"])
+
+        # Touch "a" so "b" becomes least recently used
+        assert cache.get("comp1", [1.0, 0.0, 0.0]) == ["a"]
+        cache.put("comp1", [0.0, 0.0, 1.0], ["c"])
+
+        assert cache.get("comp1", [0.0, 1.0, 0.0]) is None
+        assert cache.stats()["size"] == 2
+
+    def test_expired_entries_miss(self):
+        """Test that entries older than the TTL are not returned."""
+        cache = SemanticCache(maxsize=8, threshold=0.95, ttl_seconds=0)
+        cache.put("comp1", [1.0, 0.0], ["result"])
+
+        assert cache.get("comp1", [1.0, 0.0]) is None
+
+    def test_evicts_across_scopes(self):
+        """Test that the size limit and LRU order span all scopes."""
+        cache = SemanticCache(maxsize=2, threshold=0.95, ttl_seconds=60)
+        cache.put("comp1", [1.0, 0.0], ["a"])
+        cache.put("comp2", [1.0, 0.0], ["b"])
+        cache.put("comp3", [1.0, 0.0], ["c"])
+
+        assert cache.get("comp1", [1.0, 0.0]) is None
+        assert cache.get("comp2", [1.0, 0.0]) == ["b"]
+        assert cache.get("comp3", [1.0, 0.0]) == ["c"]
+        assert cache.stats()["size"] == 2